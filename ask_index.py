@@ -0,0 +1,209 @@
+# ask_index.py
+# Trigram index over the asks of a generated corpus, for a retrieval fallback
+# bot: find the closest ask and answer with one of its "ans".
+# Asks are normalized (case, NFC, emoji/punctuation dropped, bh/v/b, th/t and
+# ee/i folded) so Banglish spelling variants collapse into one entry; the
+# index maps character trigrams to posting lists over those entries.
+# Usage:
+#   python ask_index.py build chat_pairs.jsonl --out asks.idx
+#   python ask_index.py query asks.idx "kmn acho" --k 3
+#   python ask_index.py serve asks.idx --port 8765   # GET /query?q=kemon+aso&k=3
+import json, re, random, pickle, heapq, argparse, unicodedata
+from array import array
+
+MAX_ANS = 32  # distinct answers kept per ask entry
+STOP_DF = 2000  # posting lists longer than this (and 5% of entries) are skipped once there are hits
+
+# ---------------------------
+# Normalization
+# ---------------------------
+
+FOLDS = [("bh", "b"), ("v", "b"), ("th", "t"), ("ee", "i")]
+SPACE_RE = re.compile(r"\s+")
+
+def _keep(ch):
+    # letters, digits and combining marks (Bangla vowel signs), but not the
+    # variation selectors that trail emoji
+    cat = unicodedata.category(ch)
+    return cat[0] in "LN" or ch == " " or (cat[0] == "M" and not "\ufe00" <= ch <= "\ufe0f")
+
+def normalize(s):
+    s = unicodedata.normalize("NFC", s).lower()
+    s = "".join(ch if _keep(ch) else " " for ch in s)
+    for a, b in FOLDS:
+        s = s.replace(a, b)
+    return SPACE_RE.sub(" ", s).strip()
+
+def trigrams(norm):
+    padded = f"  {norm} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+# ---------------------------
+# Index
+# ---------------------------
+
+class AskIndex:
+    def __init__(self):
+        self.keys = {}        # normalized ask -> entry id
+        self.asks = []        # representative (first seen) raw ask per entry
+        self.answers = []     # distinct answers per entry
+        self.sizes = array("I")
+        self.postings = {}    # trigram -> array of entry ids
+
+    def add(self, ask, ans):
+        key = normalize(ask)
+        if not key:
+            return
+        i = self.keys.get(key)
+        if i is None:
+            i = self.keys[key] = len(self.asks)
+            self.asks.append(ask)
+            self.answers.append([])
+            grams = trigrams(key)
+            self.sizes.append(len(grams))
+            for g in grams:
+                plist = self.postings.get(g)
+                if plist is None:
+                    plist = self.postings[g] = array("I")
+                plist.append(i)
+        pool = self.answers[i]
+        if len(pool) < MAX_ANS:
+            for a in ans:
+                if a not in pool and len(pool) < MAX_ANS:
+                    pool.append(a)
+
+    @classmethod
+    def build(cls, paths):
+        index = cls()
+        for path in paths:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        obj = json.loads(line)
+                        index.add(obj["ask"], obj.get("ans", []))
+        return index
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            pickle.dump({"asks": self.asks, "answers": self.answers, "sizes": self.sizes,
+                         "postings": self.postings}, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        index = cls()
+        index.asks = data["asks"]
+        index.answers = data["answers"]
+        index.sizes = data["sizes"]
+        index.postings = data["postings"]
+        index.keys = {normalize(a): i for i, a in enumerate(index.asks)}
+        return index
+
+    def __len__(self):
+        return len(self.asks)
+
+    # ---------------------------
+    # Query
+    # ---------------------------
+
+    def search(self, text, k=5):
+        key = normalize(text)
+        exact = self.keys.get(key)
+        grams = trigrams(key) if key else set()
+        plists = sorted((self.postings[g] for g in grams if g in self.postings), key=len)
+        # very common trigrams are only counted while there are no rarer hits;
+        # they barely change the ranking and dominate the cost on big corpora
+        max_df = max(STOP_DF, len(self.asks) // 20)
+        counts = {}
+        for plist in plists:
+            if counts and len(plist) > max_df:
+                break
+            for i in plist:
+                counts[i] = counts.get(i, 0) + 1
+        nq = len(grams)
+        sizes = self.sizes
+        # Dice coefficient over trigram sets
+        scored = ((2.0 * c / (nq + sizes[i]), i) for i, c in counts.items())
+        top = heapq.nlargest(k, scored)
+        if exact is not None and all(i != exact for _, i in top):
+            top = [(1.0, exact)] + top[:k - 1]
+        return [{"ask": self.asks[i], "score": round(s, 4), "ans": self.answers[i]} for s, i in top]
+
+    def reply(self, text, rng=random):
+        hits = self.search(text, k=1)
+        if not hits or not hits[0]["ans"]:
+            return None
+        return rng.choice(hits[0]["ans"])
+
+# ---------------------------
+# Local HTTP server
+# ---------------------------
+
+def serve(index, host="127.0.0.1", port=8765):
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+    from urllib.parse import urlparse, parse_qs
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path != "/query":
+                self.send_error(404)
+                return
+            qs = parse_qs(url.query)
+            q = qs.get("q", [""])[0]
+            try:
+                k = max(1, min(100, int(qs.get("k", ["5"])[0])))
+            except ValueError:
+                self.send_error(400, "k must be an integer")
+                return
+            matches = index.search(q, k=k)
+            answer = random.choice(matches[0]["ans"]) if matches and matches[0]["ans"] else None
+            body = json.dumps({"q": q, "answer": answer, "matches": matches}, ensure_ascii=False).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, fmt, *args):
+            pass
+
+    httpd = ThreadingHTTPServer((host, port), Handler)
+    print(f"serving {len(index)} asks on http://{host}:{port}/query?q=...")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+
+# ---------------------------
+# CLI
+# ---------------------------
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="index the asks of one or more JSONL files")
+    b.add_argument("inputs", nargs="+")
+    b.add_argument("--out", type=str, default="asks.idx")
+    q = sub.add_parser("query", help="print the top-k matches for a message")
+    q.add_argument("index")
+    q.add_argument("text")
+    q.add_argument("--k", type=int, default=5)
+    s = sub.add_parser("serve", help="answer GET /query?q=...&k=... over HTTP")
+    s.add_argument("index")
+    s.add_argument("--host", type=str, default="127.0.0.1")
+    s.add_argument("--port", type=int, default=8765)
+    args = ap.parse_args()
+
+    if args.cmd == "build":
+        index = AskIndex.build(args.inputs)
+        index.save(args.out)
+        print(f"✅ indexed {len(index)} distinct asks, {len(index.postings)} trigrams -> {args.out}")
+    elif args.cmd == "query":
+        for hit in AskIndex.load(args.index).search(args.text, k=args.k):
+            print(json.dumps(hit, ensure_ascii=False))
+    else:
+        serve(AskIndex.load(args.index), host=args.host, port=args.port)
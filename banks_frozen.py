@@ -0,0 +1,413 @@
+# banks_frozen.py
+# Generated by freeze_banks.py from chat_dataset_generator.build_ask_bank(); do not edit.
+SOURCE_HASH = '02e8f479'
+ASK_BANK = (
+    ('greet', 'hi'),
+    ('greet', 'hello'),
+    ('greet', 'hey'),
+    ('greet', 'hie'),
+    ('greet', 'yoo'),
+    ('greet', 'hey there'),
+    ('greet', 'হাই'),
+    ('greet', 'হ্যালো'),
+    ('greet', 'ওই'),
+    ('greet', 'কি খবর'),
+    ('greet', 'শুনছো'),
+    ('greet', 'আরে'),
+    ('greet', 'কেমন আছো'),
+    ('wellbeing', 'kemon acho'),
+    ('wellbeing', 'kemon aso'),
+    ('wellbeing', 'valo aso?'),
+    ('wellbeing', 'bhalo aso?'),
+    ('wellbeing', 'কেমন আছো'),
+    ('wellbeing', 'কি খবর'),
+    ('wellbeing', 'ভালো তো'),
+    ('wellbeing', 'সব ঠিকঠাক?'),
+    ('wellbeing', 'আজ কেমন লাগছে'),
+    ('where', 'tui koi'),
+    ('where', 'koi aso'),
+    ('where', 'kothay'),
+    ('where', 'kothay acho'),
+    ('where', 'kothay asho'),
+    ('where', 'কোথায়'),
+    ('where', 'তুই কোথায়'),
+    ('where', 'কোথায় আছো'),
+    ('where', 'এখন কোথায়'),
+    ('where', 'কোথায় ছিলে'),
+    ('doing', 'ki korcho'),
+    ('doing', 'ki korsos'),
+    ('doing', 'ki korteso'),
+    ('doing', 'ki korsis'),
+    ('doing', 'কি করছো'),
+    ('doing', 'কি করছিলে'),
+    ('doing', 'এখন কি করছো'),
+    ('doing', 'busy naki'),
+    ('doing', 'free acho'),
+    ('plan_invite', 'ber hobo?'),
+    ('plan_invite', 'coffee jabi?'),
+    ('plan_invite', 'cha khabi?'),
+    ('plan_invite', 'ghurte jabi?'),
+    ('plan_invite', 'movie jabi?'),
+    ('plan_invite', 'game khelbi?'),
+    ('plan_invite', 'meet korbo?'),
+    ('plan_invite', 'call dibo?'),
+    ('plan_invite', 'দেখা হবে?'),
+    ('plan_invite', 'চা খাই?'),
+    ('plan_invite', 'আজ বেরুবা?'),
+    ('plan_invite', 'একটু আউট হই'),
+    ('time', 'kobe ashbi'),
+    ('time', 'kobe free'),
+    ('time', 'koytay start'),
+    ('time', 'koyta baje'),
+    ('time', 'aj kobe'),
+    ('time', 'কখন আসবে'),
+    ('time', 'কত টায়'),
+    ('time', 'আজ কয়টা'),
+    ('time', 'কখন সময় পাবি'),
+    ('time', 'টাইম দিবি'),
+    ('meet', 'kothay meet'),
+    ('meet', 'place confirm'),
+    ('meet', 'map patha'),
+    ('meet', 'gate e asho'),
+    ('meet', 'jibon tower e?'),
+    ('meet', 'uttara sector 4?'),
+    ('meet', 'dukan er samne'),
+    ('meet', 'campus gate?'),
+    ('meet', 'গেটে আসো'),
+    ('meet', 'লাইব্রেরি সামনের বেঞ্চে'),
+    ('meet', 'কোথায় দেখা'),
+    ('food', 'khawa ki'),
+    ('food', 'khawa ki hobe'),
+    ('food', 'vaja khabi?'),
+    ('food', 'biriyani cholbe?'),
+    ('food', 'burger naki pizza'),
+    ('food', 'বাসায় খাইছো?'),
+    ('food', 'ফুচকা খাবি?'),
+    ('food', 'ডায়েট চলি?'),
+    ('ent', 'movie dekhbi?'),
+    ('ent', 'series suggest kor'),
+    ('ent', 'game khelbi?'),
+    ('ent', 'rank push?'),
+    ('ent', 'gaan shunbi?'),
+    ('ent', 'concert jabi?'),
+    ('ent', 'reel banabi?'),
+    ('ent', 'ott e ki ache'),
+    ('ent', 'হল এ যাবি?'),
+    ('ent', 'টিকিট পাবো?'),
+    ('ent', 'লাস্ট শো নাকি ম্যাটিনি'),
+    ('weather', 'brishti porbe?'),
+    ('weather', 'aj brishti?'),
+    ('weather', 'onek gorom'),
+    ('weather', 'thanda lagche'),
+    ('weather', 'আবহাওয়া কেমন'),
+    ('weather', 'বৃষ্টি হবে?'),
+    ('weather', 'গরম পড়ছে'),
+    ('weather', 'কুয়াশা পড়বে?'),
+    ('net_power', 'net kacche'),
+    ('net_power', 'wifi chole?'),
+    ('net_power', 'router restart korbi?'),
+    ('net_power', 'net slow'),
+    ('net_power', 'light gelo?'),
+    ('net_power', 'loadshedding?'),
+    ('net_power', 'charge koita%'),
+    ('net_power', 'battery down'),
+    ('net_power', 'বিদ্যুৎ আছে?'),
+    ('net_power', 'নেট কেমন'),
+    ('net_power', 'ইন্টারনেট নাই'),
+    ('thanks', 'thanks'),
+    ('thanks', 'thank you'),
+    ('thanks', 'ধন্যবাদ'),
+    ('thanks', 'অনেক ধন্যবাদ'),
+    ('thanks', 'appreciate it'),
+    ('apology', 'sorry'),
+    ('apology', 'doya kore maf'),
+    ('apology', 'ভুল হয়ে গেছে'),
+    ('apology', 'দুঃখিত'),
+    ('apology', 'my bad'),
+    ('mixed', 't'),
+    ('mixed', 'u'),
+    ('mixed', 'i'),
+    ('mixed', ' '),
+    ('mixed', 'k'),
+    ('mixed', 'o'),
+    ('mixed', 'b'),
+    ('mixed', 's'),
+    ('mixed', 'h'),
+    ('mixed', 'a'),
+    ('mixed', 'm'),
+    ('mixed', 'p'),
+    ('mixed', 'n'),
+    ('mixed', 'y'),
+    ('mixed', 'j'),
+    ('mixed', 'r'),
+    ('mixed', 'l'),
+    ('mixed', 'f'),
+    ('mixed', 'e'),
+    ('mixed', 'w'),
+    ('mixed', 'c'),
+    ('mixed', '?'),
+    ('mixed', 'd'),
+    ('mixed', 'g'),
+    ('mixed', 'ত'),
+    ('mixed', 'ু'),
+    ('mixed', 'ম'),
+    ('mixed', 'ি'),
+    ('mixed', 'ক'),
+    ('mixed', 'র'),
+    ('mixed', 'ছ'),
+    ('mixed', 'ো'),
+    ('mixed', 'ে'),
+    ('mixed', 'ন'),
+    ('mixed', 'আ'),
+    ('mixed', 'জ'),
+    ('mixed', 'ী'),
+    ('mixed', 'প'),
+    ('mixed', '্'),
+    ('mixed', 'ল'),
+    ('mixed', 'য'),
+    ('mixed', 'া'),
+    ('mixed', 'থ'),
+    ('mixed', 'য়'),
+    ('mixed', 'খ'),
+    ('mixed', 'স'),
+    ('mixed', 'ব'),
+    ('mixed', 'চ'),
+    ('mixed', 'দ'),
+    ('mixed', 'এ'),
+    ('mixed', 'ফ'),
+    ('mixed', 'ঘ'),
+    ('mixed', 'উ'),
+    ('mixed', 'ঠ'),
+    ('time', 's'),
+    ('time', 'o'),
+    ('time', 'k'),
+    ('time', 'a'),
+    ('time', 'l'),
+    ('time', ' '),
+    ('time', 'b'),
+    ('time', 'e'),
+    ('time', 'h'),
+    ('time', 'i'),
+    ('doing', 's'),
+    ('doing', 'o'),
+    ('doing', 'k'),
+    ('doing', 'a'),
+    ('doing', 'l'),
+    ('doing', ' '),
+    ('doing', 'i'),
+    ('doing', 'r'),
+    ('doing', 'c'),
+    ('doing', 'h'),
+    ('plan_invite', 's'),
+    ('plan_invite', 'o'),
+    ('plan_invite', 'k'),
+    ('plan_invite', 'a'),
+    ('plan_invite', 'l'),
+    ('plan_invite', ' '),
+    ('plan_invite', 'b'),
+    ('plan_invite', 'e'),
+    ('plan_invite', 'r'),
+    ('plan_invite', 'h'),
+    ('where', 's'),
+    ('where', 'o'),
+    ('where', 'k'),
+    ('where', 'a'),
+    ('where', 'l'),
+    ('where', ' '),
+    ('where', 't'),
+    ('where', 'h'),
+    ('where', 'y'),
+    ('where', 'b'),
+    ('where', 'i'),
+    ('time', 'd'),
+    ('time', 'u'),
+    ('time', 'p'),
+    ('time', 'r'),
+    ('doing', 'd'),
+    ('doing', 'u'),
+    ('doing', 'p'),
+    ('doing', 'e'),
+    ('plan_invite', 'd'),
+    ('plan_invite', 'u'),
+    ('plan_invite', 'p'),
+    ('where', 'd'),
+    ('where', 'u'),
+    ('where', 'p'),
+    ('where', 'r'),
+    ('where', 'e'),
+    ('doing', 'b'),
+    ('plan_invite', 'i'),
+    ('time', 't'),
+    ('doing', 't'),
+    ('plan_invite', 't'),
+    ('time', 'n'),
+    ('doing', 'n'),
+    ('plan_invite', 'n'),
+    ('where', 'n'),
+    ('time', 'j'),
+    ('doing', 'j'),
+    ('plan_invite', 'j'),
+    ('where', 'j'),
+    ('time', 'স'),
+    ('time', 'ক'),
+    ('time', 'া'),
+    ('time', 'ল'),
+    ('time', 'খ'),
+    ('time', 'ন'),
+    ('time', 'আ'),
+    ('time', 'ব'),
+    ('time', 'ি'),
+    ('doing', 'স'),
+    ('doing', 'ক'),
+    ('doing', 'া'),
+    ('doing', 'ল'),
+    ('doing', 'ি'),
+    ('doing', 'র'),
+    ('doing', 'ছ'),
+    ('plan_invite', 'স'),
+    ('plan_invite', 'ক'),
+    ('plan_invite', 'া'),
+    ('plan_invite', 'ল'),
+    ('plan_invite', 'ব'),
+    ('plan_invite', 'ে'),
+    ('plan_invite', 'র'),
+    ('plan_invite', 'হ'),
+    ('plan_invite', 'ো'),
+    ('where', 'স'),
+    ('where', 'ক'),
+    ('where', 'া'),
+    ('where', 'ল'),
+    ('where', 'ো'),
+    ('where', 'থ'),
+    ('where', 'য়'),
+    ('where', 'ব'),
+    ('where', 'ি'),
+    ('time', 'দ'),
+    ('time', 'ু'),
+    ('time', 'প'),
+    ('time', 'র'),
+    ('time', 'ে'),
+    ('doing', 'দ'),
+    ('doing', 'ু'),
+    ('doing', 'প'),
+    ('doing', 'ে'),
+    ('plan_invite', 'দ'),
+    ('plan_invite', 'ু'),
+    ('plan_invite', 'প'),
+    ('where', 'দ'),
+    ('where', 'ু'),
+    ('where', 'প'),
+    ('where', 'র'),
+    ('where', 'ে'),
+    ('doing', 'ব'),
+    ('plan_invite', 'ি'),
+    ('time', 'ত'),
+    ('doing', 'ত'),
+    ('plan_invite', 'ত'),
+    ('where', 'ত'),
+    ('time', '্'),
+    ('time', 'ধ'),
+    ('time', 'য'),
+    ('doing', 'ন'),
+    ('doing', '্'),
+    ('doing', 'ধ'),
+    ('doing', 'য'),
+    ('plan_invite', 'ন'),
+    ('plan_invite', '্'),
+    ('plan_invite', 'ধ'),
+    ('plan_invite', 'য'),
+    ('where', 'ন'),
+    ('where', '্'),
+    ('where', 'ধ'),
+    ('where', 'য'),
+    ('time', 'জ'),
+    ('doing', 'আ'),
+    ('doing', 'জ'),
+    ('plan_invite', 'আ'),
+    ('plan_invite', 'জ'),
+    ('where', 'আ'),
+    ('where', 'জ'),
+    ('time', 'শ'),
+    ('doing', 'শ'),
+    ('plan_invite', 'শ'),
+    ('where', 'শ'),
+    ('time', 'এ'),
+    ('time', 'ই'),
+    ('doing', 'এ'),
+    ('doing', 'খ'),
+    ('doing', 'ই'),
+    ('plan_invite', 'এ'),
+    ('plan_invite', 'খ'),
+    ('plan_invite', 'ই'),
+    ('where', 'এ'),
+    ('where', 'খ'),
+    ('where', 'ই'),
+    ('time', 'ট'),
+    ('doing', 'ট'),
+    ('plan_invite', 'ট'),
+    ('where', 'ট'),
+    ('study', 'assignment sesh?'),
+    ('study', 'report likhso?'),
+    ('study', 'exam kemon holo'),
+    ('study', 'lab ache?'),
+    ('study', 'read korbi?'),
+    ('study', 'group study korbo?'),
+    ('study', 'sir class niben?'),
+    ('study', 'quiz hobe?'),
+    ('study', 'ফলাফল কবে'),
+    ('study', 'প্রেজেন্টেশন বানাইছো?'),
+    ('study', 'নোট দিবি?'),
+    ('work', 'standup koi tay'),
+    ('work', 'deadline ase'),
+    ('work', 'jira ticket niye kaj'),
+    ('work', 'meeting ache?'),
+    ('work', 'leave niteso?'),
+    ('work', 'office jachho?'),
+    ('work', 'remote naki onsite'),
+    ('work', 'salary elo?'),
+    ('work', 'কাজ দিচ্ছে?'),
+    ('work', 'বস ডেকেছে?'),
+    ('work', 'পে-স্লিপ পাইছো?'),
+    ('health', 'mon bhalo?'),
+    ('health', 'cold lagse?'),
+    ('health', 'jhor?'),
+    ('health', 'fever ase?'),
+    ('health', ' মাথা ব্যাথা?'),
+    ('health', 'doctor dekhaso?'),
+    ('health', 'শরীর কেমন'),
+    ('health', 'ঘুম হইছে?'),
+    ('health', 'gym jabi?'),
+    ('transport', 'uber dhorte parbi?'),
+    ('transport', 'bus pabi?'),
+    ('transport', 'train kobe'),
+    ('transport', 'flight koto tay'),
+    ('transport', 'jam koto'),
+    ('transport', 'traffic onek'),
+    ('transport', 'bike e jabi?'),
+    ('transport', 'rickshaw nibi?'),
+    ('transport', 'গাড়ি আছে?'),
+    ('transport', 'সিএনজি ধরবি?'),
+    ('transport', 'বাসায় নিতে আসবা?'),
+    ('shopping', 'bazaar jabi?'),
+    ('shopping', 'kisu kinbi?'),
+    ('shopping', 'sale chalche?'),
+    ('shopping', 'shohag store e jabi?'),
+    ('shopping', 'dress nibo'),
+    ('shopping', 'shoe lagbe'),
+    ('shopping', 'gift nibo'),
+    ('shopping', 'book fair jabi?'),
+    ('shopping', 'অনলাইনে নাকি দোকান'),
+    ('shopping', 'কুপন আছে?'),
+    ('shopping', 'ডেলিভারি কবে'),
+    ('sports', 'match dekhli?'),
+    ('sports', 'gelam stadium?'),
+    ('sports', 'cricket kemon holo'),
+    ('sports', 'football aj'),
+    ('sports', 'messi goal dil?'),
+    ('sports', 'bd jitse?'),
+    ('sports', 'ipl dekhbi?'),
+    ('sports', 'practice korbi?'),
+    ('sports', 'জিমে জাস?'),
+    ('sports', 'কোচ ডাকছে?'),
+    ('sports', 'স্কোর কতো'),
+)
@@ -0,0 +1,133 @@
+# block_writer.py
+# Background writer thread for the dataset generators.
+# The generating thread collects text into large blocks (4 MB by default) and
+# hands them to a writer thread through a bounded double buffer (two blocks in
+# flight), so formatting the next block overlaps with writing the previous one.
+# Blocks go straight to an unbuffered file with one write() each, and
+# checkpoint() / fsync_every add optional os.fsync calls.
+# A new file is written under a temporary name and renamed over path on a
+# clean close (removed on error), so path is never truncated in place: a
+# hardlinked cache object (dataset_cache.py) or a previous complete output
+# stays intact. Appending to a hardlinked file first copies it.
+#
+#   with BlockWriter("chat_pairs.jsonl") as f:
+#       f.write(line)
+import os, shutil, queue, threading
+
+BLOCK_BYTES = 4 * 1024 * 1024
+_FSYNC = object()
+_STOP = object()
+
+class BlockWriter:
+    def __init__(self, path, append=False, offset=None, block_bytes=BLOCK_BYTES, fsync_every=None):
+        # offset: start writing at this byte position of an existing file
+        self.path = path
+        self.tmp = None
+        if offset is not None or append:
+            unshare(path)
+        if offset is not None:
+            self.raw = open(path, "r+b", buffering=0)
+            self.raw.seek(offset)
+        elif append:
+            self.raw = open(path, "ab", buffering=0)
+        else:
+            self.tmp = f"{path}.{os.getpid()}.tmp"
+            self.raw = open(self.tmp, "wb", buffering=0)
+        self.block_bytes = block_bytes
+        self.fsync_every = fsync_every
+        self.parts = []
+        self.pending = 0
+        self.written = 0    # bytes on disk so far (updated by the writer thread)
+        self.error = None
+        self.queue = queue.Queue(maxsize=2)
+        self.thread = threading.Thread(target=self._run, name="block-writer", daemon=True)
+        self.thread.start()
+
+    # ---------------------------
+    # Writer thread
+    # ---------------------------
+
+    def _run(self):
+        since_sync = 0
+        while True:
+            block = self.queue.get()
+            if block is _STOP:
+                return
+            if self.error is not None:
+                continue  # drain so the producer never blocks on a dead writer
+            try:
+                if block is _FSYNC:
+                    os.fsync(self.raw.fileno())
+                    since_sync = 0
+                    continue
+                view = memoryview(block)
+                while view:
+                    written = self.raw.write(view)
+                    view = view[written:]
+                self.written += len(block)
+                since_sync += len(block)
+                if self.fsync_every and since_sync >= self.fsync_every:
+                    os.fsync(self.raw.fileno())
+                    since_sync = 0
+            except BaseException as e:
+                self.error = e
+
+    def _check(self):
+        if self.error is not None:
+            raise self.error
+
+    # ---------------------------
+    # Producer side
+    # ---------------------------
+
+    def write(self, text):
+        self.parts.append(text)
+        # len() counts characters, not bytes; good enough for sizing blocks
+        self.pending += len(text)
+        if self.pending >= self.block_bytes:
+            self.flush()
+
+    def flush(self):
+        self._check()
+        if self.parts:
+            self.queue.put("".join(self.parts).encode("utf-8"))
+            self.parts = []
+            self.pending = 0
+
+    def checkpoint(self):
+        # everything written so far reaches the disk before later blocks
+        self.flush()
+        self.queue.put(_FSYNC)
+
+    def close(self, discard=False):
+        # discard: drop a new file instead of renaming it over path
+        if self.raw.closed:
+            return
+        try:
+            self.flush()
+        except BaseException:
+            discard = True
+            raise
+        finally:
+            self.queue.put(_STOP)
+            self.thread.join()
+            self.raw.close()
+            if self.tmp is not None:
+                if discard or self.error is not None:
+                    os.remove(self.tmp)
+                else:
+                    os.replace(self.tmp, self.path)
+        self._check()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(discard=exc_type is not None)
+
+def unshare(path):
+    # give path its own inode before writing into it
+    if os.path.exists(path) and os.stat(path).st_nlink > 1:
+        tmp = f"{path}.{os.getpid()}.tmp"
+        shutil.copyfile(path, tmp)
+        os.replace(tmp, path)
@@ -0,0 +1,291 @@
+# canonicalize.py
+# Canonical spellings for Banglish tokens (valo/bhalo/balo, achi/asi, kemon/kmn).
+# build: counts every Latin-script token in a corpus (in parallel) and maps each
+#   one to a canonical form. Seeds come from q1.BANGLISH_VARIANTS and the
+#   character rules of bangla_or_banglish (spelling_rules.json); the rest is
+#   clustered with a SymSpell-style deletion index under a bounded edit
+#   distance, most frequent spelling first. Words the generators' banks spell
+#   out themselves (uber/ber, road/read, diya/doya) are real words, never
+#   folded onto another one; only the q1 variant seeds override that.
+# apply: writes a canonicalized copy of a JSONL corpus using a process pool.
+# Usage:
+#   python canonicalize.py build chat_pairs.jsonl --out canon.json
+#   python canonicalize.py apply chat_pairs.jsonl --index canon.json --out chat_pairs.canon.jsonl
+import json, os, re, argparse
+from collections import Counter
+from multiprocessing import Pool
+
+from q1 import BANGLISH_VARIANTS, CHAT_CATEGORIES
+from spelling_rules import DEFAULT_RULES
+from validate_dataset import split_ranges
+
+TOKEN_RE = re.compile(r"[A-Za-z]+")
+PLACEHOLDER_RE = re.compile(r"\{[^}]*\}")
+CHUNK_BYTES = 32 * 1024 * 1024
+
+# ---------------------------
+# Token counting
+# ---------------------------
+
+def record_texts(obj):
+    yield obj.get("ask", "")
+    for a in obj.get("ans", []):
+        yield a
+
+def count_range(job):
+    path, start, end = job
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    counts = Counter()
+    # split on newlines only: str.splitlines() also breaks inside records
+    # at U+2028, \x1c and friends
+    for line in data.split(b"\n"):
+        if line.strip():
+            for text in record_texts(json.loads(line)):
+                counts.update(t.lower() for t in TOKEN_RE.findall(text))
+    return counts
+
+def count_tokens(paths, workers=None):
+    jobs = [(p, s, e) for p in paths for s, e in split_ranges(p, CHUNK_BYTES)]
+    total = Counter()
+    with Pool(workers) as pool:
+        for counts in pool.imap_unordered(count_range, jobs):
+            total.update(counts)
+    return total
+
+# ---------------------------
+# Seeds
+# ---------------------------
+
+def load_char_rules(path=DEFAULT_RULES):
+    # character-level rules (bh -> b/v, th -> t, ee -> i) from the rules config
+    with open(path, "r", encoding="utf-8") as f:
+        cfg = json.load(f)
+    # fold the source and every replacement onto the first replacement,
+    # e.g. bh -> b and v -> b
+    folds = []
+    for r in cfg.get("rules", []):
+        if r.get("word"):
+            continue
+        head = r["replace"][0]
+        for src in [r["match"]] + list(r["replace"][1:]):
+            if src != head:
+                folds.append((src, head))
+    return folds
+
+def skeleton(token, folds):
+    # all spellings the char rules can produce from one word share a skeleton
+    for src, dst in folds:
+        token = token.replace(src, dst)
+    return token
+
+def bank_vocabulary():
+    # every Latin-script token the generator banks spell out (placeholders
+    # such as {you} left out)
+    import chat_dataset_generator as gen
+    texts = [t for _, t in gen.ASK_BANK]
+    texts += [a for pools in gen.ANS.values() for pool in pools for a in pool]
+    for spec in CHAT_CATEGORIES.values():
+        texts += spec["ask"] + [a for pool in spec["ans"] for a in pool]
+    return {t.lower() for s in texts for t in TOKEN_RE.findall(PLACEHOLDER_RE.sub(" ", s))}
+
+# ---------------------------
+# Deletion index (SymSpell)
+# ---------------------------
+
+def deletes(word, max_dist):
+    out = {word}
+    frontier = {word}
+    for _ in range(max_dist):
+        nxt = set()
+        for w in frontier:
+            for i in range(len(w)):
+                nxt.add(w[:i] + w[i + 1:])
+        out |= nxt
+        frontier = nxt
+    return out
+
+def edit_distance(a, b, limit):
+    # optimal string alignment distance, giving up past limit
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2 = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if min(cur) > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+class DeletionIndex:
+    def __init__(self, max_dist):
+        self.max_dist = max_dist
+        self.index = {}
+
+    def add(self, word):
+        for d in deletes(word, self.max_dist):
+            self.index.setdefault(d, []).append(word)
+
+    def lookup(self, word, limit):
+        best = None
+        seen = set()
+        for d in deletes(word, limit):
+            for cand in self.index.get(d, ()):
+                if cand in seen:
+                    continue
+                seen.add(cand)
+                dist = edit_distance(word, cand, limit)
+                if dist <= limit and (best is None or dist < best[0]):
+                    best = (dist, cand)
+        return best
+
+# ---------------------------
+# Canonical mapping
+# ---------------------------
+
+VOWELS = set("aeiou")
+
+def shape(token):
+    # consonant skeleton without vowels and "h", plus the final vowel.
+    # Banglish respellings (kemon/kmn, sesh/shesh, meet/mit) keep the shape,
+    # while different words close in edit distance (good/food, achi/ache)
+    # usually do not.
+    cons = "".join(ch for ch in token if ch not in VOWELS and ch != "h")
+    return cons, token[-1] if token[-1] in VOWELS else ""
+
+SHORT = 4
+
+def allowed_distance(token, max_dist):
+    # one- and two-letter words (ki, ke, e) only merge through the seeds
+    return 0 if len(token) < 3 else max_dist
+
+def required_ratio(token, dist, min_ratio, short_ratio):
+    # a single edit to a short word is as likely another word (read/road)
+    # as a respelling, so it needs much stronger frequency evidence
+    return short_ratio if dist == 1 and len(token) <= SHORT else min_ratio
+
+def build_canon(counts, folds, max_dist=2, min_ratio=2.0, vocab=(), short_ratio=10.0):
+    canon = {}
+    by_skeleton = {}
+    for base, variants in BANGLISH_VARIANTS.items():
+        for v in variants:
+            if " " not in v:
+                canon.setdefault(v, base)
+                by_skeleton.setdefault(skeleton(v, folds), base)
+
+    index = DeletionIndex(max_dist)
+    # bank words first, so they become heads before any respelling is seen
+    vocab = set(vocab)
+    for token, n in sorted(counts.items(), key=lambda kv: (kv[0] not in vocab, -kv[1], kv[0])):
+        if token in canon:
+            continue
+        sk = skeleton(token, folds)
+        limit = allowed_distance(token, max_dist)
+        if token not in vocab:
+            head = by_skeleton.get(sk)
+            if head is not None:
+                canon[token] = head
+                continue
+            hit = index.lookup(token, limit) if limit else None
+            if (hit is not None and counts[hit[1]] >= required_ratio(token, hit[0], min_ratio, short_ratio) * n
+                    and shape(hit[1]) == shape(token)):
+                canon[token] = hit[1]
+                continue
+        canon[token] = token
+        by_skeleton.setdefault(sk, token)
+        if limit:
+            index.add(token)
+    return canon
+
+def clusters(canon):
+    out = {}
+    for token, head in canon.items():
+        if token != head:
+            out.setdefault(head, []).append(token)
+    return {k: sorted(v) for k, v in sorted(out.items())}
+
+# ---------------------------
+# Parallel rewrite
+# ---------------------------
+
+_CANON = None
+
+def _init_worker(index_path):
+    global _CANON
+    with open(index_path, "r", encoding="utf-8") as f:
+        _CANON = json.load(f)["canon"]
+
+def _fix_token(m):
+    t = m.group()
+    head = _CANON.get(t.lower())
+    return t if head is None or head == t.lower() else head
+
+def canonical_text(s):
+    return TOKEN_RE.sub(_fix_token, s)
+
+def rewrite_range(job):
+    path, start, end = job
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    out = []
+    for line in data.split(b"\n"):
+        if not line.strip():
+            continue
+        obj = json.loads(line)
+        obj["ask"] = canonical_text(obj.get("ask", ""))
+        obj["ans"] = [canonical_text(a) for a in obj.get("ans", [])]
+        out.append(json.dumps(obj, ensure_ascii=False) + "\n")
+    return "".join(out).encode("utf-8")
+
+def apply_canon(path, index_path, out_path, workers=None):
+    jobs = [(path, s, e) for s, e in split_ranges(path, CHUNK_BYTES)]
+    with Pool(workers, initializer=_init_worker, initargs=(index_path,)) as pool, open(out_path, "wb") as out:
+        for block in pool.imap(rewrite_range, jobs):
+            out.write(block)
+
+# ---------------------------
+# CLI
+# ---------------------------
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="build the canonical-form index of a corpus")
+    b.add_argument("inputs", nargs="+")
+    b.add_argument("--out", type=str, default="canon.json")
+    b.add_argument("--rules", type=str, default=DEFAULT_RULES, help="char rules to fold (spelling_rules.json)")
+    b.add_argument("--max-dist", type=int, default=2, help="max edit distance for clustering")
+    b.add_argument("--min-ratio", type=float, default=2.0,
+                   help="a spelling joins a cluster only if the head is this many times more frequent")
+    b.add_argument("--short-ratio", type=float, default=10.0,
+                   help=f"--min-ratio for one-edit merges of words up to {SHORT} letters")
+    b.add_argument("--workers", type=int, default=None)
+    a = sub.add_parser("apply", help="write a canonicalized copy of a JSONL corpus")
+    a.add_argument("input")
+    a.add_argument("--index", type=str, default="canon.json")
+    a.add_argument("--out", type=str, required=True)
+    a.add_argument("--workers", type=int, default=None)
+    args = ap.parse_args()
+
+    if args.cmd == "build":
+        counts = count_tokens(args.inputs, workers=args.workers)
+        canon = build_canon(counts, load_char_rules(args.rules), max_dist=args.max_dist, min_ratio=args.min_ratio,
+                            vocab=bank_vocabulary(), short_ratio=args.short_ratio)
+        groups = clusters(canon)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"canon": canon, "clusters": groups}, f, ensure_ascii=False, indent=1)
+        heads = {canon[t] for t in counts}
+        print(f"✅ {len(counts)} distinct tokens -> {len(heads)} canonical forms: {args.out}")
+    else:
+        if os.path.abspath(args.input) == os.path.abspath(args.out):
+            ap.error("--out must differ from the input")
+        apply_canon(args.input, args.index, args.out, workers=args.workers)
+        print(f"✅ wrote {args.out}")
@@ -0,0 +1,182 @@
+# chat_dataset.py
+# Lazy, mmap-backed view over a generated JSONL dataset for training loops.
+#
+#   ds = ChatDataset("chat_pairs.jsonl", seed=42)
+#   len(ds), ds[0]
+#   part = ds.shard(rank, world_size, drop_last=True)   # same record count on every rank (DDP)
+#   for batch in part.batches(32, epoch=3):    # same order for the same (seed, epoch)
+#       ...
+#   part = ds.shard(worker, num_workers, by="bytes")    # no full index needed
+#
+# Opening only maps the file. The line offset index is built on first use and
+# cached next to the dataset (<path>.idx). shard() splits by record count from
+# that index, so shards differ by at most one record (none with drop_last);
+# distributed training hangs when ranks run different numbers of steps.
+# by="bytes" splits the file into equal byte ranges instead and a shard
+# indexes only its own range, so each worker touches only its own pages, but
+# record counts then vary with record length.
+import json, os, mmap, random
+from array import array
+
+INDEX_SUFFIX = ".idx"
+
+class ChatDataset:
+    def __init__(self, path, seed=0, _parent=None, _range=None):
+        self.path = path
+        self.seed = seed
+        if _parent is None:
+            self._file = open(path, "rb")
+            size = os.fstat(self._file.fileno()).st_size
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+            self.start, self.end = 0, size
+        else:
+            self._file = _parent._file
+            self._mm = _parent._mm
+            self.start, self.end = _range
+        self._is_full = _parent is None
+        self._offsets = None
+
+    # ---------------------------
+    # Line offset index
+    # ---------------------------
+
+    def _index_path(self):
+        return self.path + INDEX_SUFFIX
+
+    def _stamp(self):
+        st = os.fstat(self._file.fileno())
+        return st.st_size, st.st_mtime_ns
+
+    def _load_index(self):
+        try:
+            with open(self._index_path(), "rb") as f:
+                offs = array("Q")
+                offs.frombytes(f.read())
+        except OSError:
+            return None
+        if len(offs) < 3 or tuple(offs[:2]) != self._stamp():
+            return None
+        return offs[2:]
+
+    def _save_index(self, offs):
+        tmp = self._index_path() + ".tmp"
+        try:
+            with open(tmp, "wb") as f:
+                array("Q", self._stamp()).tofile(f)
+                offs.tofile(f)
+            os.replace(tmp, self._index_path())
+        except OSError:
+            pass  # read-only location: just rebuild next time
+
+    def _build_offsets(self):
+        # offsets[i] is the start of line i; a final entry marks the end
+        mm, pos, end = self._mm, self.start, self.end
+        offs = array("Q")
+        find = mm.find
+        while pos < end:
+            nl = find(b"\n", pos, end)
+            stop = end if nl < 0 else nl
+            if stop > pos:
+                offs.append(pos)
+            pos = stop + 1
+        offs.append(end)
+        return offs
+
+    @property
+    def offsets(self):
+        if self._offsets is None:
+            offs = self._load_index() if self._is_full else None
+            if offs is None:
+                offs = self._build_offsets()
+                if self._is_full:
+                    self._save_index(offs)
+            self._offsets = offs
+        return self._offsets
+
+    # ---------------------------
+    # Random access
+    # ---------------------------
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def raw(self, i):
+        offs = self.offsets
+        n = len(offs) - 1
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("record index out of range")
+        start, stop = offs[i], offs[i + 1]
+        line = self._mm[start:stop]
+        return line.rstrip(b"\r\n")
+
+    def __getitem__(self, i):
+        return json.loads(self.raw(i))
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    # ---------------------------
+    # Sharding and batching
+    # ---------------------------
+
+    def shard(self, rank, world_size, by="records", drop_last=False):
+        # contiguous, newline-aligned byte ranges: no overlap, no gaps (with
+        # drop_last the last len(self) % world_size records go to no shard)
+        if not 0 <= rank < world_size:
+            raise ValueError(f"rank {rank} out of range for world size {world_size}")
+        if by == "bytes":
+            if drop_last:
+                raise ValueError("drop_last needs by='records'")
+            lo = self._align(self.start + (self.end - self.start) * rank // world_size)
+            hi = self._align(self.start + (self.end - self.start) * (rank + 1) // world_size)
+            return ChatDataset(self.path, seed=self.seed, _parent=self, _range=(lo, hi))
+        if by != "records":
+            raise ValueError(f"by must be 'records' or 'bytes', got {by!r}")
+        offs = self.offsets
+        n = len(offs) - 1
+        if drop_last:
+            per = n // world_size
+            first, last = rank * per, (rank + 1) * per
+        else:
+            first, last = n * rank // world_size, n * (rank + 1) // world_size
+        part = ChatDataset(self.path, seed=self.seed, _parent=self, _range=(offs[first], offs[last]))
+        part._offsets = offs[first:last + 1]
+        return part
+
+    def _align(self, pos):
+        # move pos to the start of the next line (unless it already is one)
+        if pos <= self.start or pos >= self.end:
+            return min(max(pos, self.start), self.end)
+        if self._mm[pos - 1:pos] == b"\n":
+            return pos
+        nl = self._mm.find(b"\n", pos, self.end)
+        return self.end if nl < 0 else nl + 1
+
+    def order(self, epoch=0, shuffle=True):
+        idx = list(range(len(self)))
+        if shuffle:
+            # seeded from (seed, epoch, shard start) so every shard and epoch
+            # gets its own reproducible permutation
+            random.Random(f"{self.seed}:{epoch}:{self.start}").shuffle(idx)
+        return idx
+
+    def batches(self, batch_size, epoch=0, shuffle=True, drop_last=False):
+        idx = self.order(epoch, shuffle)
+        stop = len(idx) - len(idx) % batch_size if drop_last else len(idx)
+        for b in range(0, stop, batch_size):
+            yield [self[i] for i in idx[b:b + batch_size]]
+
+    def close(self):
+        if self._is_full:
+            if isinstance(self._mm, mmap.mmap):
+                self._mm.close()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -2,9 +2,13 @@
 # Chat dataset generator (Bangla + Banglish)
 # Usage:
 #   python chat_dataset_generator.py --out chat_pairs.jsonl --n 1000000
-import json, random, re, argparse
+import json, os, random, re, zlib
 
-random.seed(42)
+from block_writer import BlockWriter
+from progress import records
+
+DEFAULT_SEED = 42
+random.seed(DEFAULT_SEED)
 
 PRONOUNS = ["tui", "tumi", "apni"]
 TIME_WORDS = ["sokal", "dupure", "bikal", "raat", "shondha", "aj", "kal", "porshur", "ekhuni", "ekto pore"]
@@ -12,34 +16,71 @@ TIME_WORDS_BN = ["সকাল", "দুপুরে", "বিকাল", "র
 EMOJIS = ["🙂","😅","😂","🤔","🙃","🥹","😴","😎","✨","🔥","❤️","👍","🙌","🤝","🤟","🤷‍♂️","🤷‍♀️"]
 PUNCS = ["?", "?!", "...?", "!!", "?!", "…?"]
 
-def maybe_emoji(s):
-    import random
-    if random.random() < 0.25:
+# style rates; style_tables.py compiles the same rates into alias tables
+EMOJI_P = 0.25
+PUNC_P = 0.7
+LOWER_P = 0.15
+BH_P = 0.2
+TH_P = 0.15
+EE_P = 0.1
+ANS_PUNC_P = 0.25
+ANS_EMOJI_P = 0.25
+
+# The doubled backslashes come from the teach.py heredoc, so this class really
+# matches ASCII digits, capitals, "?" and "u" rather than Bangla script. Kept
+# as-is so seeded outputs stay reproducible (see golden_check.py).
+BANGLA_RE = re.compile(r"[\\u0980-\\u09FF]")
+
+# optional style_profile.StyleProfile (--style); replaces the coin flips below
+# with block quotas that hit the target rates exactly
+STYLE = None
+
+def chance(name, p):
+    if STYLE is None:
+        return random.random() < p
+    return STYLE.hit(name)
+
+def style_defaults():
+    # per-string rates of the coin flips below; the answer rates are two gates
+    return {"script": None, "emoji": EMOJI_P, "punc": PUNC_P, "lower": LOWER_P,
+            "ans_emoji": ANS_EMOJI_P * EMOJI_P, "ans_punc": ANS_PUNC_P * PUNC_P}
+
+def maybe_emoji(s, name="emoji"):
+    if chance(name, EMOJI_P):
         return s + " " + random.choice(EMOJIS)
     return s
 
-def maybe_punc(s):
-    import random
-    if not s.endswith(tuple("?!")) and random.random() < 0.7:
+def maybe_punc(s, name="punc"):
+    if not s.endswith(tuple("?!")) and chance(name, PUNC_P):
         return s + random.choice(PUNCS)
     return s
 
 def maybe_lower(s):
-    import random
-    if random.random() < 0.15:
+    # with a profile only strings that lowercasing changes take a decision,
+    # so the lower rate is the share of those that were lowercased
+    if STYLE is not None and s.lower() == s:
+        return s
+    if chance("lower", LOWER_P):
         return s.lower()
     return s
 
+# optional spelling_rules.SpellingRules engine (--rules); replaces the
+# hard-coded bh/th/ee swaps below with a single-pass rule scan
+SPELLING = None
+
 def bangla_or_banglish(s):
-    import re, random
-    if re.search(r"[\\u0980-\\u09FF]", s):
-        return s
+    if BANGLA_RE.search(s):
+        # BANGLA_RE also matches capitals, digits, "?" and "u"; with a profile
+        # those strings still go through the lower knob
+        return maybe_lower(s) if STYLE is not None else s
     s = maybe_lower(s)
-    if random.random() < 0.2:
+    if SPELLING is not None:
+        return SPELLING.apply(s)
+    if random.random() < BH_P:
         s = s.replace("bh", random.choice(["b","v"]))
-    if random.random() < 0.15:
+    if random.random() < TH_P:
         s = s.replace("th", "t")
-    if random.random() < 0.1:
+    if random.random() < EE_P:
         s = s.replace("ee", "i")
     return s
 
@@ -160,24 +201,18 @@ ANS = {
     ]
 }
 
-ASK_BANK = []
+# ---------------------------
+# Ask bank: built by build_ask_bank(), or loaded from banks_frozen.py
+# (freeze_banks.py) while that was frozen from the current source; the
+# frozen copy skips the few hundred add() calls in every new process.
+# add() with a plain string adds its characters one by one (as in the
+# original script); kept so seeded outputs stay reproducible.
+# ---------------------------
+
+_raw_asks = []
 def add(cat, texts):
     for t in texts:
-        ASK_BANK.append((cat, t))
-
-add("greet", ["hi","hello","hey","hie","yoo","hey there","হাই","হ্যালো","ওই","কি খবর","শুনছো","আরে","কেমন আছো"])
-add("wellbeing", ["kemon acho","kemon aso","valo aso?","bhalo aso?","কেমন আছো","কি খবর","ভালো তো","সব ঠিকঠাক?","আজ কেমন লাগছে"])
-add("where", ["tui koi","koi aso","kothay","kothay acho","kothay asho","কোথায়","তুই কোথায়","কোথায় আছো","এখন কোথায়","কোথায় ছিলে"])
-add("doing", ["ki korcho","ki korsos","ki korteso","ki korsis","কি করছো","কি করছিলে","এখন কি করছো","busy naki","free acho"])
-add("plan_invite", ["ber hobo?","coffee jabi?","cha khabi?","ghurte jabi?","movie jabi?","game khelbi?","meet korbo?","call dibo?","দেখা হবে?","চা খাই?","আজ বেরুবা?","একটু আউট হই"])
-add("time", ["kobe ashbi","kobe free","koytay start","koyta baje","aj kobe","কখন আসবে","কত টায়","আজ কয়টা","কখন সময় পাবি","টাইম দিবি"])
-add("meet", ["kothay meet","place confirm","map patha","gate e asho","jibon tower e?","uttara sector 4?","dukan er samne","campus gate?","গেটে আসো","লাইব্রেরি সামনের বেঞ্চে","কোথায় দেখা"])
-add("food", ["khawa ki","khawa ki hobe","vaja khabi?","biriyani cholbe?","burger naki pizza","বাসায় খাইছো?","ফুচকা খাবি?","ডায়েট চলি?"])
-add("ent", ["movie dekhbi?","series suggest kor","game khelbi?","rank push?","gaan shunbi?","concert jabi?","reel banabi?","ott e ki ache","হল এ যাবি?","টিকিট পাবো?","লাস্ট শো নাকি ম্যাটিনি"])
-add("weather", ["brishti porbe?","aj brishti?","onek gorom","thanda lagche","আবহাওয়া কেমন","বৃষ্টি হবে?","গরম পড়ছে","কুয়াশা পড়বে?"])
-add("net_power", ["net kacche","wifi chole?","router restart korbi?","net slow","light gelo?","loadshedding?","charge koita%","battery down","বিদ্যুৎ আছে?","নেট কেমন","ইন্টারনেট নাই"])
-add("thanks", ["thanks","thank you","ধন্যবাদ","অনেক ধন্যবাদ","appreciate it"])
-add("apology", ["sorry","doya kore maf","ভুল হয়ে গেছে","দুঃখিত","my bad"])
+        _raw_asks.append((cat, t))
 
 def expand_pronoun(patterns_bn, patterns_en, cat):
     for p in patterns_en:
@@ -186,43 +221,103 @@ def expand_pronoun(patterns_bn, patterns_en, cat):
     for p in patterns_bn:
         add(cat, p)
 
-expand_pronoun(
-    patterns_bn=["তুমি কি করছো","তুমি কেমন আছো","আজ কী প্ল্যান","আজ কোথায়","কখন আসবে","চলো দেখা করি","চা খেতে যাবা","এখন ফ্রি নাকি","কাজ কেমন চলছে","মন কেমন","ঘুম থেকে উঠেছো?","বাসায় আছো?"],
-    patterns_en=["{you} ki obostha","{you} kothay","{you} aj ki korbi","{you} kal free naki","{you} ki khawabi","{you} khelbi aj","{you} school jachho?","{you} office e naki","{you} raat e time dibi","{you} call nibi","{you} msg korbi?"],
-    cat="mixed"
-)
-
-for tw in TIME_WORDS:
-    add("time", f"{tw} kobe ashbi")
-    add("doing", f"{tw} ki korcho")
-    add("plan_invite", f"{tw} ber hobo")
-    add("where", f"{tw} kothay thakbi")
-
-for tw in TIME_WORDS_BN:
-    add("time", f"{tw} কখন আসবি")
-    add("doing", f"{tw} কি করছিস")
-    add("plan_invite", f"{tw} বের হবো")
-    add("where", f"{tw} কোথায় থাকবি")
-
-add("study", ["assignment sesh?","report likhso?","exam kemon holo","lab ache?","read korbi?","group study korbo?","sir class niben?","quiz hobe?","ফলাফল কবে","প্রেজেন্টেশন বানাইছো?","নোট দিবি?"])
-add("work", ["standup koi tay","deadline ase","jira ticket niye kaj","meeting ache?","leave niteso?","office jachho?","remote naki onsite","salary elo?","কাজ দিচ্ছে?","বস ডেকেছে?","পে-স্লিপ পাইছো?"])
-add("health", ["mon bhalo?","cold lagse?","jhor?","fever ase?"," মাথা ব্যাথা?","doctor dekhaso?","শরীর কেমন","ঘুম হইছে?","gym jabi?"])
-add("transport", ["uber dhorte parbi?","bus pabi?","train kobe","flight koto tay","jam koto","traffic onek","bike e jabi?","rickshaw nibi?","গাড়ি আছে?","সিএনজি ধরবি?","বাসায় নিতে আসবা?"])
-add("shopping", ["bazaar jabi?","kisu kinbi?","sale chalche?","shohag store e jabi?","dress nibo","shoe lagbe","gift nibo","book fair jabi?","অনলাইনে নাকি দোকান","কুপন আছে?","ডেলিভারি কবে"])
-add("sports", ["match dekhli?","gelam stadium?","cricket kemon holo","football aj","messi goal dil?","bd jitse?","ipl dekhbi?","practice korbi?","জিমে জাস?","কোচ ডাকছে?","স্কোর কতো"])
-
-ASK_BANK = list(dict.fromkeys(ASK_BANK))
-
-def sample_answers(cat, k=None):
-    import random
-    pool = random.choice(ANS.get(cat, [["ok"]]))
-    out = list(dict.fromkeys(pool))
-    if random.random() < 0.35:
-        out.extend(random.choice(ANS.get(cat, [["ok"]]))[:2])
+def build_ask_bank():
+    del _raw_asks[:]
+    add("greet", ["hi","hello","hey","hie","yoo","hey there","হাই","হ্যালো","ওই","কি খবর","শুনছো","আরে","কেমন আছো"])
+    add("wellbeing", ["kemon acho","kemon aso","valo aso?","bhalo aso?","কেমন আছো","কি খবর","ভালো তো","সব ঠিকঠাক?","আজ কেমন লাগছে"])
+    add("where", ["tui koi","koi aso","kothay","kothay acho","kothay asho","কোথায়","তুই কোথায়","কোথায় আছো","এখন কোথায়","কোথায় ছিলে"])
+    add("doing", ["ki korcho","ki korsos","ki korteso","ki korsis","কি করছো","কি করছিলে","এখন কি করছো","busy naki","free acho"])
+    add("plan_invite", ["ber hobo?","coffee jabi?","cha khabi?","ghurte jabi?","movie jabi?","game khelbi?","meet korbo?","call dibo?","দেখা হবে?","চা খাই?","আজ বেরুবা?","একটু আউট হই"])
+    add("time", ["kobe ashbi","kobe free","koytay start","koyta baje","aj kobe","কখন আসবে","কত টায়","আজ কয়টা","কখন সময় পাবি","টাইম দিবি"])
+    add("meet", ["kothay meet","place confirm","map patha","gate e asho","jibon tower e?","uttara sector 4?","dukan er samne","campus gate?","গেটে আসো","লাইব্রেরি সামনের বেঞ্চে","কোথায় দেখা"])
+    add("food", ["khawa ki","khawa ki hobe","vaja khabi?","biriyani cholbe?","burger naki pizza","বাসায় খাইছো?","ফুচকা খাবি?","ডায়েট চলি?"])
+    add("ent", ["movie dekhbi?","series suggest kor","game khelbi?","rank push?","gaan shunbi?","concert jabi?","reel banabi?","ott e ki ache","হল এ যাবি?","টিকিট পাবো?","লাস্ট শো নাকি ম্যাটিনি"])
+    add("weather", ["brishti porbe?","aj brishti?","onek gorom","thanda lagche","আবহাওয়া কেমন","বৃষ্টি হবে?","গরম পড়ছে","কুয়াশা পড়বে?"])
+    add("net_power", ["net kacche","wifi chole?","router restart korbi?","net slow","light gelo?","loadshedding?","charge koita%","battery down","বিদ্যুৎ আছে?","নেট কেমন","ইন্টারনেট নাই"])
+    add("thanks", ["thanks","thank you","ধন্যবাদ","অনেক ধন্যবাদ","appreciate it"])
+    add("apology", ["sorry","doya kore maf","ভুল হয়ে গেছে","দুঃখিত","my bad"])
+
+
+    expand_pronoun(
+        patterns_bn=["তুমি কি করছো","তুমি কেমন আছো","আজ কী প্ল্যান","আজ কোথায়","কখন আসবে","চলো দেখা করি","চা খেতে যাবা","এখন ফ্রি নাকি","কাজ কেমন চলছে","মন কেমন","ঘুম থেকে উঠেছো?","বাসায় আছো?"],
+        patterns_en=["{you} ki obostha","{you} kothay","{you} aj ki korbi","{you} kal free naki","{you} ki khawabi","{you} khelbi aj","{you} school jachho?","{you} office e naki","{you} raat e time dibi","{you} call nibi","{you} msg korbi?"],
+        cat="mixed"
+    )
+
+    for tw in TIME_WORDS:
+        add("time", f"{tw} kobe ashbi")
+        add("doing", f"{tw} ki korcho")
+        add("plan_invite", f"{tw} ber hobo")
+        add("where", f"{tw} kothay thakbi")
+
+    for tw in TIME_WORDS_BN:
+        add("time", f"{tw} কখন আসবি")
+        add("doing", f"{tw} কি করছিস")
+        add("plan_invite", f"{tw} বের হবো")
+        add("where", f"{tw} কোথায় থাকবি")
+
+    add("study", ["assignment sesh?","report likhso?","exam kemon holo","lab ache?","read korbi?","group study korbo?","sir class niben?","quiz hobe?","ফলাফল কবে","প্রেজেন্টেশন বানাইছো?","নোট দিবি?"])
+    add("work", ["standup koi tay","deadline ase","jira ticket niye kaj","meeting ache?","leave niteso?","office jachho?","remote naki onsite","salary elo?","কাজ দিচ্ছে?","বস ডেকেছে?","পে-স্লিপ পাইছো?"])
+    add("health", ["mon bhalo?","cold lagse?","jhor?","fever ase?"," মাথা ব্যাথা?","doctor dekhaso?","শরীর কেমন","ঘুম হইছে?","gym jabi?"])
+    add("transport", ["uber dhorte parbi?","bus pabi?","train kobe","flight koto tay","jam koto","traffic onek","bike e jabi?","rickshaw nibi?","গাড়ি আছে?","সিএনজি ধরবি?","বাসায় নিতে আসবা?"])
+    add("shopping", ["bazaar jabi?","kisu kinbi?","sale chalche?","shohag store e jabi?","dress nibo","shoe lagbe","gift nibo","book fair jabi?","অনলাইনে নাকি দোকান","কুপন আছে?","ডেলিভারি কবে"])
+    add("sports", ["match dekhli?","gelam stadium?","cricket kemon holo","football aj","messi goal dil?","bd jitse?","ipl dekhbi?","practice korbi?","জিমে জাস?","কোচ ডাকছে?","স্কোর কতো"])
+    return list(dict.fromkeys(_raw_asks))
+
+def _code_bytes(code):
+    # bytecode, names and constants (nested code objects included); no
+    # source positions, so line endings and comments do not matter
+    parts = [code.co_code, repr(code.co_names).encode("utf-8")]
+    for c in code.co_consts:
+        parts.append(_code_bytes(c) if hasattr(c, "co_code") else repr(c).encode("utf-8"))
+    return b"\0".join(parts)
+
+def bank_source_hash():
+    # crc32 (zlib is cheap to import, hashlib is not) of the code that builds
+    # the bank and the word lists it expands; bytecode differs between Python
+    # versions, which only means banks_frozen.py is rebuilt rather than used
+    crc = zlib.crc32(repr((PRONOUNS, TIME_WORDS, TIME_WORDS_BN)).encode("utf-8"))
+    for fn in (build_ask_bank, add, expand_pronoun):
+        crc = zlib.crc32(_code_bytes(fn.__code__), crc)
+    return f"{crc:08x}"
+
+def frozen_ask_bank():
+    if os.environ.get("CHATDATA_NO_FROZEN"):
+        return None
+    try:
+        import banks_frozen
+        if banks_frozen.SOURCE_HASH != bank_source_hash():
+            return None     # stale: the bank source changed since it was frozen
+        return list(banks_frozen.ASK_BANK)
+    except Exception:
+        return None         # a missing or broken frozen bank only costs the build
+
+ASK_BANK = frozen_ask_bank() or build_ask_bank()
+
+def sample_answers(cat, k=None, ans=None):
+    return sample_answers_traced(cat, k, ans=ans)[0]
+
+def sample_answers_traced(cat, k=None, pool=None, extra=None, ans=None):
+    # also returns the ANS pool ids used (second is None when no extra pool was
+    # mixed in); choosing from range(len(...)) draws exactly what
+    # random.choice(pools) would, so the stream is unchanged. pool forces the
+    # first pool, extra the second (False: none); both are used by regen.py.
+    # ans: the answer bank to use instead of this module's ANS.
+    pools = (ANS if ans is None else ans).get(cat, [["ok"]])
+    p1 = random.choice(range(len(pools))) if pool is None else pool
+    out = list(dict.fromkeys(pools[p1]))
+    p2 = None
+    if extra is None:
+        if random.random() < 0.35:
+            p2 = random.choice(range(len(pools)))
+    elif extra is not False:
+        p2 = extra
+    if p2 is not None:
+        out.extend(pools[p2][:2])
     if k is None:
         k = random.randint(3, 6)
     random.shuffle(out)
-    return out[:k]
+    return out[:k], p1, p2
 
 def make_ask(cat, text):
     t = text
@@ -232,51 +327,376 @@ def make_ask(cat, text):
     t = bangla_or_banglish(t)
     return t
 
-def make_pair():
-    import random
-    cat, text = random.choice(ASK_BANK)
-    ask = make_ask(cat, text)
-    ans = sample_answers(cat)
+def stylize_answers(ans, pad=True):
+    # pad: fill lists shorter than 3 with "ok" (generated records); remix.py
+    # turns it off so curated answers are never padded
     out = []
     seen = set()
     for a in ans:
         a = bangla_or_banglish(a)
-        if random.random() < 0.25:
-            a = maybe_punc(a)
-        if random.random() < 0.25:
-            a = maybe_emoji(a)
+        # with a profile the answer rate is a single quota, not two gates
+        if STYLE is not None or random.random() < ANS_PUNC_P:
+            a = maybe_punc(a, "ans_punc")
+        if STYLE is not None or random.random() < ANS_EMOJI_P:
+            a = maybe_emoji(a, "ans_emoji")
         if a not in seen:
             out.append(a)
             seen.add(a)
-    while len(out) < 3:
+    while pad and len(out) < 3:
         out.append("ok")
-    return {"ask": ask, "ans": out}
+    return out
+
+def make_labeled_pair():
+    # (category, record); negatives.py needs the category the record came from
+    _, cat, obj, _, _ = make_traced_pair()
+    return cat, obj
+
+def make_traced_pair():
+    # (ask id, category, record, pool id, extra pool id) for regen.py provenance
+    i = random.choice(range(len(ASK_BANK))) if STYLE is None else STYLE.pick_ask(ASK_BANK)
+    cat, text = ASK_BANK[i]
+    ask = make_ask(cat, text)
+    ans, p1, p2 = sample_answers_traced(cat)
+    return i, cat, {"ask": ask, "ans": stylize_answers(ans)}, p1, p2
+
+def make_pair():
+    return make_labeled_pair()[1]
 
-def generate(path, n=10000, as_array=False):
+# ---------------------------
+# Seed blocks (--seed-blocks, opt-in): by default a seed gives one RNG stream
+# for the whole run. With seed blocks the RNG is reseeded from (seed, block)
+# before every SEED_BLOCK-th record, so a shard or an append only replays the
+# start of its own block. Block 0 keeps the seeded stream, so the first
+# SEED_BLOCK records are the same either way; after that the records differ,
+# which is why it is a recorded option (SEED_BLOCKS_VERSION, in the sidecar,
+# shard manifests and cache keys) and never the default.
+# ---------------------------
+
+SEED_BLOCK = 10000
+SEED_BLOCKS_VERSION = 1
+
+def block_start(i):
+    return i - i % SEED_BLOCK
+
+def reseed(block_seed, i):
+    # called before record i
+    if block_seed is not None and i and i % SEED_BLOCK == 0:
+        random.seed(f"{block_seed}:{i // SEED_BLOCK}")
+
+def block_seeded(pair_fn, block_seed, start=0):
+    # pair_fn, reseeded before every block when block_seed is set; every
+    # writer (plain, append, shard, buckets, seen store, regen) draws its
+    # records through this, so one seed gives one record stream
+    if block_seed is None:
+        return pair_fn
+    i = start
+    def next_pair():
+        nonlocal i
+        reseed(block_seed, i)
+        i += 1
+        return pair_fn()
+    return next_pair
+
+def generate(path, n=10000, as_array=False, fsync_every=None, pair_fn=None, progress=None, options=None,
+             block_seed=None):
+    # records are formatted here and written by a background BlockWriter thread
+    make_pair_ = block_seeded(pair_fn or make_pair, block_seed)
     count = 0
     if as_array:
-        with open(path, "w", encoding="utf-8") as f:
+        with BlockWriter(path, fsync_every=fsync_every) as f:
             f.write("[")
-            for i in range(n):
-                obj = make_pair()
+            for i in records(n, progress, f):
+                obj = make_pair_()
                 if i > 0:
                     f.write(",")
                 f.write(json.dumps(obj, ensure_ascii=False))
                 count += 1
             f.write("]")
     else:
-        with open(path, "w", encoding="utf-8") as f:
-            for i in range(n):
-                obj = make_pair()
-                f.write(json.dumps(obj, ensure_ascii=False) + "\\n")
+        with BlockWriter(path, fsync_every=fsync_every) as f:
+            for i in records(n, progress, f):
+                obj = make_pair_()
+                f.write(json.dumps(obj, ensure_ascii=False) + "\n")
                 count += 1
+    if progress is not None:
+        progress.finish()
+    save_state(path, count, as_array, options, block_seed)
     return count
 
-if __name__ == "__main__":
+# ---------------------------
+# Append mode: the RNG state after the last record is kept in a sidecar
+# (<path>.state.json) so a later --append continues the same stream. The
+# generation options are kept with it; appending with different ones would
+# silently continue a different stream, so append() refuses. With --style the
+# quota state is kept too, so the appended records continue the same blocks.
+# ---------------------------
+
+STATE_SUFFIX = ".state.json"
+# the generation options of a plain run; options are always compared merged
+# over these, so None, {} and the CLI defaults all mean the same run
+DEFAULT_OPTIONS = {"compiled": False, "rules": None, "translit": False, "hard_neg": 0, "easy_neg": 0, "style": None,
+                   "seed_blocks": 0}
+
+def normalized_options(options):
+    return dict(DEFAULT_OPTIONS, **(options or {}))
+
+def save_state(path, n, as_array, options=None, block_seed=None):
+    version, internal, gauss = random.getstate()
+    state = {"n": n, "array": as_array, "size": os.path.getsize(path), "block_seed": block_seed,
+             "options": normalized_options(options), "rng": [version, list(internal), gauss]}
+    if STYLE is not None:
+        state["style"] = STYLE.state()
+    with open(path + STATE_SUFFIX, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+
+def load_state(path):
+    with open(path + STATE_SUFFIX, "r", encoding="utf-8") as f:
+        state = json.load(f)
+    if state["size"] != os.path.getsize(path):
+        raise ValueError(f"{path} was modified after {path + STATE_SUFFIX} was written")
+    return state
+
+def check_options(path, state, options):
+    # sidecars written before options were recorded are not checked
+    if "options" not in state:
+        return
+    before, now = normalized_options(state["options"]), normalized_options(options)
+    diff = sorted(k for k in set(before) | set(now) if before.get(k) != now.get(k))
+    if diff:
+        changes = ", ".join(f"{k}: {before.get(k)!r} -> {now.get(k)!r}" for k in diff)
+        raise ValueError(f"{path} was generated with different options ({changes})")
+
+def append(path, n, fsync_every=None, pair_fn=None, progress=None, options=None):
+    state = load_state(path)
+    check_options(path, state, options)
+    if STYLE is not None:
+        if "style" not in state:
+            raise ValueError(f"{path + STATE_SUFFIX} has no --style quota state to continue")
+        STYLE.restore(state["style"])
+    version, internal, gauss = state["rng"]
+    random.setstate((version, tuple(internal), gauss))
+    count = state["n"]
+    block_seed = state.get("block_seed")
+    make_pair_ = block_seeded(pair_fn or make_pair, block_seed, count)
+    if state["array"]:
+        # patch the closing "]" in place instead of rewriting the array
+        end = os.path.getsize(path) - 1
+        with open(path, "rb") as f:
+            f.seek(end)
+            if f.read(1) != b"]":
+                raise ValueError(f"{path} does not end with ']'")
+        with BlockWriter(path, offset=end, fsync_every=fsync_every) as f:
+            for i in records(n, progress, f):
+                obj = make_pair_()
+                if count > 0:
+                    f.write(",")
+                f.write(json.dumps(obj, ensure_ascii=False))
+                count += 1
+            f.write("]")
+    else:
+        with BlockWriter(path, append=True, fsync_every=fsync_every) as f:
+            for i in records(n, progress, f):
+                obj = make_pair_()
+                f.write(json.dumps(obj, ensure_ascii=False) + "\n")
+                count += 1
+    if progress is not None:
+        progress.finish()
+    save_state(path, count, state["array"], options, block_seed)
+    return count
+
+# ---------------------------
+# Multi-node shards: --shard i/N writes records [n*i//N, n*(i+1)//N) of the
+# dataset a single --seed/--n run would produce, plus a manifest that
+# merge_shards.py checks before concatenating.
+# ---------------------------
+
+MANIFEST_SUFFIX = ".manifest.json"
+
+def shard_range(total, shard, shards):
+    return total * shard // shards, total * (shard + 1) // shards
+
+def file_sha256(path):
+    import hashlib
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def generate_shard(path, total, shard, shards, seed=DEFAULT_SEED, fsync_every=None, pair_fn=None, options=None,
+                   progress=None):
+    start, end = shard_range(total, shard, shards)
+    # records before the shard are generated and dropped (no JSON encoding or
+    # I/O) to reach the right state: all of them in one stream, or with
+    # seed blocks only those from the start of the shard's block
+    block_seed = seed if normalized_options(options)["seed_blocks"] else None
+    skip = block_start(start) if block_seed is not None else 0
+    random.seed(seed)
+    make_pair_ = block_seeded(pair_fn or make_pair, block_seed, skip)
+    for i in records(start, progress, start=skip):
+        make_pair_()
+    with BlockWriter(path, fsync_every=fsync_every) as f:
+        for i in records(end, progress, f, start):
+            f.write(json.dumps(make_pair_(), ensure_ascii=False) + "\n")
+    if progress is not None:
+        progress.finish()
+    manifest = {
+        "generator": "chat_dataset_generator",
+        "options": normalized_options(options),
+        "seed": seed,
+        "total": total,
+        "shard": shard,
+        "shards": shards,
+        "start": start,
+        "end": end,
+        "bytes": os.path.getsize(path),
+        "sha256": file_sha256(path),
+        "file": os.path.basename(path),
+    }
+    with open(path + MANIFEST_SUFFIX, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+    return end - start
+
+def parse_shard(text):
     import argparse
+    try:
+        i, n = (int(x) for x in text.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected i/N, e.g. 0/4")
+    if n < 1 or not 0 <= i < n:
+        raise argparse.ArgumentTypeError(f"shard {text} out of range")
+    return i, n
+
+if __name__ == "__main__":
+    import sys, argparse
     ap = argparse.ArgumentParser()
     ap.add_argument("--out", type=str, default="chat_pairs.jsonl", help="output path (.jsonl or .json)")
     ap.add_argument("--n", type=int, default=100000, help="number of records")
     ap.add_argument("--array", action="store_true", help="write as a single JSON array instead of JSONL")
+    ap.add_argument("--rules", type=str, default=None, help="spelling rules config (see spelling_rules.json)")
+    ap.add_argument("--append", type=int, default=None, metavar="N",
+                    help="append N records to an existing --out, continuing its RNG stream")
+    ap.add_argument("--compiled", action="store_true",
+                    help="style records from precompiled alias tables (style_tables.py); same distribution, different stream")
+    ap.add_argument("--fsync-every-mb", type=int, default=None, help="fsync the output every N MB written")
+    ap.add_argument("--seed", type=int, default=DEFAULT_SEED, help="random seed")
+    ap.add_argument("--seed-blocks", action="store_true",
+                    help=f"reseed every {SEED_BLOCK} records so --shard/--append replay at most one block; "
+                         "changes the records after the first block")
+    ap.add_argument("--shard", type=parse_shard, default=None, metavar="i/N",
+                    help="write only the i-th of N slices of the --n record dataset (JSONL + manifest)")
+    ap.add_argument("--seen-store", type=str, default=None, metavar="DIR",
+                    help="skip records already in this seen_store.py store and add the new ones (JSONL only)")
+    ap.add_argument("--translit", action="store_true",
+                    help="add a Bangla/Banglish twin of every bank string (transliterate.py) before generating")
+    ap.add_argument("--hard-neg", type=int, default=0, metavar="K",
+                    help="add K wrong answers from similar categories to every record (negatives.py)")
+    ap.add_argument("--easy-neg", type=int, default=0, metavar="K",
+                    help="add K wrong answers from any other category to every record")
+    ap.add_argument("--buckets", type=str, default=None, metavar="B1,B2,...",
+                    help="write per-length-bucket JSONL shards with these upper bounds (bucket_writer.py)")
+    ap.add_argument("--bucket-by", choices=["tokens", "bytes"], default="tokens", help="length measure for --buckets")
+    ap.add_argument("--cache", type=str, default=None, metavar="DIR",
+                    help="serve the dataset from a dataset_cache.py cache, generating and adding it on a miss")
+    ap.add_argument("--style", type=str, default=None, metavar="PROFILE",
+                    help="exact style rates: a JSON profile or knob=rate,... (style_profile.py)")
+    ap.add_argument("--progress", action="store_true", help="report records/s, MB written, ETA and RSS on stderr")
+    ap.add_argument("--status-file", type=str, default=None, metavar="PATH",
+                    help="keep a JSON progress status at PATH, replaced every few seconds (progress.py)")
     args = ap.parse_args()
-    generate(args.out, n=args.n, as_array=args.array)
+    random.seed(args.seed)
+    fsync_every = args.fsync_every_mb * 1024 * 1024 if args.fsync_every_mb else None
+    if args.rules:
+        from spelling_rules import load_rules
+        SPELLING = load_rules(args.rules)
+    if args.translit:
+        from transliterate import paired_ask_bank, paired_answers
+        ASK_BANK[:] = paired_ask_bank(ASK_BANK)
+        ANS.update(paired_answers(ANS))
+    negatives = args.hard_neg or args.easy_neg
+    if args.style:
+        if args.compiled:
+            ap.error("--style cannot be combined with --compiled")
+        from style_profile import StyleProfile, parse_rates
+        try:
+            STYLE = StyleProfile(parse_rates(args.style), style_defaults())
+        except (OSError, ValueError) as e:
+            ap.error(f"--style: {e}")
+    style_rates = STYLE.rates() if STYLE is not None else None
+    # everything besides seed and size that shapes the output; recorded in
+    # shard manifests, cache keys and the --append sidecar
+    options = {"compiled": args.compiled, "rules": file_sha256(args.rules) if args.rules else None,
+               "translit": args.translit, "hard_neg": args.hard_neg, "easy_neg": args.easy_neg, "style": style_rates,
+               "seed_blocks": SEED_BLOCKS_VERSION if args.seed_blocks else 0}
+    block_seed = args.seed if args.seed_blocks else None
+    if args.rules and (args.compiled or negatives):
+        ap.error("--rules cannot be combined with --compiled or negatives")
+    pair_fn = None
+    styles = None
+    if args.compiled or negatives:
+        # built from this module's banks, so --translit applies to them too
+        from style_tables import CompiledStyles
+        styles = CompiledStyles(ASK_BANK, ANS)
+    if args.compiled:
+        pair_fn = styles.make_pair
+    if negatives:
+        from negatives import NegativeSampler
+        sampler = NegativeSampler(ANS, ASK_BANK, hard=args.hard_neg, easy=args.easy_neg, styles=styles)
+        pair_fn = sampler.wrap(styles.make_labeled_pair if args.compiled else make_labeled_pair)
+    progress = None
+    if args.progress or args.status_file:
+        if args.seen_store:
+            ap.error("--progress/--status-file are not supported with --seen-store")
+        from progress import Progress
+        if args.append is not None:
+            total = args.append
+        elif args.shard is not None:
+            total = shard_range(args.n, *args.shard)[1]
+        else:
+            total = args.n
+        progress = Progress(total, label=args.out, status_path=args.status_file,
+                            out=sys.stderr if args.progress else None)
+    if args.seen_store:
+        if args.array or args.append is not None or args.shard is not None:
+            ap.error("--seen-store only supports plain JSONL generation")
+        from seen_store import SeenStore, generate_fresh
+        with SeenStore(args.seen_store) as store:
+            generate_fresh(args.out, args.n, store, block_seeded(pair_fn or make_pair, block_seed))
+    elif args.buckets:
+        if args.array or args.append is not None or args.shard is not None or args.cache:
+            ap.error("--buckets only supports plain JSONL generation")
+        from bucket_writer import generate_bucketed, parse_boundaries, print_manifest
+        try:
+            boundaries = parse_boundaries(args.buckets)
+        except argparse.ArgumentTypeError as e:
+            ap.error(f"--buckets: {e}")
+        m = generate_bucketed(args.out, args.n, pair_fn or make_pair, boundaries, args.bucket_by, fsync_every,
+                              progress=progress, block_seed=block_seed)
+        print(f"✅ {m['total']} records in {sum(1 for b in m['buckets'] if b['count'])} length buckets")
+        print_manifest(m)
+    elif args.shard is not None:
+        if args.array or args.append is not None:
+            ap.error("--shard writes JSONL shards; use merge_shards.py --array to build an array")
+        if STYLE is not None and args.seed_blocks:
+            ap.error("--style quotas run across seed blocks and cannot start mid-stream; drop --seed-blocks")
+        generate_shard(args.out, args.n, args.shard[0], args.shard[1], seed=args.seed,
+                       fsync_every=fsync_every, pair_fn=pair_fn, options=options, progress=progress)
+    elif args.append is not None:
+        try:
+            append(args.out, args.append, fsync_every=fsync_every, pair_fn=pair_fn, progress=progress,
+                   options=options)
+        except (OSError, ValueError) as e:
+            print(f"❌ --append: {e}", file=sys.stderr)
+            sys.exit(1)
+    elif args.cache:
+        from dataset_cache import DatasetCache, cached_generate
+        how = cached_generate(args.out, n=args.n, as_array=args.array, seed=args.seed, cache=DatasetCache(args.cache),
+                              fsync_every=fsync_every, pair_fn=pair_fn, options=options, module=sys.modules[__name__],
+                              progress=progress)
+        print(f"✅ {args.out}: {args.n} records (cache {how})")
+    else:
+        generate(args.out, n=args.n, as_array=args.array, fsync_every=fsync_every, pair_fn=pair_fn,
+                 progress=progress, options=options, block_seed=block_seed)
+    if STYLE is not None:
+        print("style rates:")
+        print("\n".join(STYLE.report()))
@@ -0,0 +1,138 @@
+# compact_records.py
+# Compact in-memory storage for generated chat pairs.
+# ChatRecord is a slotted {"ask", "ans"} record; ChatColumns keeps millions of
+# records as integer ids into one interned string table, with every answer
+# list packed into a flat id array plus an offset array. Records are only
+# turned back into dicts when they are accessed.
+# Usage:
+#   python compact_records.py chat_pairs.jsonl
+import json, sys, argparse
+from array import array
+
+class ChatRecord:
+    __slots__ = ("ask", "ans")
+
+    def __init__(self, ask, ans):
+        self.ask = ask
+        self.ans = tuple(ans)
+
+    def to_dict(self):
+        return {"ask": self.ask, "ans": list(self.ans)}
+
+    def __eq__(self, other):
+        return isinstance(other, ChatRecord) and self.ask == other.ask and self.ans == other.ans
+
+    def __hash__(self):
+        return hash((self.ask, self.ans))
+
+    def __repr__(self):
+        return f"ChatRecord({self.ask!r}, {list(self.ans)!r})"
+
+class StringTable:
+    def __init__(self):
+        self.ids = {}
+        self.strings = []
+
+    def intern(self, s):
+        i = self.ids.get(s)
+        if i is None:
+            i = self.ids[s] = len(self.strings)
+            self.strings.append(s)
+        return i
+
+    def __len__(self):
+        return len(self.strings)
+
+class ChatColumns:
+    def __init__(self):
+        self.table = StringTable()
+        self.ask_ids = array("I")
+        self.ans_ids = array("I")
+        # ans of record i is ans_ids[ans_offsets[i]:ans_offsets[i + 1]]
+        self.ans_offsets = array("Q", [0])
+
+    # ---------------------------
+    # Building
+    # ---------------------------
+
+    def append(self, obj):
+        intern = self.table.intern
+        if isinstance(obj, ChatRecord):
+            ask, ans = obj.ask, obj.ans
+        else:
+            ask, ans = obj["ask"], obj["ans"]
+        self.ask_ids.append(intern(ask))
+        self.ans_ids.extend([intern(a) for a in ans])
+        self.ans_offsets.append(len(self.ans_ids))
+
+    def extend(self, objs):
+        for obj in objs:
+            self.append(obj)
+
+    @classmethod
+    def from_jsonl(cls, path):
+        cols = cls()
+        loads = json.loads
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    cols.append(loads(line))
+        return cols
+
+    # ---------------------------
+    # Access
+    # ---------------------------
+
+    def __len__(self):
+        return len(self.ask_ids)
+
+    def ask(self, i):
+        return self.table.strings[self.ask_ids[i]]
+
+    def answers(self, i):
+        strings = self.table.strings
+        return [strings[j] for j in self.ans_ids[self.ans_offsets[i]:self.ans_offsets[i + 1]]]
+
+    def record(self, i):
+        return ChatRecord(self.ask(i), self.answers(i))
+
+    def __getitem__(self, i):
+        n = len(self.ask_ids)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("record index out of range")
+        return {"ask": self.ask(i), "ans": self.answers(i)}
+
+    def __iter__(self):
+        strings = self.table.strings
+        ans_ids, offs = self.ans_ids, self.ans_offsets
+        for i, a in enumerate(self.ask_ids):
+            yield {"ask": strings[a], "ans": [strings[j] for j in ans_ids[offs[i]:offs[i + 1]]]}
+
+    def nbytes(self):
+        # approximate footprint: id arrays plus the interned strings
+        size = sum(sys.getsizeof(a) for a in (self.ask_ids, self.ans_ids, self.ans_offsets))
+        size += sys.getsizeof(self.table.strings) + sys.getsizeof(self.table.ids)
+        size += sum(sys.getsizeof(s) for s in self.table.strings)
+        return size
+
+def dict_nbytes(obj):
+    return (sys.getsizeof(obj) + sys.getsizeof(obj["ask"]) + sys.getsizeof(obj["ans"])
+            + sum(sys.getsizeof(a) for a in obj["ans"]))
+
+# ---------------------------
+# CLI: report memory use of a dataset in both layouts
+# ---------------------------
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("path", type=str, help="JSONL dataset")
+    args = ap.parse_args()
+    cols = ChatColumns.from_jsonl(args.path)
+    as_dicts = sum(dict_nbytes(r) for r in cols)
+    compact = cols.nbytes()
+    print(f"records:        {len(cols)}")
+    print(f"unique strings: {len(cols.table)}")
+    print(f"list of dicts:  {as_dicts / 1e6:.1f} MB")
+    print(f"columnar:       {compact / 1e6:.1f} MB ({as_dicts / max(compact, 1):.1f}x smaller)")
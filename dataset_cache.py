@@ -0,0 +1,314 @@
+# dataset_cache.py
+# Content-addressed cache of generated datasets.
+# A dataset is identified by (generator code, bank contents, options, seed,
+# format); the record count n is not part of that key because generate() with
+# the same seed writes the same records in the same order, so any cached run
+# with n' >= n already holds the answer:
+#   n' == n  -> served by hardlink (or copy) of the cached file, with its .state.json
+#   n' >  n  -> served by copying the first n records (a byte-range truncation)
+#   none     -> generated, then added to the cache
+# Cached files are read-only. Writers never modify a hardlinked output in
+# place (BlockWriter writes new files under a temporary name and copies a
+# linked file before appending), and an entry whose size changed anyway is
+# dropped on lookup.
+# The cache is bounded in bytes and evicts least-recently-used entries.
+# Usage:
+#   python dataset_cache.py get --out chat_pairs.jsonl --n 1000000 --seed 42
+#   python dataset_cache.py get --out chat_pairs.json --n 1000 --array --copy
+#   python dataset_cache.py stats
+#   python dataset_cache.py clear
+#   python dataset_cache.py check     # a generator --cache entry is served to get
+#   python chat_dataset_generator.py --out chat_pairs.jsonl --n 1000000 --cache ~/.cache/chatdata
+import json, os, sys, time, random, shutil, hashlib, argparse, tempfile, subprocess
+from array import array
+from types import SimpleNamespace
+
+try:
+    import fcntl
+except ImportError:  # no cross-process locking on this platform
+    fcntl = None
+
+import chat_dataset_generator as gen
+
+DEFAULT_ROOT = os.environ.get("CHATDATA_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "chatdata"))
+DEFAULT_MAX_BYTES = 20 * 1024 ** 3
+INDEX = "index.json"
+# every module whose code shapes the records of a cached generation
+CODE_FILES = ["chat_dataset_generator.py", "block_writer.py", "style_tables.py", "spelling_rules.py", "style_profile.py",
+              "negatives.py", "transliterate.py"]
+BANK_TYPES = (list, tuple, dict, str, int, float)
+
+# ---------------------------
+# Keys
+# ---------------------------
+
+def code_hash():
+    h = hashlib.sha256()
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in CODE_FILES:
+        path = os.path.join(here, name)
+        if os.path.exists(path):
+            h.update(name.encode() + b"\0")
+            with open(path, "rb") as f:
+                h.update(f.read())
+    return h.hexdigest()
+
+def banks_hash(module=gen):
+    # every upper-case data global of the generator, as currently loaded
+    # (so banks patched at runtime, e.g. by --translit, get their own key)
+    banks = {k: v for k, v in vars(module).items()
+             if k.isupper() and isinstance(v, BANK_TYPES) and k != "DEFAULT_SEED"}
+    text = json.dumps(banks, ensure_ascii=False, sort_keys=True, default=repr)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def dataset_key(seed, as_array, options=None, module=gen):
+    # options are merged over the generator defaults, so get (no options) and
+    # the generator CLI (every option spelled out) share entries
+    parts = {"code": code_hash(), "banks": banks_hash(module), "seed": seed,
+             "format": "array" if as_array else "jsonl", "options": gen.normalized_options(options)}
+    text = json.dumps(parts, sort_keys=True)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+# ---------------------------
+# Prefixes
+# ---------------------------
+
+def jsonl_prefix_bytes(path, n):
+    # byte length of the first n lines
+    if n == 0:
+        return 0
+    seen = pos = 0
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            c = block.count(b"\n")
+            if seen + c >= n:
+                i = -1
+                for _ in range(n - seen):
+                    i = block.index(b"\n", i + 1)
+                return pos + i + 1
+            seen += c
+            pos += len(block)
+    raise ValueError(f"{path} has fewer than {n} records")
+
+def array_offsets(path):
+    # end offset of every record of a generate(..., as_array=True) file
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    decoder = json.JSONDecoder()
+    ends = array("Q")
+    i = 1
+    byte_pos = 1
+    while text[i] != "]":
+        _, j = decoder.raw_decode(text, i)
+        byte_pos += len(text[i:j].encode("utf-8"))
+        ends.append(byte_pos)
+        i = j + 1 if text[j] == "," else j
+        byte_pos += 1 if text[j] == "," else 0
+    return ends
+
+def copy_bytes(src, dst, nbytes, tail=b""):
+    tmp = dst + ".tmp"
+    with open(src, "rb") as f, open(tmp, "wb") as out:
+        left = nbytes
+        while left:
+            block = f.read(min(left, 1 << 20))
+            if not block:
+                raise ValueError(f"{src} is shorter than {nbytes} bytes")
+            out.write(block)
+            left -= len(block)
+        out.write(tail)
+    os.replace(tmp, dst)
+
+# ---------------------------
+# Cache
+# ---------------------------
+
+class DatasetCache:
+    def __init__(self, root=DEFAULT_ROOT, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+
+    def _lock(self):
+        f = open(os.path.join(self.root, "lock"), "a")
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        return f
+
+    def _read_index(self):
+        path = os.path.join(self.root, INDEX)
+        if not os.path.exists(path):
+            return {}
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_index(self, index):
+        path = os.path.join(self.root, INDEX)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=1)
+        os.replace(path + ".tmp", path)
+
+    def _object(self, name):
+        return os.path.join(self.root, "objects", name)
+
+    def _drop(self, index, name):
+        for suffix in ("", gen.STATE_SUFFIX, ".offsets"):
+            try:
+                os.remove(self._object(name) + suffix)
+            except FileNotFoundError:
+                pass
+        index.pop(name, None)
+
+    def lookup(self, key, n):
+        # smallest cached run of this dataset with at least n records
+        with self._lock():
+            index = self._read_index()
+            best = None
+            for name, e in index.items():
+                if e["key"] == key and e["n"] >= n and (best is None or e["n"] < index[best]["n"]):
+                    best = name
+            if best is None:
+                return None
+            if os.path.getsize(self._object(best)) != index[best]["bytes"]:
+                self._drop(index, best)      # damaged or modified; forget it
+                self._write_index(index)
+                return None
+            index[best]["used"] = time.time()
+            self._write_index(index)
+            return dict(index[best], name=best)
+
+    def serve(self, entry, path, n, link=True):
+        src = self._object(entry["name"])
+        for p in (path, path + gen.STATE_SUFFIX):
+            if os.path.lexists(p):
+                os.remove(p)
+        if entry["n"] == n:
+            if link:
+                try:
+                    os.link(src, path)
+                except OSError:
+                    shutil.copyfile(src, path)
+            else:
+                shutil.copyfile(src, path)
+            shutil.copyfile(src + gen.STATE_SUFFIX, path + gen.STATE_SUFFIX)
+            return "hit"
+        # a prefix carries no RNG state, so --append is not available on it
+        if entry["format"] == "array":
+            ends = array("Q")
+            with open(src + ".offsets", "rb") as f:
+                ends.frombytes(f.read())
+            copy_bytes(src, path, ends[n - 1] if n else 1, b"]")
+        else:
+            copy_bytes(src, path, jsonl_prefix_bytes(src, n))
+        return "prefix"
+
+    def put(self, path, key, n, as_array):
+        name = f"{key}-{n}.{'json' if as_array else 'jsonl'}"
+        obj = self._object(name)
+        shutil.copyfile(path, obj + ".tmp")
+        os.chmod(obj + ".tmp", 0o444)
+        shutil.copyfile(path + gen.STATE_SUFFIX, obj + gen.STATE_SUFFIX)
+        if as_array:
+            with open(obj + ".offsets", "wb") as f:
+                array_offsets(path).tofile(f)
+        os.replace(obj + ".tmp", obj)
+        with self._lock():
+            index = self._read_index()
+            index[name] = {"key": key, "n": n, "format": "array" if as_array else "jsonl",
+                           "bytes": os.path.getsize(obj), "used": time.time()}
+            self._evict(index, keep=name)
+            self._write_index(index)
+
+    def _evict(self, index, keep=None):
+        total = sum(e["bytes"] for e in index.values())
+        for name in sorted(index, key=lambda k: index[k]["used"]):
+            if total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            total -= index[name]["bytes"]
+            self._drop(index, name)
+
+    def stats(self):
+        with self._lock():
+            return self._read_index()
+
+    def clear(self):
+        with self._lock():
+            index = self._read_index()
+            for name in list(index):
+                self._drop(index, name)
+            self._write_index(index)
+
+# ---------------------------
+# Cached generate()
+# ---------------------------
+
+def cached_generate(path, n=10000, as_array=False, seed=gen.DEFAULT_SEED, cache=None, link=True,
+                    fsync_every=None, pair_fn=None, options=None, module=gen, progress=None):
+    # module: the generator module whose banks and generate() to use; the
+    # generator's own CLI passes itself, since it runs as __main__
+    cache = cache or DatasetCache()
+    key = dataset_key(seed, as_array, options, module)
+    entry = cache.lookup(key, n)
+    if entry is not None:
+        how = cache.serve(entry, path, n, link=link)
+        if progress is not None:
+            # nothing to count: report the served file as done
+            progress.source = SimpleNamespace(written=os.path.getsize(path))
+            progress.finish()
+        return how
+    random.seed(seed)
+    block_seed = seed if gen.normalized_options(options)["seed_blocks"] else None
+    module.generate(path, n=n, as_array=as_array, fsync_every=fsync_every, pair_fn=pair_fn, progress=progress,
+                    options=options, block_seed=block_seed)
+    cache.put(path, key, n, as_array)
+    return "miss"
+
+def check_shared_keys():
+    # a generator CLI --cache run, then get for a smaller n: must be a prefix hit
+    here = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory(prefix="dataset_cache.") as tmp:
+        root = os.path.join(tmp, "cache")
+        subprocess.run([sys.executable, os.path.join(here, "chat_dataset_generator.py"), "--n", "2000",
+                        "--out", os.path.join(tmp, "cli.jsonl"), "--cache", root],
+                       check=True, capture_output=True)
+        return cached_generate(os.path.join(tmp, "get.jsonl"), 1000, cache=DatasetCache(root))
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--root", type=str, default=DEFAULT_ROOT, help="cache directory (env CHATDATA_CACHE)")
+    ap.add_argument("--max-gb", type=float, default=DEFAULT_MAX_BYTES / 1024 ** 3, help="evict LRU entries above this size")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    g = sub.add_parser("get", help="serve a dataset from the cache, generating it on a miss")
+    g.add_argument("--out", type=str, required=True)
+    g.add_argument("--n", type=int, default=100000)
+    g.add_argument("--seed", type=int, default=gen.DEFAULT_SEED)
+    g.add_argument("--array", action="store_true")
+    g.add_argument("--copy", action="store_true", help="copy instead of hardlinking exact hits")
+    sub.add_parser("stats", help="list cached datasets")
+    sub.add_parser("clear", help="remove every cached dataset")
+    sub.add_parser("check", help="check that generator --cache entries are served to get")
+    args = ap.parse_args()
+
+    if args.cmd == "check":
+        how = check_shared_keys()
+        if how != "prefix":
+            print(f"❌ a generator --cache entry was not served to get ({how})", file=sys.stderr)
+            sys.exit(1)
+        print("✅ generator --cache entries are served to get")
+        sys.exit(0)
+    cache = DatasetCache(args.root, int(args.max_gb * 1024 ** 3))
+    if args.cmd == "get":
+        t = time.time()
+        how = cached_generate(args.out, args.n, args.array, args.seed, cache, link=not args.copy)
+        print(f"✅ {args.out}: {args.n} records ({how}, {time.time() - t:.2f}s)")
+    elif args.cmd == "clear":
+        cache.clear()
+        print(f"✅ cleared {args.root}")
+    else:
+        index = cache.stats()
+        total = sum(e["bytes"] for e in index.values())
+        print(f"{args.root}: {len(index)} dataset(s), {total / 1024 ** 2:.1f} MB of {cache.max_bytes / 1024 ** 2:.0f} MB")
+        for name, e in sorted(index.items(), key=lambda kv: -kv[1]["used"]):
+            print(f"  {name}  {e['bytes'] / 1024 ** 2:8.1f} MB  last used {time.ctime(e['used'])}")
@@ -0,0 +1,283 @@
+# dataset_diff.py
+# Compare two generated JSONL datasets record by record.
+# Workers hash newline-aligned byte ranges of both files in parallel (one
+# 8-byte blake2b per line) and write two run files per range: the bare hashes
+# in file order, for the positional comparison (compared a block at a time),
+# and (hash, offset, category) entries sorted by hash. The sorted runs are merged k-way (external sort-merge), so memory stays
+# bounded by the chunk size whatever the file size, and the multiset diff is a
+# single streaming merge of the two hash orders.
+# Reported:
+#   same position   record i is identical in both files
+#   common/moved    records present in both, and how many of them changed index
+#   removed/added   records only in v1 / only in v2, per ask category
+#                   (an ask text that several categories can produce, such
+#                   as কি খবর, is counted under "ambiguous")
+# plus an optional sample of removed/added lines (hash order, so effectively
+# random). Exits 1 when the files differ, like diff.
+# Usage:
+#   python dataset_diff.py chat_pairs.v1.jsonl chat_pairs.v2.jsonl
+#   python dataset_diff.py v1.jsonl v2.jsonl --sample 5 --workers 8 --tmp /scratch
+import os, sys, json, heapq, struct, hashlib, tempfile, argparse
+from array import array
+from collections import Counter
+from multiprocessing import Pool
+
+from validate_dataset import split_ranges
+
+CHUNK_BYTES = 64 * 1024 * 1024
+ENTRY = struct.Struct("<QQB")     # line hash, line offset, category id
+READ_ENTRIES = 1 << 14
+MAX_FANIN = 128
+UNKNOWN = 255
+AMBIGUOUS = "ambiguous"
+ASK_PREFIX = b'{"ask": "'
+ASK_LEN = len(ASK_PREFIX)
+
+_categories = None
+
+def categories():
+    # UTF-8 styled ask text -> category id, built once per worker process
+    global _categories
+    if _categories is None:
+        from style_tables import compile_styles
+        lookup = {}
+        for cat, table in compile_styles().asks:
+            for text in table.values:
+                if lookup.setdefault(text, cat) != cat:
+                    lookup[text] = AMBIGUOUS
+        names = sorted(set(lookup.values()))[:UNKNOWN]
+        ids = {name: i for i, name in enumerate(names)}
+        _categories = ({text.encode("utf-8"): ids[cat] for text, cat in lookup.items() if cat in ids}, names)
+    return _categories
+
+def category_of(line, lookup):
+    # fast path: the ask is the first field of the generator's own layout and
+    # has no escapes; anything else (or a miss) goes through json.loads
+    if line.startswith(ASK_PREFIX):
+        cat = lookup.get(line[ASK_LEN:line.find(b'"', ASK_LEN)])
+        if cat is not None:
+            return cat
+    try:
+        obj = json.loads(line)
+    except ValueError:
+        return UNKNOWN
+    ask = obj.get("ask") if isinstance(obj, dict) else None
+    return lookup.get(ask.encode("utf-8"), UNKNOWN) if isinstance(ask, str) else UNKNOWN
+
+# ---------------------------
+# Hashing (workers)
+# ---------------------------
+
+def hash_range(job):
+    path, start, end, tmpdir, tag = job
+    lookup, _ = categories()
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    entries = []
+    append = entries.append
+    blake2b = hashlib.blake2b
+    from_bytes = int.from_bytes
+    pos = start
+    for line in data.split(b"\n"):
+        size = len(line) + 1
+        line = line.rstrip(b"\r")
+        if line.strip():
+            h = from_bytes(blake2b(line, digest_size=8).digest(), "little")
+            append((h, pos, category_of(line, lookup)))
+        pos += size
+    with open(os.path.join(tmpdir, f"{tag}.ord"), "wb") as f:
+        array("Q", [e[0] for e in entries]).tofile(f)
+    entries.sort()
+    with open(os.path.join(tmpdir, f"{tag}.run"), "wb") as f:
+        f.write(b"".join([ENTRY.pack(*e) for e in entries]))
+    return len(entries)
+
+# ---------------------------
+# Run files
+# ---------------------------
+
+def read_entries(path):
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(ENTRY.size * READ_ENTRIES)
+            if not block:
+                return
+            yield from ENTRY.iter_unpack(block)
+
+def hash_blocks(paths, block_bytes=8 << 16):
+    # the concatenated .ord files in equal-sized blocks
+    buf = b""
+    for p in paths:
+        with open(p, "rb") as f:
+            while True:
+                data = f.read(block_bytes)
+                if not data:
+                    break
+                buf += data
+                while len(buf) >= block_bytes:
+                    yield buf[:block_bytes]
+                    buf = buf[block_bytes:]
+    if buf:
+        yield buf
+
+def write_entries(path, entries):
+    with open(path, "wb") as f:
+        buf = []
+        for e in entries:
+            buf.append(ENTRY.pack(*e))
+            if len(buf) >= READ_ENTRIES:
+                f.write(b"".join(buf))
+                buf = []
+        f.write(b"".join(buf))
+
+def merged(runs, tmpdir, tag):
+    # k-way merge; with more than MAX_FANIN runs, merge groups first
+    level = 0
+    while len(runs) > MAX_FANIN:
+        nxt = []
+        for i in range(0, len(runs), MAX_FANIN):
+            out = os.path.join(tmpdir, f"{tag}.m{level}.{i // MAX_FANIN}")
+            group = runs[i:i + MAX_FANIN]
+            write_entries(out, heapq.merge(*[read_entries(p) for p in group]))
+            for p in group:
+                os.remove(p)
+            nxt.append(out)
+        runs = nxt
+        level += 1
+    return heapq.merge(*[read_entries(p) for p in runs])
+
+def grouped(entries):
+    # (hash, [entries]) for runs of equal hashes
+    group = []
+    for e in entries:
+        if group and e[0] != group[0][0]:
+            yield group[0][0], group
+            group = []
+        group.append(e)
+    if group:
+        yield group[0][0], group
+
+# ---------------------------
+# Diff
+# ---------------------------
+
+class DiffResult:
+    def __init__(self):
+        self.n1 = self.n2 = 0
+        self.same_position = 0
+        self.first_difference = None
+        self.common = 0
+        self.removed = Counter()
+        self.added = Counter()
+        self.removed_sample = []
+        self.added_sample = []
+
+    @property
+    def identical(self):
+        return self.n1 == self.n2 == self.same_position
+
+def diff(path1, path2, workers=None, chunk_bytes=CHUNK_BYTES, sample=0, tmp=None):
+    result = DiffResult()
+    with tempfile.TemporaryDirectory(prefix="dataset_diff.", dir=tmp) as tmpdir:
+        jobs = []
+        for side, path in (("a", path1), ("b", path2)):
+            for i, (s, e) in enumerate(split_ranges(path, chunk_bytes)):
+                jobs.append((path, s, e, tmpdir, f"{side}{i:06d}"))
+        counts = {"a": 0, "b": 0}
+        with Pool(workers) as pool:
+            for job, n in zip(jobs, pool.imap(hash_range, jobs)):
+                counts[job[4][0]] += n
+        result.n1, result.n2 = counts["a"], counts["b"]
+        tags = {side: [j[4] for j in jobs if j[4][0] == side] for side in "ab"}
+
+        # positional pass
+        blocks1 = hash_blocks([os.path.join(tmpdir, t + ".ord") for t in tags["a"]])
+        blocks2 = hash_blocks([os.path.join(tmpdir, t + ".ord") for t in tags["b"]])
+        base = 0
+        for b1, b2 in zip(blocks1, blocks2):
+            if b1 == b2:
+                result.same_position += len(b1) // 8
+            else:
+                h1, h2 = array("Q", b1), array("Q", b2)
+                for i, (x, y) in enumerate(zip(h1, h2)):
+                    if x == y:
+                        result.same_position += 1
+                    elif result.first_difference is None:
+                        result.first_difference = base + i
+            base += min(len(b1), len(b2)) // 8
+        if result.first_difference is None and result.n1 != result.n2:
+            result.first_difference = min(result.n1, result.n2)
+
+        # multiset pass: merge the two hash orders
+        a = grouped(merged([os.path.join(tmpdir, t + ".run") for t in tags["a"]], tmpdir, "a"))
+        b = grouped(merged([os.path.join(tmpdir, t + ".run") for t in tags["b"]], tmpdir, "b"))
+        ga, gb = next(a, None), next(b, None)
+        while ga is not None or gb is not None:
+            if gb is None or (ga is not None and ga[0] < gb[0]):
+                only, side, ga = ga[1], "removed", next(a, None)
+            elif ga is None or gb[0] < ga[0]:
+                only, side, gb = gb[1], "added", next(b, None)
+            else:
+                k = min(len(ga[1]), len(gb[1]))
+                result.common += k
+                only, side = (ga[1][k:], "removed") if len(ga[1]) > k else (gb[1][k:], "added")
+                ga, gb = next(a, None), next(b, None)
+            counter = result.removed if side == "removed" else result.added
+            samples = result.removed_sample if side == "removed" else result.added_sample
+            for _, offset, cat in only:
+                counter[cat] += 1
+                if len(samples) < sample:
+                    samples.append(offset)
+    result.removed_sample = read_lines(path1, result.removed_sample)
+    result.added_sample = read_lines(path2, result.added_sample)
+    return result
+
+def read_lines(path, offsets):
+    out = []
+    with open(path, "rb") as f:
+        for off in offsets:
+            f.seek(off)
+            out.append(f.readline().rstrip(b"\r\n").decode("utf-8", "replace"))
+    return out
+
+def report(path1, path2, r, out=sys.stdout):
+    _, names = categories()
+    name = lambda i: names[i] if i < len(names) else "?"
+    moved = r.common - r.same_position
+    print(f"v1 {path1}: {r.n1} records", file=out)
+    print(f"v2 {path2}: {r.n2} records", file=out)
+    print(f"same position: {r.same_position}"
+          + (f" (first difference at record {r.first_difference})" if r.first_difference is not None else ""), file=out)
+    print(f"common: {r.common} (moved {moved})   removed: {sum(r.removed.values())}   added: {sum(r.added.values())}",
+          file=out)
+    cats = sorted(set(r.removed) | set(r.added), key=lambda c: -(r.removed[c] + r.added[c]))
+    if cats:
+        print(f"{'category':>14} {'removed':>9} {'added':>9}", file=out)
+        for c in cats:
+            print(f"{name(c):>14} {r.removed[c]:>9} {r.added[c]:>9}", file=out)
+    for label, lines in (("-", r.removed_sample), ("+", r.added_sample)):
+        for line in lines:
+            print(f"{label} {line}", file=out)
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("v1", type=str)
+    ap.add_argument("v2", type=str)
+    ap.add_argument("--workers", type=int, default=None, help="hashing processes (default: all cores)")
+    ap.add_argument("--chunk-mb", type=int, default=64, help="bytes per work unit and sorted run, in MB")
+    ap.add_argument("--sample", type=int, default=0, help="print up to N removed and N added lines")
+    ap.add_argument("--tmp", type=str, default=None, help="directory for run files (needs ~40%% of the input size)")
+    args = ap.parse_args()
+    for p in (args.v1, args.v2):
+        with open(p, "rb") as f:
+            if f.read(1) == b"[":
+                ap.error(f"{p}: JSON array files are not supported, diff the JSONL output")
+    r = diff(args.v1, args.v2, workers=args.workers, chunk_bytes=args.chunk_mb * 1024 * 1024,
+             sample=args.sample, tmp=args.tmp)
+    report(args.v1, args.v2, r)
+    if r.identical:
+        print("✅ identical")
+        sys.exit(0)
+    print("❌ datasets differ")
+    sys.exit(1)
@@ -0,0 +1,74 @@
+# freeze_banks.py
+# Writes banks_frozen.py: chat_dataset_generator's ASK_BANK as one tuple
+# literal plus the hash of the source it was built from. While the hash
+# matches, the generator loads the frozen tuple instead of running
+# build_ask_bank(); after a bank edit it falls back to building (and --check
+# fails) until this is re-run.
+# --compile also byte-compiles the generator's import chain into __pycache__,
+# for hosts that run with PYTHONDONTWRITEBYTECODE=1 (existing .pyc files are
+# still read there, but never written, so every process recompiles the source).
+# Usage:
+#   python freeze_banks.py              # write banks_frozen.py
+#   python freeze_banks.py --compile    # ... and precompile the import chain
+#   python freeze_banks.py --check      # exit 1 if banks_frozen.py is stale
+import os, sys, argparse, py_compile
+
+os.environ["CHATDATA_NO_FROZEN"] = "1"    # always build from source here
+import chat_dataset_generator as gen
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FROZEN = os.path.join(HERE, "banks_frozen.py")
+IMPORT_CHAIN = ["chat_dataset_generator.py", "block_writer.py", "progress.py", "banks_frozen.py"]
+
+def render(bank, source_hash):
+    lines = [
+        "# banks_frozen.py",
+        "# Generated by freeze_banks.py from chat_dataset_generator.build_ask_bank(); do not edit.",
+        f"SOURCE_HASH = {source_hash!r}",
+        "ASK_BANK = (",
+    ]
+    lines += [f"    {entry!r}," for entry in bank]
+    lines.append(")")
+    return "\n".join(lines) + "\n"
+
+def frozen_state():
+    # (hash, bank) of the current banks_frozen.py, or None
+    if not os.path.exists(FROZEN):
+        return None
+    ns = {}
+    with open(FROZEN, "r", encoding="utf-8") as f:
+        exec(f.read(), ns)
+    return ns.get("SOURCE_HASH"), list(ns.get("ASK_BANK", ()))
+
+def freeze():
+    text = render(gen.build_ask_bank(), gen.bank_source_hash())
+    tmp = FROZEN + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, FROZEN)
+
+def compile_chain():
+    for name in IMPORT_CHAIN:
+        py_compile.compile(os.path.join(HERE, name), doraise=True)
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--check", action="store_true", help="only check that banks_frozen.py is up to date")
+    ap.add_argument("--compile", action="store_true", help="also write .pyc files for the generator's imports")
+    args = ap.parse_args()
+    bank = gen.build_ask_bank()
+    if args.check:
+        state = frozen_state()
+        if state is None:
+            print(f"❌ {FROZEN} is missing; run python freeze_banks.py")
+            sys.exit(1)
+        if state != (gen.bank_source_hash(), bank):
+            print(f"❌ {FROZEN} is stale; run python freeze_banks.py")
+            sys.exit(1)
+        print(f"✅ {FROZEN} matches the bank source ({len(bank)} asks)")
+        sys.exit(0)
+    freeze()
+    print(f"✅ {FROZEN}: {len(bank)} asks, source hash {gen.bank_source_hash()}")
+    if args.compile:
+        compile_chain()
+        print(f"✅ precompiled {', '.join(IMPORT_CHAIN)}")
@@ -0,0 +1,144 @@
+# golden_check.py
+# Determinism harness for performance refactors.
+# Runs every generator over a small matrix of (seed, n, jsonl/array), plus a
+# run past the first seed block with and without --seed-blocks, compares
+# the SHA-256 of each output with goldens.json and, on a mismatch, reports the
+# first record and field that diverged.
+# Usage:
+#   python golden_check.py            # check, exit 1 on any mismatch
+#   python golden_check.py --update   # re-record goldens (only for intended output changes)
+import json, os, sys, io, hashlib, zlib, random, argparse, tempfile, contextlib
+
+import chat_dataset_generator
+import improved_chat_generator
+import q1
+
+GOLDENS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "goldens.json")
+
+GENERATORS = {
+    "chat_dataset_generator": lambda path, n, as_array, seed: chat_dataset_generator.generate(path, n=n, as_array=as_array),
+    "improved_chat_generator": lambda path, n, as_array, seed: improved_chat_generator.generate_dataset(path=path, n_records=n, as_array=as_array),
+    "q1": lambda path, n, as_array, seed: q1.generate_dataset(path=path, n_records=n, as_array=as_array),
+    "chat_dataset_generator+seed_blocks": lambda path, n, as_array, seed: chat_dataset_generator.generate(
+        path, n=n, as_array=as_array, block_seed=seed),
+}
+SEEDS = [1, 42]
+SIZES = [1, 10, 500]
+FORMATS = ["jsonl", "array"]
+# the default single stream must not change past SEED_BLOCK records either
+LONG = chat_dataset_generator.SEED_BLOCK + 500
+LONG_CASES = [("chat_dataset_generator", 42, LONG, "jsonl"), ("chat_dataset_generator+seed_blocks", 42, LONG, "jsonl")]
+
+def case_name(gen, seed, n, fmt):
+    return f"{gen}/seed={seed}/n={n}/{fmt}"
+
+def matrix():
+    for gen in ("chat_dataset_generator", "improved_chat_generator", "q1"):
+        for seed in SEEDS:
+            for n in SIZES:
+                for fmt in FORMATS:
+                    yield gen, seed, n, fmt
+    yield from LONG_CASES
+
+# ---------------------------
+# Running one case
+# ---------------------------
+
+def run_case(gen, seed, n, fmt, workdir):
+    path = os.path.join(workdir, f"{gen}-{seed}-{n}.{fmt}")
+    random.seed(seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        GENERATORS[gen](path, n, fmt == "array", seed)
+    with open(path, "rb") as f:
+        data = f.read()
+    os.remove(path)
+    return data
+
+def parse_records(data, fmt):
+    text = data.decode("utf-8")
+    if fmt == "array":
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+def field_crc(value):
+    return "%08x" % zlib.crc32(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+
+def fingerprint(data, fmt):
+    recs = parse_records(data, fmt)
+    return {
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "records": len(recs),
+        "ask": "".join(field_crc(r.get("ask")) for r in recs),
+        "ans": "".join(field_crc(r.get("ans")) for r in recs),
+    }
+
+# ---------------------------
+# Divergence report
+# ---------------------------
+
+def first_divergence(expected, data, fmt):
+    try:
+        recs = parse_records(data, fmt)
+    except ValueError as e:
+        return f"output no longer parses as {fmt}: {e}"
+    for i, r in enumerate(recs):
+        if i >= expected["records"]:
+            return f"extra record {i}: {json.dumps(r, ensure_ascii=False)}"
+        for field in ("ask", "ans"):
+            want = expected[field][i * 8:(i + 1) * 8]
+            if field_crc(r.get(field)) != want:
+                got = json.dumps(r.get(field), ensure_ascii=False)
+                return f"record {i}, field '{field}': got {got} (expected crc {want})"
+    if len(recs) < expected["records"]:
+        return f"missing records: got {len(recs)}, expected {expected['records']}"
+    return "records match but bytes differ (separators, whitespace or escaping changed)"
+
+# ---------------------------
+# CLI
+# ---------------------------
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--update", action="store_true", help="re-record goldens.json from the current code")
+    ap.add_argument("--only", type=str, default=None, help="run only cases whose name contains this")
+    args = ap.parse_args(argv)
+
+    goldens = {}
+    if os.path.exists(GOLDENS):
+        with open(GOLDENS, "r", encoding="utf-8") as f:
+            goldens = json.load(f)
+
+    failed = 0
+    ran = 0
+    with tempfile.TemporaryDirectory() as workdir:
+        for gen, seed, n, fmt in matrix():
+            name = case_name(gen, seed, n, fmt)
+            if args.only and args.only not in name:
+                continue
+            ran += 1
+            data = run_case(gen, seed, n, fmt, workdir)
+            if args.update:
+                goldens[name] = fingerprint(data, fmt)
+                continue
+            expected = goldens.get(name)
+            if expected is None:
+                print(f"?? {name}: no golden recorded (run with --update)")
+                failed += 1
+            elif hashlib.sha256(data).hexdigest() != expected["sha256"]:
+                print(f"❌ {name}: {first_divergence(expected, data, fmt)}")
+                failed += 1
+
+    if args.update:
+        with open(GOLDENS, "w", encoding="utf-8") as f:
+            json.dump(goldens, f, indent=1, sort_keys=True)
+            f.write("\n")
+        print(f"recorded {ran} goldens in {GOLDENS}")
+        return 0
+    if failed:
+        print(f"❌ {failed}/{ran} cases diverged")
+        return 1
+    print(f"✅ {ran} cases match")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
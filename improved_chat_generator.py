@@ -1,5 +1,8 @@
 # improved_chat_generator.py
-import json, random, argparse
+import json, sys, random, argparse
+
+from block_writer import BlockWriter
+from progress import Progress, records
 
 # ---------------------------
 # CATEGORIES: Ask -> Answer pool mapping
@@ -111,11 +114,12 @@ def random_chat():
 # Dataset Writer
 # ---------------------------
 
-def generate_dataset(path="chat_pairs.jsonl", n_records=10000, as_array=False):
+def generate_dataset(path="chat_pairs.jsonl", n_records=10000, as_array=False, progress=None):
+    # chunks are written by a background BlockWriter thread in large blocks
     if as_array:
-        with open(path, "w", encoding="utf-8") as f:
+        with BlockWriter(path) as f:
             f.write("[")
-            for i in range(n_records):
+            for i in records(n_records, progress, f):
                 obj = random_chat()
                 chunk = json.dumps(obj, ensure_ascii=False)
                 if i > 0:
@@ -123,11 +127,13 @@ def generate_dataset(path="chat_pairs.jsonl", n_records=10000, as_array=False):
                 f.write(chunk)
             f.write("]")
     else:
-        with open(path, "w", encoding="utf-8") as f:
-            for i in range(n_records):
+        with BlockWriter(path) as f:
+            for i in records(n_records, progress, f):
                 obj = random_chat()
                 chunk = json.dumps(obj, ensure_ascii=False)
                 f.write(chunk + "\n")
+    if progress is not None:
+        progress.finish()
     print(f"✅ Done: {path} with {n_records} records")
 
 # ---------------------------
@@ -139,6 +145,13 @@ if __name__ == "__main__":
     parser.add_argument("--out", type=str, default="chat_pairs.jsonl")
     parser.add_argument("--n", type=int, default=10000)
     parser.add_argument("--array", action="store_true")
+    parser.add_argument("--progress", action="store_true")
+    parser.add_argument("--status-file", type=str, default=None)
     args = parser.parse_args()
 
-    generate_dataset(path=args.out, n_records=args.n, as_array=args.array)
+    progress = None
+    if args.progress or args.status_file:
+        progress = Progress(args.n, label=args.out, status_path=args.status_file,
+                            out=sys.stderr if args.progress else None)
+
+    generate_dataset(path=args.out, n_records=args.n, as_array=args.array, progress=progress)
@@ -0,0 +1,132 @@
+# merge_shards.py
+# Verify and concatenate shards written with chat_dataset_generator.py --shard i/N.
+# Every shard has a <file>.manifest.json (seed, total, record range, sha256).
+# The merge refuses to run on gaps, overlaps, mismatched seeds/options or
+# corrupted files; the merged output is byte-identical to a single-machine
+# run with the same --seed and --n.
+# Usage:
+#   python merge_shards.py part-*.jsonl --out chat_pairs.jsonl
+#   python merge_shards.py part-*.jsonl --out chat_pairs.json --array
+import json, os, sys, shutil, argparse
+
+from chat_dataset_generator import MANIFEST_SUFFIX, shard_range, file_sha256
+
+def load_manifest(path):
+    if path.endswith(MANIFEST_SUFFIX):
+        manifest_path, data_path = path, path[:-len(MANIFEST_SUFFIX)]
+    else:
+        manifest_path, data_path = path + MANIFEST_SUFFIX, path
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        m = json.load(f)
+    m["path"] = data_path
+    return m
+
+def count_lines(path):
+    n = 0
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            n += block.count(b"\n")
+    return n
+
+# ---------------------------
+# Checks
+# ---------------------------
+
+def check(manifests, verify_data=True):
+    errors = []
+    if not manifests:
+        return ["no shards given"]
+    ref = manifests[0]
+    for m in manifests:
+        for key in ("generator", "options", "seed", "total", "shards"):
+            if m.get(key) != ref.get(key):
+                errors.append(f"{m['path']}: {key}={m.get(key)!r} differs from {ref['path']} ({ref.get(key)!r})")
+    if errors:
+        return errors
+
+    total, shards = ref["total"], ref["shards"]
+    by_index = {}
+    for m in manifests:
+        if m["shard"] in by_index:
+            errors.append(f"shard {m['shard']} given twice: {by_index[m['shard']]['path']} and {m['path']}")
+        by_index[m["shard"]] = m
+        if (m["start"], m["end"]) != shard_range(total, m["shard"], shards):
+            errors.append(f"{m['path']}: range [{m['start']}, {m['end']}) is not shard {m['shard']}/{shards} of {total}")
+    missing = [i for i in range(shards) if i not in by_index]
+    if missing:
+        errors.append(f"missing shards: {missing}")
+
+    # ranges must tile [0, total) exactly
+    pos = 0
+    for m in sorted(manifests, key=lambda m: (m["start"], m["end"])):
+        if m["start"] > pos:
+            errors.append(f"gap: records [{pos}, {m['start']}) are in no shard")
+        elif m["start"] < pos:
+            errors.append(f"overlap: {m['path']} starts at {m['start']}, previous shard ends at {pos}")
+        pos = max(pos, m["end"])
+    if pos != total:
+        errors.append(f"shards end at record {pos}, expected {total}")
+
+    if verify_data:
+        for m in manifests:
+            path = m["path"]
+            if not os.path.exists(path):
+                errors.append(f"{path}: file missing")
+                continue
+            if os.path.getsize(path) != m["bytes"]:
+                errors.append(f"{path}: size {os.path.getsize(path)} != manifest {m['bytes']}")
+                continue
+            if file_sha256(path) != m["sha256"]:
+                errors.append(f"{path}: sha256 mismatch")
+                continue
+            lines = count_lines(path)
+            if lines != m["end"] - m["start"]:
+                errors.append(f"{path}: {lines} records, manifest says {m['end'] - m['start']}")
+    return errors
+
+# ---------------------------
+# Merge
+# ---------------------------
+
+def merge(manifests, out_path, as_array=False):
+    ordered = sorted(manifests, key=lambda m: m["start"])
+    with open(out_path, "wb") as out:
+        if not as_array:
+            for m in ordered:
+                with open(m["path"], "rb") as f:
+                    shutil.copyfileobj(f, out, 1 << 20)
+            return
+        # same bytes as generate(..., as_array=True): "[" + ",".join(records) + "]"
+        out.write(b"[")
+        first = True
+        for m in ordered:
+            with open(m["path"], "rb") as f:
+                for line in f:
+                    if not first:
+                        out.write(b",")
+                    out.write(line.rstrip(b"\n"))
+                    first = False
+        out.write(b"]")
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("shards", nargs="+", help="shard files or their .manifest.json")
+    ap.add_argument("--out", type=str, required=False, help="merged output path")
+    ap.add_argument("--array", action="store_true", help="write the merged dataset as a JSON array")
+    ap.add_argument("--check-only", action="store_true", help="verify manifests and files, do not merge")
+    args = ap.parse_args()
+
+    manifests = [load_manifest(p) for p in args.shards]
+    errors = check(manifests)
+    for e in errors:
+        print(f"❌ {e}")
+    if errors:
+        sys.exit(1)
+    ref = manifests[0]
+    print(f"✅ {len(manifests)}/{ref['shards']} shards cover records [0, {ref['total']}) with seed {ref['seed']}")
+    if args.check_only:
+        sys.exit(0)
+    if not args.out:
+        ap.error("--out is required unless --check-only is given")
+    merge(manifests, args.out, as_array=args.array)
+    print(f"✅ merged into {args.out}")
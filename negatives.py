@@ -0,0 +1,136 @@
+# negatives.py
+# Contrastive (ask, wrong answer) pairs for reranker training.
+# For every category of ANS two complement alias tables are built once:
+#   easy: every answer of every other category, weighted by how often the
+#         generator would pick it;
+#   hard: only answers of the few categories most similar to this one (shared
+#         answer/ask vocabulary), weighted by that similarity.
+# Answers that also occur in the category's own pools are never negatives,
+# and neither is anything equal to one of the record's own answers.
+# Asks of categories without answers of their own ("mixed": pronoun patterns
+# that ask about plans, places, food, work, ... at once) get no negatives:
+# there is no category to take the complement of, and an answer from any of
+# the categories they mix would be a plausible reply rather than a negative.
+# A negative is then two O(1) draws: the answer from the complement table and
+# its styled form from the compiled answer tables (style_tables.py), so it
+# looks like a positive apart from its meaning.
+# Records carry their negatives inline, so one pass writes both:
+#   {"ask": ..., "ans": [...], "neg_hard": [...], "neg_easy": [...]}
+# Usage:
+#   python chat_dataset_generator.py --out rerank.jsonl --n 1000000 --hard-neg 2 --easy-neg 2
+#   python negatives.py   # print each category's hard neighbours
+import re, random
+from collections import Counter
+
+import chat_dataset_generator as gen
+from style_tables import AliasTable, CompiledStyles
+
+HARD_NEIGHBOURS = 3
+MAX_TRIES = 8
+TOKEN_RE = re.compile(r"\w+")
+
+# ---------------------------
+# Category statistics
+# ---------------------------
+
+def answer_weights(ans):
+    # expected picks of each answer string, per category: sample_answers picks
+    # a pool uniformly, so every pool carries the same total weight
+    out = {}
+    for cat, pools in ans.items():
+        w = Counter()
+        for pool in pools:
+            uniq = list(dict.fromkeys(pool))
+            for a in uniq:
+                w[a] += 1.0 / (len(pools) * len(uniq))
+        out[cat] = w
+    return out
+
+def vocab(ans, ask_bank):
+    words = {cat: set() for cat in ans}
+    for cat, pools in ans.items():
+        for pool in pools:
+            for a in pool:
+                words[cat].update(TOKEN_RE.findall(a.lower()))
+    for cat, text in ask_bank:
+        if cat in words:
+            words[cat].update(TOKEN_RE.findall(text.lower()))
+    return words
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+# ---------------------------
+# Sampler
+# ---------------------------
+
+class NegativeSampler:
+    def __init__(self, ans=None, ask_bank=None, hard=1, easy=1, neighbours=HARD_NEIGHBOURS, styles=None):
+        ans = ans if ans is not None else gen.ANS
+        ask_bank = ask_bank if ask_bank is not None else gen.ASK_BANK
+        self.hard, self.easy = hard, easy
+        self.styles = styles if styles is not None else CompiledStyles(ask_bank, ans)
+        weights = answer_weights(ans)
+        words = vocab(ans, ask_bank)
+        cats = sorted(ans)
+        self.neighbours = {}
+        self.hard_tables = {}
+        self.easy_tables = {}
+        for cat in cats:
+            own = weights[cat]
+            easy = Counter()
+            for other in cats:
+                if other != cat:
+                    easy.update({a: w for a, w in weights[other].items() if a not in own})
+            sims = sorted(((jaccard(words[cat], words[o]), o) for o in cats if o != cat), reverse=True)
+            near = [(s, o) for s, o in sims[:neighbours] if s > 0]
+            hard = Counter()
+            for s, o in near:
+                hard.update({a: w * s for a, w in weights[o].items() if a not in own})
+            self.neighbours[cat] = [o for _, o in near]
+            self.easy_tables[cat] = AliasTable(easy)
+            self.hard_tables[cat] = AliasTable(hard) if hard else self.easy_tables[cat]
+
+    def _draw(self, table, k, taken, positives):
+        styled = self.styles.answers
+        out = []
+        for _ in range(k * MAX_TRIES):
+            if len(out) == k:
+                break
+            a = table.sample()
+            if a in taken or a in positives:
+                continue
+            s = styled[a].sample() if a in styled else a
+            if s in positives:
+                continue
+            taken.add(a)
+            out.append(s)
+        return out
+
+    def negatives(self, cat, positives=()):
+        # positives: the record's own answers, which a negative must never equal
+        if cat not in self.easy_tables:
+            return [], []  # no answers of its own ("mixed"): skipped, see header
+        taken = set()      # no answer twice in one record
+        positives = set(positives)
+        hard = self._draw(self.hard_tables[cat], self.hard, taken, positives)
+        easy = self._draw(self.easy_tables[cat], self.easy, taken, positives)
+        return hard, easy
+
+    def wrap(self, labeled_fn):
+        # labeled_fn() -> (category, record); returns a make_pair()-style function
+        def make_pair():
+            cat, obj = labeled_fn()
+            hard, easy = self.negatives(cat, obj["ans"])
+            obj["neg_hard"] = hard
+            obj["neg_easy"] = easy
+            return obj
+        return make_pair
+
+if __name__ == "__main__":
+    sampler = NegativeSampler()
+    for cat in sorted(sampler.hard_tables):
+        print(f"{cat:>12}: hard from {', '.join(sampler.neighbours[cat]) or '-'}"
+              f" ({len(sampler.hard_tables[cat])} answers), easy from {len(sampler.easy_tables[cat])} answers")
+    random.seed(gen.DEFAULT_SEED)
+    print(sampler.wrap(gen.make_labeled_pair)())
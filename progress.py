@@ -0,0 +1,151 @@
+# progress.py
+# Live progress for long generator runs.
+# The generating loop iterates over progress.records(n, writer) instead of
+# range(n); the clock is only read once every `every` records (a plain range
+# in between), so the per-record cost is nil. At most once per interval a line
+# with records/sec, MB written, ETA and current RSS goes to stderr (rewritten
+# in place on a terminal), and with status_path a JSON status file is replaced
+# atomically every status_every seconds for schedulers to poll:
+#   {"state": "running", "records": ..., "total": ..., "bytes": ..., "rate": ...,
+#    "eta_s": ..., "rss_bytes": ..., "elapsed_s": ..., "pid": ..., "updated": ...}
+# state becomes "done" at the end, or "stopped" if the loop was left early.
+# Usage:
+#   python chat_dataset_generator.py --out chat_pairs.jsonl --n 100000000 --progress
+#   python chat_dataset_generator.py --n 100000000 --status-file run.status.json
+#   python q1.py --n 10000000 --progress
+import os, sys, json, time
+
+EVERY = 10000
+SMOOTHING = 0.3
+
+def rss_bytes():
+    # current resident set size; peak RSS where /proc is unavailable
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+def duration(seconds):
+    if seconds is None:
+        return "?"
+    seconds = int(seconds)
+    h, rest = divmod(seconds, 3600)
+    m, s = divmod(rest, 60)
+    return f"{h}h{m:02d}m" if h else f"{m}m{s:02d}s" if m else f"{s}s"
+
+class Progress:
+    def __init__(self, total, label="", every=EVERY, interval=None, status_path=None, status_every=5.0,
+                 out=sys.stderr):
+        # out=None: status file only
+        self.total = total
+        self.label = label
+        self.every = max(1, every)
+        self.tty = out is not None and out.isatty()
+        self.interval = interval if interval is not None else (0.5 if self.tty else 30.0)
+        self.status_path = status_path
+        self.status_every = status_every
+        self.out = out
+        self.source = None
+        self.count = 0
+        self.rate = None
+        self.start = self.last = self.last_print = self.last_status = time.monotonic()
+        self.last_count = 0
+        self.width = 0
+
+    @property
+    def written(self):
+        return getattr(self.source, "written", 0) if self.source is not None else 0
+
+    def records(self, n, source=None, start=0):
+        # range(start, n); source: anything with a .written byte count
+        # (BlockWriter, BucketWriter)
+        self.source = source
+        try:
+            for lo in range(start, n, self.every):
+                hi = min(lo + self.every, n)
+                yield from range(lo, hi)
+                self.update(hi)
+        except GeneratorExit:
+            self.finish("stopped")
+            raise
+
+    # ---------------------------
+    # Reporting
+    # ---------------------------
+
+    def update(self, count):
+        self.count = count
+        now = time.monotonic()
+        if now - self.last > 0:
+            rate = (count - self.last_count) / (now - self.last)
+            self.rate = rate if self.rate is None else SMOOTHING * rate + (1 - SMOOTHING) * self.rate
+            self.last, self.last_count = now, count
+        if self.out is not None and now - self.last_print >= self.interval:
+            self.last_print = now
+            self._print()
+        if self.status_path and now - self.last_status >= self.status_every:
+            self.last_status = now
+            self._write_status("running")
+
+    def finish(self, state="done"):
+        now = time.monotonic()
+        if state == "done":
+            self.count = self.total
+            elapsed = now - self.start
+            self.rate = self.count / elapsed if elapsed > 0 else self.rate
+        if self.out is not None:
+            self._print(final=True)
+        if self.status_path:
+            self._write_status(state)
+
+    def eta(self):
+        if self.count >= self.total:
+            return 0.0
+        if not self.rate:
+            return None
+        return (self.total - self.count) / self.rate
+
+    def snapshot(self, state):
+        eta = self.eta()
+        return {
+            "state": state, "label": self.label,
+            "records": self.count, "total": self.total,
+            "bytes": self.written,
+            "rate": round(self.rate or 0.0, 1),
+            "eta_s": None if eta is None else round(eta, 1),
+            "rss_bytes": rss_bytes(),
+            "elapsed_s": round(time.monotonic() - self.start, 1),
+            "pid": os.getpid(),
+            "updated": time.time(),
+        }
+
+    def _print(self, final=False):
+        pct = self.count / self.total if self.total else 1.0
+        line = (f"{self.label + ': ' if self.label else ''}{self.count:,}/{self.total:,} ({pct:.1%})"
+                f"  {self.rate or 0:,.0f} rec/s  {self.written / 1e6:,.1f} MB"
+                f"  {'took ' + duration(time.monotonic() - self.start) if final else 'ETA ' + duration(self.eta())}"
+                f"  RSS {rss_bytes() / 1e6:,.0f} MB")
+        if self.tty:
+            self.out.write("\r" + line.ljust(self.width) + ("\n" if final else ""))
+            self.width = len(line)
+        else:
+            self.out.write(line + "\n")
+        self.out.flush()
+
+    def _write_status(self, state):
+        tmp = self.status_path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.snapshot(state), f)
+            os.replace(tmp, self.status_path)
+        except OSError as e:
+            # a status file must never take the run down
+            if self.out is not None:
+                self.out.write(f"\n❌ status file {self.status_path}: {e}\n")
+
+def records(n, progress=None, source=None, start=0):
+    # range(start, n), reported through progress when one is given
+    return progress.records(n, source, start) if progress is not None else range(start, n)
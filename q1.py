@@ -1,31 +1,55 @@
 import json
 import random
 import argparse
+import sys
+
+from block_writer import BlockWriter
+from progress import Progress, records
+from templates import Grammar
+
+PRONOUNS = ["tui", "tumi", "apni"]
+TIME_WORDS = ["aj", "kal", "sokal e", "bikel e", "raat e"]
 
 # 🔑 Word variation for Banglish spelling feel
+BANGLISH_VARIANTS = {
+    "valo": ["valo", "bhalo"],
+    "koros": ["koros", "korsos", "korteso"],
+    "ache": ["ache", "ase"],
+    "achi": ["achi", "asi", "ase"],
+    "thik": ["thik", "tik"],
+    "kemon": ["kemon", "kemne", "kmn"],
+    "ki": ["ki", "ki re", "ki vai"],
+}
+
 def banglish_variation(word):
-    mapping = {
-        "valo": ["valo", "bhalo"],
-        "koros": ["koros", "korsos", "korteso"],
-        "ache": ["ache", "ase"],
-        "achi": ["achi", "asi", "ase"],
-        "thik": ["thik", "tik"],
-        "kemon": ["kemon", "kemne", "kmn"],
-        "ki": ["ki", "ki re", "ki vai"],
-    }
-    return random.choice(mapping.get(word, [word]))
+    return random.choice(BANGLISH_VARIANTS.get(word, [word]))
+
+# templates in CHAT_CATEGORIES may use {you}, {time} and {variant:word};
+# they are compiled once and rendered per record
+GRAMMAR = Grammar({"you": PRONOUNS, "time": TIME_WORDS}, variants=BANGLISH_VARIANTS)
+
+FILLER_P = 0.25
+EMOJI_P = 0.2
+
+# optional style_profile.StyleProfile (--style): block quotas instead of coin flips
+STYLE = None
+
+def chance(name, p):
+    if STYLE is None:
+        return random.random() < p
+    return STYLE.hit(name)
 
 # 🔑 Random fillers/slang
 def add_filler(ans):
     fillers = ["hmm", "arre", "oyee", "acha", "jhamela nai", "lol", "xD", "hahaha"]
-    if random.random() < 0.25:
+    if chance("filler", FILLER_P):
         return random.choice(fillers) + " " + ans
     return ans
 
 # 🔑 Random emoji add
 def add_emoji(ans):
     emojis = ["😂", "😅", "😌", "😔", "🤔", "🤟", "😎", "🥹", "🔥", "👌"]
-    if random.random() < 0.2:
+    if chance("ans_emoji", EMOJI_P):
         return ans + " " + random.choice(emojis)
     return ans
 
@@ -36,12 +60,12 @@ CHAT_CATEGORIES = {
     "greeting": {
         "ask": ["hi", "hello", "hie", "ki obostha?", "kemon aso?", "ki khobor?"],
         "ans": [
-            ["valo " + banglish_variation("achi"), "bhalo asi", "good good"],
-            ["thik " + banglish_variation("ache"), "acha asi", "fine re"],
+            ["valo {variant:achi}", "bhalo asi", "good good"],
+            ["thik {variant:ache}", "acha asi", "fine re"],
         ],
     },
     "where": {
-        "ask": ["tui koi?", "kothay?", "aj kothay thakis?", "bari koi?", "campus e?"],
+        "ask": ["{you} koi?", "kothay?", "{time} kothay thakis?", "bari koi?", "campus e?"],
         "ans": [
             ["ghore", "bari te", "home e"],
             ["campus e", "library te", "class e"],
@@ -49,7 +73,7 @@ CHAT_CATEGORIES = {
         ],
     },
     "doing": {
-        "ask": ["ki " + banglish_variation("koros") + "?", "aj ki korli?", "ekhon ki korteso?"],
+        "ask": ["ki {variant:koros}?", "{time} ki korli?", "ekhon ki korteso?"],
         "ans": [
             ["ghumaitesi", "kaj kortesi", "class e"],
             ["movie dekhsi", "game kheltasi", "youtube e chill"],
@@ -89,16 +113,25 @@ CHAT_CATEGORIES = {
     },
 }
 
+COMPILED = {
+    cat: {
+        "ask": [GRAMMAR.compile(t) for t in spec["ask"]],
+        "ans": [[GRAMMAR.compile(t) for t in pool] for pool in spec["ans"]],
+    }
+    for cat, spec in CHAT_CATEGORIES.items()
+}
+CATEGORY_NAMES = list(COMPILED)
+
 # ---------------------------
 # Chat generator (natural style)
 # ---------------------------
 def random_chat():
-    category = random.choice(list(CHAT_CATEGORIES.keys()))
-    asks = CHAT_CATEGORIES[category]["ask"]
-    answers_pool = CHAT_CATEGORIES[category]["ans"]
+    category = random.choice(CATEGORY_NAMES)
+    asks = COMPILED[category]["ask"]
+    answers_pool = COMPILED[category]["ans"]
 
-    ask = random.choice(asks)
-    ans = random.choice(answers_pool)
+    ask = random.choice(asks).render()
+    ans = [t.render() for t in random.choice(answers_pool)]
 
     # variation: fillers + emoji + spelling mix
     ans = [add_emoji(add_filler(a)) for a in ans]
@@ -112,11 +145,12 @@ def random_chat():
 # ---------------------------
 # Dataset Writer
 # ---------------------------
-def generate_dataset(path="chat_pairs.jsonl", n_records=10000, as_array=False):
+def generate_dataset(path="chat_pairs.jsonl", n_records=10000, as_array=False, progress=None):
+    # chunks are written by a background BlockWriter thread in large blocks
     if as_array:
-        with open(path, "w", encoding="utf-8") as f:
+        with BlockWriter(path) as f:
             f.write("[")
-            for i in range(n_records):
+            for i in records(n_records, progress, f):
                 obj = random_chat()
                 chunk = json.dumps(obj, ensure_ascii=False)
                 if i > 0:
@@ -124,11 +158,13 @@ def generate_dataset(path="chat_pairs.jsonl", n_records=10000, as_array=False):
                 f.write(chunk)
             f.write("]")
     else:
-        with open(path, "w", encoding="utf-8") as f:
-            for i in range(n_records):
+        with BlockWriter(path) as f:
+            for i in records(n_records, progress, f):
                 obj = random_chat()
                 chunk = json.dumps(obj, ensure_ascii=False)
                 f.write(chunk + "\n")
+    if progress is not None:
+        progress.finish()
     print(f"✅ Done: {path} with {n_records} records")
 
 # ---------------------------
@@ -139,6 +175,24 @@ if __name__ == "__main__":
     parser.add_argument("--out", type=str, default="chat_pairs.jsonl")
     parser.add_argument("--n", type=int, default=10000)
     parser.add_argument("--array", action="store_true")
+    parser.add_argument("--style", type=str, default=None, help="exact filler/ans_emoji rates (style_profile.py)")
+    parser.add_argument("--progress", action="store_true")
+    parser.add_argument("--status-file", type=str, default=None)
     args = parser.parse_args()
 
-    generate_dataset(path=args.out, n_records=args.n, as_array=args.array)
+    if args.style:
+        from style_profile import StyleProfile, parse_rates
+        try:
+            STYLE = StyleProfile(parse_rates(args.style), {"filler": FILLER_P, "ans_emoji": EMOJI_P})
+        except (OSError, ValueError) as e:
+            parser.error(f"--style: {e}")
+
+    progress = None
+    if args.progress or args.status_file:
+        progress = Progress(args.n, label=args.out, status_path=args.status_file,
+                            out=sys.stderr if args.progress else None)
+
+    generate_dataset(path=args.out, n_records=args.n, as_array=args.array, progress=progress)
+    if STYLE is not None:
+        print("style rates:")
+        print("\n".join(STYLE.report()))
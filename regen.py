@@ -0,0 +1,473 @@
+# regen.py
+# Incremental regeneration after bank edits.
+# "generate" writes a JSONL dataset (byte-identical to chat_dataset_generator.py
+# with the same --seed/--n [--seed-blocks]) plus three sidecars:
+#   <path>.prov       8 bytes per record: ask id, pool id, extra pool id, line length
+#   <path>.prov.json  snapshot of the ASK_BANK / ANS the ids refer to
+#   <path>.prov.idx   the record indices of every ask id and every (category,
+#                     pool id), and the byte offset of every INDEX_STRIDE-th record
+# "update" compares the snapshot with the current banks and reads from the
+# index only the records that reference a removed/edited ask or pool; when
+# asks or pools were added to a category, that category's records are re-drawn
+# with probability added/total (geometric skips through its ask lists, so one
+# draw per picked record) so the new entries get their share. The bytes
+# between rewritten records are copied through unread (unchanged records stay
+# byte-identical), and rewritten records are seeded from (seed, snapshot,
+# record index), so updates are reproducible. Ask ids are never reused: a
+# removed ask stays in the snapshot as null and added asks get new ids, so the
+# provenance of unchanged records needs no rewrite.
+# Usage:
+#   python regen.py generate --out chat_pairs.jsonl --n 50000000 --seed 42
+#   (edit ANS / ASK_BANK in chat_dataset_generator.py)
+#   python regen.py update chat_pairs.jsonl            # in place
+#   python regen.py update chat_pairs.jsonl --out chat_pairs.v2.jsonl --dry-run
+import json, os, sys, math, random, struct, hashlib, argparse
+from array import array
+from collections import Counter
+from itertools import accumulate
+
+import chat_dataset_generator as gen
+from block_writer import BlockWriter
+
+PROV_SUFFIX = ".prov"
+SNAPSHOT_SUFFIX = ".prov.json"
+INDEX_SUFFIX = ".prov.idx"
+PROV = struct.Struct("<HBBI")     # ask id, pool id, extra pool id (NO_POOL if none), line bytes
+NO_POOL = 255
+INDEX_HEADER = struct.Struct("<Q")  # bytes of the JSON header in front of the id lists
+INDEX_STRIDE = 256                  # records per stored byte offset
+COPY_CHUNK = 1 << 24
+
+def pools_of(ans, cat):
+    return ans.get(cat, [["ok"]])
+
+def snapshot(seed, asks=None):
+    # asks: [cat, text] per provenance id, None for an ask removed since
+    return {"seed": seed, "asks": [list(a) for a in gen.ASK_BANK] if asks is None else asks, "ans": gen.ANS}
+
+def snapshot_id(snap):
+    text = json.dumps(snap, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+def check_limits(n_asks=None):
+    if (len(gen.ASK_BANK) if n_asks is None else n_asks) > 0xFFFF:
+        raise ValueError("provenance ids support at most 65535 asks")
+    if any(len(p) >= NO_POOL for p in gen.ANS.values()):
+        raise ValueError(f"provenance ids support at most {NO_POOL - 1} pools per category")
+
+def write_all(fd, data):
+    data = memoryview(data)
+    while data:
+        data = data[os.write(fd, data):]
+
+def write_snapshot(path, snap):
+    with open(path + SNAPSHOT_SUFFIX + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(snap, f, ensure_ascii=False)
+
+def replace_sidecars(path):
+    for suffix in (PROV_SUFFIX, INDEX_SUFFIX, SNAPSHOT_SUFFIX):
+        os.replace(path + suffix + ".tmp", path + suffix)
+
+# ---------------------------
+# Provenance index
+# ---------------------------
+
+def ask_key(a):
+    return f"a:{a}"
+
+def pool_key(cat, p):
+    return f"p:{cat}:{p}"
+
+def record_keys(a, cat, p1, p2):
+    keys = [ask_key(a), pool_key(cat, p1)]
+    if p2 != NO_POOL and p2 != p1:
+        keys.append(pool_key(cat, p2))
+    return keys
+
+def build_index(prov, asks):
+    # (offsets of every INDEX_STRIDE-th record, {key: array of record indices})
+    offsets, lists, keys_of = [], {}, {}
+    pos = 0
+    for idx, (a, p1, p2, length) in enumerate(PROV.iter_unpack(prov)):
+        if idx % INDEX_STRIDE == 0:
+            offsets.append(pos)
+        keys = keys_of.get((a, p1, p2))
+        if keys is None:
+            keys = keys_of[(a, p1, p2)] = record_keys(a, asks[a][0], p1, p2)
+        for key in keys:
+            lists.setdefault(key, array("I")).append(idx)
+        pos += length
+    return offsets, lists
+
+def write_index(path, n, offsets, lists, old=None, stride=INDEX_STRIDE):
+    # lists: {key: array of record indices, or (start, count) of a list in
+    # the old index to copy through unread}
+    keys, at = {}, 0
+    for key in sorted(lists):
+        count = lists[key][1] if isinstance(lists[key], tuple) else len(lists[key])
+        keys[key] = [at, count]
+        at += count
+    head = json.dumps({"n": n, "stride": stride, "offsets": offsets, "keys": keys}).encode("utf-8")
+    fd = os.open(path + INDEX_SUFFIX + ".tmp", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        write_all(fd, INDEX_HEADER.pack(len(head)) + head)
+        for key in sorted(lists):
+            ids = lists[key]
+            if isinstance(ids, tuple):
+                copy_range(old.fd, fd, old.data + 4 * ids[0], 4 * ids[1])
+                continue
+            if sys.byteorder == "big":
+                ids = array("I", ids)
+                ids.byteswap()
+            write_all(fd, ids.tobytes())
+    finally:
+        os.close(fd)
+
+class ProvIndex:
+    def __init__(self, path):
+        self.fd = os.open(path + INDEX_SUFFIX, os.O_RDONLY)
+        size, = INDEX_HEADER.unpack(os.pread(self.fd, INDEX_HEADER.size, 0))
+        head = json.loads(os.pread(self.fd, size, INDEX_HEADER.size))
+        self.n, self.stride, self.offsets, self.keys = head["n"], head["stride"], head["offsets"], head["keys"]
+        self.data = INDEX_HEADER.size + size
+
+    def get(self, key):
+        start, count = self.keys.get(key, (0, 0))
+        ids = array("I")
+        ids.frombytes(os.pread(self.fd, 4 * count, self.data + 4 * start))
+        if sys.byteorder == "big":
+            ids.byteswap()
+        return ids
+
+    def close(self):
+        os.close(self.fd)
+
+# ---------------------------
+# Generate with provenance
+# ---------------------------
+
+def generate(path, n, seed=gen.DEFAULT_SEED, seed_blocks=False):
+    check_limits()
+    random.seed(seed)
+    block_seed = seed if seed_blocks else None
+    traced_pair = gen.block_seeded(gen.make_traced_pair, block_seed)
+    prov = bytearray()
+    pack = PROV.pack
+    with BlockWriter(path) as out:
+        for _ in range(n):
+            i, _, obj, p1, p2 = traced_pair()
+            line = json.dumps(obj, ensure_ascii=False) + "\n"
+            out.write(line)
+            prov += pack(i, p1, NO_POOL if p2 is None else p2, len(line.encode("utf-8")))
+    with open(path + PROV_SUFFIX + ".tmp", "wb") as f:
+        f.write(prov)
+    offsets, lists = build_index(prov, gen.ASK_BANK)
+    write_index(path, n, offsets, lists)
+    write_snapshot(path, snapshot(seed))
+    replace_sidecars(path)
+    # so the output can be --append-ed like a generator run
+    gen.save_state(path, n, False, {"seed_blocks": gen.SEED_BLOCKS_VERSION if seed_blocks else 0}, block_seed)
+    return n
+
+# ---------------------------
+# Diff the banks
+# ---------------------------
+
+class BankDiff:
+    def __init__(self, old):
+        new_asks = [tuple(a) for a in gen.ASK_BANK]
+        new_ids = {a: j for j, a in enumerate(new_asks)}
+        # provenance id -> (cat, text), None when removed by an earlier update
+        old_asks = [tuple(a) if a else None for a in old["asks"]]
+        old_set = set(old_asks)
+        # provenance id -> current ASK_BANK id, or None when the ask is gone
+        self.ask_map = [new_ids.get(a) for a in old_asks]
+        self.ask_cat = [a and a[0] for a in old_asks]
+        self.removed_ids = [k for k, a in enumerate(old_asks) if a is not None and a not in new_ids]
+        self.removed_asks = [old_asks[k] for k in self.removed_ids]
+        self.added_asks = [a for a in new_asks if a not in old_set]
+        # the next snapshot's asks: old ids keep their place, added asks
+        # get new ids, and prov_id maps ASK_BANK ids to them
+        self.asks = [list(a) if a in new_ids else None for a in old_asks] + [list(a) for a in self.added_asks]
+        ids = {tuple(a): k for k, a in enumerate(self.asks) if a}
+        self.prov_id = [ids[a] for a in new_asks]
+        self.ids_by_cat = {}
+        for k, a in enumerate(old_asks):
+            if a is not None:
+                self.ids_by_cat.setdefault(a[0], []).append(k)
+        self.asks_by_cat = {}
+        for j, (cat, _) in enumerate(new_asks):
+            self.asks_by_cat.setdefault(cat, []).append(j)
+        self.added_by_cat = {}
+        for a in self.added_asks:
+            self.added_by_cat.setdefault(a[0], []).append(new_ids[a])
+        # per category: which old pool ids changed, which new pool ids are new
+        self.changed_pools = {}
+        self.added_pools = {}
+        for cat in set(old["ans"]) | set(gen.ANS) | set(self.ids_by_cat):
+            before, after = pools_of(old["ans"], cat), pools_of(gen.ANS, cat)
+            changed = {k for k, pool in enumerate(before) if k >= len(after) or after[k] != pool}
+            if changed:
+                self.changed_pools[cat] = changed
+            if len(after) > len(before):
+                self.added_pools[cat] = list(range(len(before), len(after)))
+
+    def empty(self):
+        return not (self.removed_asks or self.added_asks or self.changed_pools or self.added_pools)
+
+    def summary(self):
+        lines = []
+        for cat, text in self.removed_asks:
+            lines.append(f"  - ask   {cat}: {text}")
+        for cat, text in self.added_asks:
+            lines.append(f"  + ask   {cat}: {text}")
+        for cat in sorted(self.changed_pools):
+            lines.append(f"  ~ pools {cat}: {sorted(self.changed_pools[cat])}")
+        for cat in sorted(self.added_pools):
+            lines.append(f"  + pools {cat}: {self.added_pools[cat]}")
+        return lines
+
+# ---------------------------
+# Update
+# ---------------------------
+
+def copy_range(src_fd, dst_fd, start, length):
+    # unchanged records: copied in the kernel where copy_file_range exists
+    while length:
+        try:
+            done = os.copy_file_range(src_fd, dst_fd, min(length, COPY_CHUNK), start)
+        except (AttributeError, OSError):
+            block = os.pread(src_fd, min(length, COPY_CHUNK), start)
+            done = os.write(dst_fd, block) if block else 0
+        if done == 0:
+            raise ValueError("dataset is shorter than its provenance says")
+        start += done
+        length -= done
+
+def rewrite(line, old_cat, ask_id, p1, p2, new_ask, new_pool):
+    # returns (line, ask id, pool id, extra pool id) with only the affected
+    # half of the record regenerated. new_pool: False keeps the answers, None
+    # re-draws them from scratch, "same" re-draws from the same pool ids
+    # (edited pools keep their share of records) and an int forces that pool
+    obj = json.loads(line)
+    if new_ask is not None:
+        cat, text = gen.ASK_BANK[new_ask]
+        obj["ask"] = gen.make_ask(cat, text)
+        ask_id = new_ask
+    cat = gen.ASK_BANK[ask_id][0]
+    if cat != old_cat:
+        new_pool = None     # the ask moved category (its own was emptied)
+    extra = None
+    if new_pool == "same":
+        # a removed pool falls back to a random draw for its part
+        n_pools = len(pools_of(gen.ANS, cat))
+        new_pool = p1 if p1 < n_pools else None
+        if new_pool is not None:
+            extra = False if p2 == NO_POOL else (p2 if p2 < n_pools else None)
+    if new_pool is not False:
+        ans, p1, p2 = gen.sample_answers_traced(cat, pool=new_pool, extra=extra)
+        obj["ans"] = gen.stylize_answers(ans)
+        p2 = NO_POOL if p2 is None else p2
+    return json.dumps(obj, ensure_ascii=False) + "\n", ask_id, p1, p2
+
+def bernoulli(ids, p, pick):
+    # the entries of ids kept with probability p each; geometric skips take
+    # one draw per kept entry instead of one per entry
+    if p >= 1:
+        return ids
+    out = []
+    log_q = math.log(1.0 - p)
+    i = int(math.log(1.0 - pick()) / log_q)
+    while i < len(ids):
+        out.append(ids[i])
+        i += 1 + int(math.log(1.0 - pick()) / log_q)
+    return out
+
+def affected(diff, index, pick):
+    # record index -> [reason, category, pool mode (rewrite()'s new_pool,
+    # "added" for a draw from the added pools)]; only the index lists of
+    # removed asks, changed pools and categories that gained entries are read
+    hits = {}
+    for a in diff.removed_ids:
+        for idx in index.get(ask_key(a)):
+            hits[idx] = ["ask removed", diff.ask_cat[a], False]
+    for cat in sorted(diff.added_by_cat):
+        share = len(diff.added_by_cat[cat]) / len(diff.asks_by_cat[cat])
+        for a in diff.ids_by_cat.get(cat, ()):
+            if diff.ask_map[a] is not None:
+                for idx in bernoulli(index.get(ask_key(a)), share, pick):
+                    hits[idx] = ["ask added", cat, False]
+    for cat in sorted(diff.changed_pools):
+        for p in sorted(diff.changed_pools[cat]):
+            for idx in index.get(pool_key(cat, p)):
+                hits.setdefault(idx, ["pool changed", cat, False])[2] = "same"
+    for cat in sorted(diff.added_pools):
+        share = len(diff.added_pools[cat]) / len(pools_of(gen.ANS, cat))
+        for a in diff.ids_by_cat.get(cat, ()):
+            for idx in bernoulli(index.get(ask_key(a)), share, pick):
+                hit = hits.setdefault(idx, ["pool added", cat, False])
+                if hit[2] is False:
+                    hit[2] = "added"
+    return hits
+
+def locate(prov_fd, index, ids):
+    # sorted record indices -> (ask id, pool id, extra pool id, line bytes,
+    # byte offset); one stride of provenance is read per block they fall in
+    out = {}
+    stride = index.stride
+    block = None
+    for idx in ids:
+        b, k = divmod(idx, stride)
+        if b != block:
+            block = b
+            entries = list(PROV.iter_unpack(os.pread(prov_fd, stride * PROV.size, b * stride * PROV.size)))
+            starts = list(accumulate((e[3] for e in entries), initial=index.offsets[b]))
+        out[idx] = entries[k] + (starts[k],)
+    return out
+
+def update(path, out_path=None, dry_run=False):
+    with open(path + SNAPSHOT_SUFFIX, "r", encoding="utf-8") as f:
+        old = json.load(f)
+    n = os.path.getsize(path + PROV_SUFFIX) // PROV.size
+    diff = BankDiff(old)
+    check_limits(len(diff.asks))
+    seed = old["seed"]
+    version = snapshot_id(old)
+    stats = Counter()
+    by_cat = Counter()
+    if diff.empty():
+        return diff, n, stats, by_cat
+
+    if not os.path.exists(path + INDEX_SUFFIX):
+        # generated before the index existed: built once, in one full pass
+        with open(path + PROV_SUFFIX, "rb") as f:
+            offsets, lists = build_index(f.read(), old["asks"])
+        write_index(path, n, offsets, lists)
+        os.replace(path + INDEX_SUFFIX + ".tmp", path + INDEX_SUFFIX)
+    index = ProvIndex(path)
+    try:
+        hits = affected(diff, index, random.Random(f"{seed}:{version}:pick").random)
+        for reason, cat, _ in hits.values():
+            stats[reason] += 1
+            by_cat[cat] += 1
+        if dry_run:
+            return diff, n, stats, by_cat
+        out_path = out_path or path
+        rewrite_records(path, out_path, diff, index, hits, n, f"{seed}:{version}")
+    finally:
+        index.close()
+    os.replace(out_path + ".regen.tmp", out_path)
+    write_snapshot(out_path, snapshot(seed, diff.asks))
+    replace_sidecars(out_path)
+    state = out_path + gen.STATE_SUFFIX
+    if os.path.exists(state):
+        os.remove(state)     # the RNG state no longer matches the file
+    return diff, n, stats, by_cat
+
+def rewrite_records(path, out_path, diff, index, hits, n, version):
+    # writes out_path's .regen.tmp and its .prov/.prov.idx .tmp sidecars:
+    # the records in hits are rewritten, the bytes (and provenance, and
+    # index lists) between them are copied through
+    src = os.open(path, os.O_RDONLY)
+    prov_src = os.open(path + PROV_SUFFIX, os.O_RDONLY)
+    dst = os.open(out_path + ".regen.tmp", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    prov_dst = os.open(out_path + PROV_SUFFIX + ".tmp", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    pending = []            # rewritten lines not yet written
+    shifts = []             # (record index, change in line bytes)
+    removed, added = {}, {}  # index key -> record indices leaving / joining it
+    pos = 0
+    try:
+        copy_range(prov_src, prov_dst, 0, n * PROV.size)
+        touched = sorted(hits)
+        located = locate(prov_src, index, touched)
+        for idx in touched:
+            reason, cat, new_pool = hits[idx]
+            a, p1, p2, length, start = located[idx]
+            random.seed(f"{version}:{idx}")
+            new_ask = None
+            if reason == "ask removed":
+                new_ask = random.choice(diff.asks_by_cat.get(cat) or range(len(gen.ASK_BANK)))
+            elif reason == "ask added":
+                new_ask = random.choice(diff.added_by_cat[cat])
+            if new_pool == "added":
+                new_pool = random.choice(diff.added_pools[cat])
+            if start > pos:
+                if pending:
+                    write_all(dst, b"".join(pending))
+                    pending.clear()
+                copy_range(src, dst, pos, start - pos)
+            line = os.pread(src, length, start).decode("utf-8")
+            line, j, q1, q2 = rewrite(line, cat, diff.ask_map[a], p1, p2, new_ask, new_pool)
+            data = line.encode("utf-8")
+            pending.append(data)
+            if len(pending) >= 10_000:
+                write_all(dst, b"".join(pending))
+                pending.clear()
+            b = diff.prov_id[j]
+            os.pwrite(prov_dst, PROV.pack(b, q1, q2, len(data)), idx * PROV.size)
+            for key in record_keys(a, cat, p1, p2):
+                removed.setdefault(key, set()).add(idx)
+            for key in record_keys(b, gen.ASK_BANK[j][0], q1, q2):
+                added.setdefault(key, []).append(idx)
+            if len(data) != length:
+                shifts.append((idx, len(data) - length))
+            pos = start + length
+        if pending:
+            write_all(dst, b"".join(pending))
+        copy_range(src, dst, pos, os.fstat(src).st_size - pos)
+    finally:
+        for fd in (src, prov_src, dst, prov_dst):
+            os.close(fd)
+
+    # later records moved by the length changes before them
+    offsets = list(index.offsets)
+    shift = k = 0
+    for block in range(len(offsets)):
+        while k < len(shifts) and shifts[k][0] < block * index.stride:
+            shift += shifts[k][1]
+            k += 1
+        offsets[block] += shift
+    lists = {key: tuple(at) for key, at in index.keys.items()}
+    for key in set(removed) | set(added):
+        ids = set(index.get(key)) - removed.get(key, set())
+        ids.update(added.get(key, ()))
+        if ids:
+            lists[key] = array("I", sorted(ids))
+        else:
+            lists.pop(key, None)
+    write_index(out_path, n, offsets, lists, index, index.stride)
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    g = sub.add_parser("generate", help="generate a JSONL dataset with provenance sidecars")
+    g.add_argument("--out", type=str, default="chat_pairs.jsonl")
+    g.add_argument("--n", type=int, default=100000)
+    g.add_argument("--seed", type=int, default=gen.DEFAULT_SEED)
+    g.add_argument("--seed-blocks", action="store_true", help="reseed every block, as chat_dataset_generator.py --seed-blocks")
+    u = sub.add_parser("update", help="rewrite only the records affected by bank edits")
+    u.add_argument("path")
+    u.add_argument("--out", type=str, default=None, help="write here instead of updating in place")
+    u.add_argument("--dry-run", action="store_true", help="only print what would change")
+    args = ap.parse_args()
+
+    if args.cmd == "generate":
+        generate(args.out, args.n, args.seed, args.seed_blocks)
+        print(f"✅ {args.out}: {args.n} records with provenance ({args.out}{PROV_SUFFIX})")
+        sys.exit(0)
+
+    diff, n, stats, by_cat = update(args.path, args.out, args.dry_run)
+    if diff.empty():
+        print(f"✅ banks unchanged since {args.path} was generated; nothing to do")
+        sys.exit(0)
+    print("bank changes:")
+    print("\n".join(diff.summary()))
+    changed = sum(stats.values())
+    verb = "would rewrite" if args.dry_run else "rewrote"
+    print(f"{verb} {changed} of {n} records ({changed / n:.2%})" if n else f"{verb} 0 records")
+    for reason, c in stats.most_common():
+        print(f"  {reason:>13}: {c}")
+    for cat, c in by_cat.most_common():
+        print(f"  {cat:>13}: {c}")
+    if not args.dry_run:
+        print(f"✅ {args.out or args.path} updated")
@@ -0,0 +1,88 @@
+# remix.py
+# Re-stylize an existing {"ask", "ans"} JSONL corpus with the same noise the
+# generator applies to its own banks (make_ask / stylize_answers: punctuation,
+# emoji, lowercasing, bh/th/ee swaps), producing K variants per record.
+# Answer lists are never padded: a variant has at most the record's answers.
+# Workers read newline-aligned byte ranges of the input themselves, so the
+# parent only writes; output order follows input order and every range is
+# seeded from (seed, range index), so reruns are reproducible.
+# Usage:
+#   python remix.py curated.jsonl --out remixed.jsonl --k 4 --dedup --keep-original
+import json, random, hashlib, argparse
+from multiprocessing import Pool
+
+import chat_dataset_generator as gen
+from block_writer import BlockWriter
+from validate_dataset import split_ranges
+
+CHUNK_BYTES = 8 * 1024 * 1024
+
+def remix_record(obj, k, keep_original=False):
+    ask = obj.get("ask", "")
+    ans = obj.get("ans", [])
+    out = []
+    if keep_original:
+        out.append({"ask": ask, "ans": ans})
+    for _ in range(k):
+        out.append({"ask": gen.make_ask(None, ask), "ans": gen.stylize_answers(ans, pad=False)})
+    return out
+
+def remix_range(job):
+    path, start, end, index, k, seed, keep_original, dedup_local = job
+    random.seed(f"{seed}:{index}")
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    lines = []
+    # newlines only: str.splitlines() also splits at U+2028 inside a record
+    for line in data.split(b"\n"):
+        if not line.strip():
+            continue
+        seen = set()
+        for rec in remix_record(json.loads(line), k, keep_original):
+            text = json.dumps(rec, ensure_ascii=False)
+            if dedup_local:
+                if text in seen:
+                    continue
+                seen.add(text)
+            lines.append(text)
+    return lines
+
+def line_hash(text):
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+
+def remix(path, out_path, k=3, seed=0, keep_original=False, dedup=False, workers=None, chunk_bytes=CHUNK_BYTES):
+    jobs = [(path, s, e, i, k, seed, keep_original, dedup)
+            for i, (s, e) in enumerate(split_ranges(path, chunk_bytes))]
+    written = dropped = 0
+    seen = set()
+    with Pool(workers) as pool, BlockWriter(out_path) as out:
+        for lines in pool.imap(remix_range, jobs):
+            for text in lines:
+                if dedup:
+                    h = line_hash(text)
+                    if h in seen:
+                        dropped += 1
+                        continue
+                    seen.add(h)
+                out.write(text + "\n")
+                written += 1
+    return written, dropped
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("input", type=str, help="JSONL corpus with ask/ans records")
+    ap.add_argument("--out", type=str, required=True)
+    ap.add_argument("--k", type=int, default=3, help="stylized variants per record")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--keep-original", action="store_true", help="also write each input record unchanged")
+    ap.add_argument("--dedup", action="store_true", help="drop variants identical to an earlier output line")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--chunk-mb", type=int, default=8, help="input bytes per work unit, in MB")
+    args = ap.parse_args()
+    written, dropped = remix(args.input, args.out, k=args.k, seed=args.seed, keep_original=args.keep_original,
+                             dedup=args.dedup, workers=args.workers, chunk_bytes=args.chunk_mb * 1024 * 1024)
+    msg = f"✅ {args.out}: {written} records"
+    if args.dedup:
+        msg += f" ({dropped} duplicates dropped)"
+    print(msg)
@@ -0,0 +1,377 @@
+# replay.py
+# Load-test a chatbot endpoint with generated asks (or asks replayed from JSONL).
+# Requests are scheduled open-loop at a fixed QPS: the i-th request is due at
+# start + i/qps whether or not earlier ones have returned, and its latency is
+# measured from that due time, so a slow server shows up as latency instead of
+# silently lowering the send rate. Connections are pooled and kept alive.
+# Targets:
+#   http://host:port/path   POST {"message": ask} as JSON, HTTP/1.1 keep-alive
+#   tcp://host:port         one ask per line, one reply line back
+# Usage:
+#   python replay.py serve --port 8080 --mode http --delay-ms 5      # local echo stand-in
+#   python replay.py run --target http://127.0.0.1:8080/chat --qps 500 --duration 30
+#   python replay.py run --target tcp://127.0.0.1:9000 --qps 200 --n 5000 --input chat_pairs.jsonl
+#   python replay.py run --echo --qps 1000 --duration 5                # offline self-test
+import json, sys, time, math, random, asyncio, argparse
+from collections import Counter
+from urllib.parse import urlsplit
+
+TIMEOUT = 10.0
+
+# ---------------------------
+# Message sources
+# ---------------------------
+
+def generated_asks(seed):
+    import chat_dataset_generator as gen
+    random.seed(seed)
+    while True:
+        cat, text = random.choice(gen.ASK_BANK)
+        yield gen.make_ask(cat, text)
+
+def jsonl_asks(path, loop_forever=True):
+    while True:
+        found = False
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                found = True
+                try:
+                    obj = json.loads(line)
+                except ValueError:
+                    yield line
+                    continue
+                yield obj.get("ask", line) if isinstance(obj, dict) else line
+        if not found:
+            # looping over an empty file would never yield
+            raise ValueError(f"{path} has no asks")
+        if not loop_forever:
+            return
+
+# ---------------------------
+# Connection pool
+# ---------------------------
+
+class Pool:
+    def __init__(self, host, port, size):
+        self.host, self.port = host, port
+        self.idle = []
+        self.slots = asyncio.Semaphore(size)
+        self.opened = 0
+
+    async def acquire(self):
+        await self.slots.acquire()
+        if self.idle:
+            return self.idle.pop()
+        try:
+            conn = await asyncio.open_connection(self.host, self.port)
+        except BaseException:
+            self.slots.release()
+            raise
+        self.opened += 1
+        return conn
+
+    def release(self, conn, reuse=True):
+        if reuse:
+            self.idle.append(conn)
+        else:
+            conn[1].close()
+        self.slots.release()
+
+    async def close(self):
+        idle, self.idle = self.idle, []
+        for _, w in idle:
+            w.close()
+        for _, w in idle:
+            try:
+                await w.wait_closed()
+            except OSError:
+                pass
+
+# ---------------------------
+# Protocols
+# ---------------------------
+
+class ProtocolError(Exception):
+    pass
+
+async def http_request(conn, host, path, message):
+    reader, writer = conn
+    body = json.dumps({"message": message}, ensure_ascii=False).encode("utf-8")
+    writer.write((f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                  f"Content-Length: {len(body)}\r\nConnection: keep-alive\r\n\r\n").encode("ascii") + body)
+    await writer.drain()
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionResetError("connection closed")
+    parts = status_line.split(None, 2)
+    if len(parts) < 2 or not parts[1].isdigit():
+        raise ProtocolError(f"bad status line {status_line[:40]!r}")
+    status = int(parts[1])
+    length, keep_alive = None, True
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        name, value = name.strip().lower(), value.strip().lower()
+        if name == "content-length":
+            length = int(value)
+        elif name == "connection" and value == "close":
+            keep_alive = False
+        elif name == "transfer-encoding" and value != "identity":
+            raise ProtocolError(f"unsupported transfer-encoding {value}")
+    if length is None:
+        await reader.read()
+        keep_alive = False
+    else:
+        await reader.readexactly(length)
+    return status, keep_alive
+
+async def line_request(conn, message):
+    reader, writer = conn
+    writer.write(message.replace("\n", " ").encode("utf-8") + b"\n")
+    await writer.drain()
+    reply = await reader.readline()
+    if not reply:
+        raise ConnectionResetError("connection closed")
+    return 200, True
+
+# ---------------------------
+# Runner
+# ---------------------------
+
+class Stats:
+    def __init__(self):
+        self.latencies = []
+        self.errors = Counter()
+        self.sent = 0
+
+    def ok(self, seconds):
+        self.latencies.append(seconds)
+
+    def error(self, kind):
+        self.errors[kind] += 1
+
+async def one_request(target, pool, message, due, stats, timeout):
+    kind, host, path = target
+    conn = None
+    try:
+        conn = await asyncio.wait_for(pool.acquire(), timeout)
+        if kind == "http":
+            coro = http_request(conn, host, path, message)
+        else:
+            coro = line_request(conn, message)
+        status, keep_alive = await asyncio.wait_for(coro, timeout)
+        pool.release(conn, reuse=keep_alive)
+        conn = None
+        if status >= 400:
+            stats.error(f"http_{status}")
+        else:
+            stats.ok(time.perf_counter() - due)
+    except asyncio.TimeoutError:
+        stats.error("timeout")
+    except (ProtocolError, ValueError):
+        # ValueError: unparsable headers such as a non-numeric Content-Length
+        stats.error("protocol")
+    except (OSError, asyncio.IncompleteReadError):
+        stats.error("connection")
+    except Exception:
+        # anything else fails this request, not the run
+        stats.error("other")
+    finally:
+        if conn is not None:
+            pool.release(conn, reuse=False)
+
+def parse_target(url):
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "tcp") or not parts.hostname or not parts.port:
+        raise ValueError(f"target must look like http://host:port/path or tcp://host:port, got {url!r}")
+    return (parts.scheme, parts.hostname, parts.path or "/"), parts.port
+
+async def run(url, messages, qps, n, connections=64, timeout=TIMEOUT, echo=None):
+    server = None
+    if echo is not None:
+        server = EchoServer(echo["mode"], echo["delay"])
+        port = await server.start(0)
+        url = f"http://127.0.0.1:{port}/chat" if echo["mode"] == "http" else f"tcp://127.0.0.1:{port}"
+    target, port = parse_target(url)
+    pool = Pool(target[1], port, connections)
+    stats = Stats()
+    tasks = set()
+    start = time.perf_counter()
+    interval = 1.0 / qps
+    for i, message in zip(range(n), messages):
+        due = start + i * interval
+        delay = due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        task = asyncio.ensure_future(one_request(target, pool, message, due, stats, timeout))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        stats.sent += 1
+    send_end = time.perf_counter()
+    if tasks:
+        await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+    await pool.close()
+    if server is not None:
+        await server.close()
+    return url, stats, send_end - start, elapsed, pool.opened
+
+# ---------------------------
+# Report
+# ---------------------------
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return float("nan")
+    k = min(len(sorted_values) - 1, max(0, math.ceil(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+def histogram(sorted_values, width=40):
+    # log2 buckets in milliseconds: <1, 1-2, 2-4, ...
+    buckets = Counter()
+    for v in sorted_values:
+        ms = v * 1000
+        buckets[0 if ms < 1 else int(math.log2(ms)) + 1] += 1
+    if not buckets:
+        return []
+    peak = max(buckets.values())
+    lines = []
+    for b in range(min(buckets), max(buckets) + 1):
+        lo = 0 if b == 0 else 2 ** (b - 1)
+        label = f"{lo:>6g}-{2 ** b:<6g}ms"
+        count = buckets.get(b, 0)
+        lines.append(f"  {label} {'#' * max(1 if count else 0, round(count / peak * width)):<{width}} {count}")
+    return lines
+
+def report(url, stats, send_time, elapsed, opened, qps):
+    lat = sorted(stats.latencies)
+    failed = sum(stats.errors.values())
+    print(f"target {url}")
+    print(f"sent {stats.sent} in {send_time:.2f}s (target {qps:g} qps, achieved {stats.sent / max(send_time, 1e-9):.1f}),"
+          f" done in {elapsed:.2f}s over {opened} connection(s)")
+    if lat:
+        print("latency ms: " + "  ".join(f"p{p}={percentile(lat, p) * 1000:.2f}" for p in (50, 95, 99))
+              + f"  max={lat[-1] * 1000:.2f}")
+        print("\n".join(histogram(lat)))
+    rate = failed / stats.sent if stats.sent else 0.0
+    print(f"errors: {failed} ({rate:.2%})" + "".join(f"  {k}={v}" for k, v in sorted(stats.errors.items())))
+    return failed
+
+# ---------------------------
+# Echo stand-in server
+# ---------------------------
+
+class EchoServer:
+    def __init__(self, mode="http", delay=0.0):
+        self.mode, self.delay = mode, delay
+        self.server = None
+        self.active = set()
+
+    async def start(self, port, host="127.0.0.1"):
+        handler = self.handle_http if self.mode == "http" else self.handle_line
+        self.server = await asyncio.start_server(handler, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def handle_http(self, reader, writer):
+        self.active.add(asyncio.current_task())
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                length = 0
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    if name.strip().lower() == "content-length":
+                        length = int(value)
+                body = await reader.readexactly(length) if length else b""
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                             b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body)
+                await writer.drain()
+        except (OSError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            self.active.discard(asyncio.current_task())
+
+    async def handle_line(self, reader, writer):
+        self.active.add(asyncio.current_task())
+        try:
+            async for line in reader:
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                writer.write(line)
+                await writer.drain()
+        except OSError:
+            pass
+        finally:
+            writer.close()
+            self.active.discard(asyncio.current_task())
+
+    async def close(self):
+        # clients have hung up by now, so open handlers finish on EOF
+        self.server.close()
+        await self.server.wait_closed()
+        if self.active:
+            await asyncio.wait(list(self.active), timeout=1.0)
+
+async def serve_forever(port, mode, delay, host):
+    server = EchoServer(mode, delay)
+    port = await server.start(port, host)
+    print(f"✅ echo ({mode}) listening on {host}:{port}")
+    async with server.server:
+        await server.server.serve_forever()
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    s = sub.add_parser("serve", help="run the local echo stand-in server")
+    s.add_argument("--host", type=str, default="127.0.0.1")
+    s.add_argument("--port", type=int, default=8080)
+    s.add_argument("--mode", choices=["http", "tcp"], default="http")
+    s.add_argument("--delay-ms", type=float, default=0.0, help="artificial service time per request")
+    r = sub.add_parser("run", help="replay asks against a target")
+    r.add_argument("--target", type=str, default=None, help="http://host:port/path or tcp://host:port")
+    r.add_argument("--echo", choices=["http", "tcp"], nargs="?", const="http", default=None,
+                   help="start the echo server in-process and target it")
+    r.add_argument("--echo-delay-ms", type=float, default=0.0)
+    r.add_argument("--qps", type=float, default=100.0)
+    r.add_argument("--duration", type=float, default=None, help="seconds to send for (sets --n from --qps)")
+    r.add_argument("--n", type=int, default=1000, help="number of requests")
+    r.add_argument("--input", type=str, default=None, help="replay asks from a JSONL file instead of make_ask()")
+    r.add_argument("--seed", type=int, default=42)
+    r.add_argument("--connections", type=int, default=64, help="connection pool size")
+    r.add_argument("--timeout", type=float, default=TIMEOUT, help="per-request timeout in seconds")
+    args = ap.parse_args()
+
+    if args.cmd == "serve":
+        try:
+            asyncio.run(serve_forever(args.port, args.mode, args.delay_ms / 1000, args.host))
+        except KeyboardInterrupt:
+            pass
+        sys.exit(0)
+
+    if (args.target is None) == (args.echo is None):
+        ap.error("give exactly one of --target or --echo")
+    if args.qps <= 0:
+        ap.error("--qps must be positive")
+    n = int(args.duration * args.qps) if args.duration is not None else args.n
+    messages = jsonl_asks(args.input) if args.input else generated_asks(args.seed)
+    echo = {"mode": args.echo, "delay": args.echo_delay_ms / 1000} if args.echo else None
+    try:
+        result = asyncio.run(run(args.target, messages, args.qps, n, args.connections, args.timeout, echo))
+    except ValueError as e:
+        ap.error(str(e))
+    failed = report(*result, qps=args.qps)
+    print("✅ no errors" if not failed else f"❌ {failed} failed requests")
+    sys.exit(1 if failed else 0)
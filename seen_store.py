@@ -0,0 +1,287 @@
+# seen_store.py
+# Persistent on-disk set of 64-bit record hashes, used to keep new datasets
+# disjoint from everything delivered before (chat_pairs.jsonl included).
+# Hashes live in immutable sorted segment files (seg-*.bin, raw uint64) that
+# are memory-mapped and binary-searched; new hashes collect in memory and are
+# flushed as new segments; a background thread merges segments so lookups
+# stay at a handful of binary searches even with billions of hashes.
+# Usage:
+#   python seen_store.py load store/ chat_pairs.jsonl example_data/*.jsonl
+#   python seen_store.py stats store/
+#   python seen_store.py compact store/
+#   python chat_dataset_generator.py --out week42.jsonl --n 1000000 --seen-store store/
+import json, os, mmap, heapq, bisect, hashlib, threading, argparse
+from array import array
+
+MANIFEST = "manifest.json"
+MEMTABLE_LIMIT = 4_000_000      # hashes buffered before a flush (~32 MB on disk)
+COMPACT_AT = 8                  # background merge once this many segments exist
+WRITE_CHUNK = 1 << 20
+
+def record_hash(obj):
+    # canonical form, so the same record hashes the same whatever the file layout
+    text = json.dumps({"ask": obj.get("ask"), "ans": obj.get("ans")}, ensure_ascii=False, sort_keys=True)
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+
+def iter_records(path):
+    with open(path, "r", encoding="utf-8") as f:
+        head = f.read(1)
+        f.seek(0)
+        if head == "[":
+            yield from json.load(f)
+            return
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+# ---------------------------
+# Segments
+# ---------------------------
+
+class Segment:
+    def __init__(self, path):
+        self.path = path
+        size = os.path.getsize(path)
+        self.n = size // 8
+        if self.n:
+            with open(path, "rb") as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.keys = memoryview(self._mm).cast("Q")
+        else:
+            self._mm = None
+            self.keys = array("Q")
+
+    def __len__(self):
+        return self.n
+
+    def contains_sorted(self, hashes):
+        # hashes sorted ascending; the search window only moves forward
+        keys, lo, n = self.keys, 0, self.n
+        out = []
+        for h in hashes:
+            lo = bisect.bisect_left(keys, h, lo, n)
+            out.append(lo < n and keys[lo] == h)
+        return out
+
+def write_segment(path, sorted_hashes):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        buf = array("Q")
+        last = None
+        for h in sorted_hashes:
+            if h == last:
+                continue
+            buf.append(h)
+            last = h
+            if len(buf) >= WRITE_CHUNK:
+                buf.tofile(f)
+                buf = array("Q")
+        buf.tofile(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+# ---------------------------
+# Store
+# ---------------------------
+
+class SeenStore:
+    def __init__(self, root, memtable_limit=MEMTABLE_LIMIT, compact_at=COMPACT_AT, background=True):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self.memtable_limit = memtable_limit
+        self.compact_at = compact_at
+        self.lock = threading.Lock()
+        self.memtable = set()
+        self.next_id = 0
+        self.segments = []
+        self._load_manifest()
+        self._compacting = None
+        self.background = background
+
+    def _load_manifest(self):
+        path = os.path.join(self.root, MANIFEST)
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                m = json.load(f)
+            self.next_id = m["next_id"]
+            self.segments = [Segment(os.path.join(self.root, name)) for name in m["segments"]]
+
+    def _save_manifest(self):
+        path = os.path.join(self.root, MANIFEST)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"next_id": self.next_id, "segments": [os.path.basename(s.path) for s in self.segments]}, f)
+        os.replace(path + ".tmp", path)
+
+    def _new_segment_path(self):
+        path = os.path.join(self.root, f"seg-{self.next_id:08d}.bin")
+        self.next_id += 1
+        return path
+
+    def __len__(self):
+        # upper bound: segments may still share hashes until compaction
+        return sum(len(s) for s in self.segments) + len(self.memtable)
+
+    # ---------------------------
+    # Lookup
+    # ---------------------------
+
+    def contains_many(self, hashes):
+        hashes = list(hashes)
+        order = sorted(range(len(hashes)), key=hashes.__getitem__)
+        sorted_hashes = [hashes[i] for i in order]
+        with self.lock:
+            segments = list(self.segments)
+            mem = self.memtable
+            found = [h in mem for h in sorted_hashes]
+        for seg in segments:
+            todo = [i for i, f in enumerate(found) if not f]
+            if not todo:
+                break
+            hits = seg.contains_sorted([sorted_hashes[i] for i in todo])
+            for i, hit in zip(todo, hits):
+                if hit:
+                    found[i] = True
+        out = [False] * len(hashes)
+        for pos, i in enumerate(order):
+            out[i] = found[pos]
+        return out
+
+    def __contains__(self, h):
+        return self.contains_many([h])[0]
+
+    # ---------------------------
+    # Insert / flush
+    # ---------------------------
+
+    def add_many(self, hashes):
+        with self.lock:
+            self.memtable.update(hashes)
+            full = len(self.memtable) >= self.memtable_limit
+        if full:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            if not self.memtable:
+                return
+            hashes = sorted(self.memtable)
+            path = self._new_segment_path()
+        write_segment(path, hashes)
+        with self.lock:
+            self.segments.append(Segment(path))
+            self.memtable.difference_update(hashes)
+            self._save_manifest()
+            many = len(self.segments) >= self.compact_at
+        if many:
+            if self.background:
+                self.compact_async()
+            else:
+                self.compact()
+
+    def load_files(self, paths):
+        n = 0
+        batch = []
+        for path in paths:
+            for obj in iter_records(path):
+                batch.append(record_hash(obj))
+                if len(batch) >= 100_000:
+                    self.add_many(batch)
+                    n += len(batch)
+                    batch = []
+        self.add_many(batch)
+        n += len(batch)
+        return n
+
+    # ---------------------------
+    # Compaction
+    # ---------------------------
+
+    def compact(self):
+        # merge every current segment into one; new flushes may land meanwhile
+        with self.lock:
+            victims = list(self.segments)
+            if len(victims) < 2:
+                return
+            path = self._new_segment_path()
+        write_segment(path, heapq.merge(*[iter(s.keys) for s in victims]))
+        with self.lock:
+            merged = Segment(path)
+            names = {s.path for s in victims}
+            self.segments = [merged] + [s for s in self.segments if s.path not in names]
+            self._save_manifest()
+        for s in victims:
+            try:
+                os.remove(s.path)  # open maps stay valid until released
+            except OSError:
+                pass
+
+    def compact_async(self):
+        if self._compacting is not None and self._compacting.is_alive():
+            return
+        self._compacting = threading.Thread(target=self.compact, name="seen-compact", daemon=True)
+        self._compacting.start()
+
+    def close(self):
+        self.flush()
+        if self._compacting is not None:
+            self._compacting.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# ---------------------------
+# Generation that skips seen records
+# ---------------------------
+
+def generate_fresh(path, n, store, make_pair, batch=10_000, max_dry_batches=20):
+    from block_writer import BlockWriter
+    written = 0
+    dry = 0
+    with BlockWriter(path) as out:
+        while written < n:
+            objs = [make_pair() for _ in range(min(batch, n - written))]
+            hashes = [record_hash(o) for o in objs]
+            seen = store.contains_many(hashes)
+            fresh = []
+            run = set()
+            for obj, h, s in zip(objs, hashes, seen):
+                if s or h in run:
+                    continue
+                run.add(h)
+                out.write(json.dumps(obj, ensure_ascii=False) + "\n")
+                fresh.append(h)
+            store.add_many(fresh)
+            written += len(fresh)
+            dry = 0 if fresh else dry + 1
+            if dry >= max_dry_batches:
+                raise RuntimeError(f"only {written}/{n} unseen records could be generated")
+    return written
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    l = sub.add_parser("load", help="add the records of existing JSONL/JSON files to the store")
+    l.add_argument("store")
+    l.add_argument("inputs", nargs="+")
+    s = sub.add_parser("stats", help="print segment counts")
+    s.add_argument("store")
+    c = sub.add_parser("compact", help="merge all segments into one")
+    c.add_argument("store")
+    args = ap.parse_args()
+
+    store = SeenStore(args.store, background=False)
+    if args.cmd == "load":
+        n = store.load_files(args.inputs)
+        store.close()
+        print(f"✅ loaded {n} record hashes into {args.store}")
+    elif args.cmd == "compact":
+        store.compact()
+        print(f"✅ {args.store}: {len(store.segments)} segment(s), {len(store)} hashes")
+    else:
+        print(f"{args.store}: {len(store.segments)} segment(s), {len(store)} hashes")
+        for seg in store.segments:
+            print(f"  {os.path.basename(seg.path)}: {len(seg)}")
@@ -0,0 +1,103 @@
+# spelling_rules.py
+# Single-pass Banglish spelling variation.
+# All substitution rules (character rules like bh -> b/v and word rules like
+# valo -> bhalo) are compiled into one trie, rendered as a single regex, and
+# applied in one scan with an independent coin flip per occurrence.
+# Usage:
+#   python spelling_rules.py --rules spelling_rules.json "valo achi, bhai thik ache"
+import json, os, random, re, argparse
+
+DEFAULT_RULES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "spelling_rules.json")
+
+# ---------------------------
+# Trie -> regex
+# ---------------------------
+
+def build_trie(words):
+    root = {}
+    for w in words:
+        node = root
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = True
+    return root
+
+def trie_pattern(node):
+    # greedy optional groups make the regex prefer the longest match,
+    # the same way a longest-match automaton would
+    alts = [re.escape(ch) + trie_pattern(child) for ch, child in sorted(node.items()) if ch]
+    if not alts:
+        return ""
+    body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+    if "" in node:
+        body = "(?:" + body + ")?"
+    return body
+
+# ---------------------------
+# Rule engine
+# ---------------------------
+
+class SpellingRules:
+    def __init__(self, rules, skip=None, rng=None):
+        self.rng = rng or random
+        self.skip = re.compile(skip) if skip else None
+        self.rules = {}
+        word_keys, char_keys = [], []
+        for r in rules:
+            key = r["match"]
+            if not key or key in self.rules:
+                raise ValueError(f"empty or duplicate rule: {key!r}")
+            self.rules[key] = (float(r.get("p", 1.0)), tuple(r["replace"]))
+            (word_keys if r.get("word") else char_keys).append(key)
+
+        parts = []
+        if word_keys:
+            parts.append(r"\b" + trie_pattern(build_trie(word_keys)) + r"\b")
+        if char_keys:
+            parts.append(trie_pattern(build_trie(char_keys)))
+        # word rules come first so a whole word wins over a substring rule
+        # starting at the same position
+        self.pattern = re.compile("|".join(parts)) if parts else None
+
+    def _sub(self, m):
+        key = m.group()
+        p, choices = self.rules[key]
+        rand = self.rng.random
+        if p < 1.0 and rand() >= p:
+            return key
+        return choices[int(rand() * len(choices))]
+
+    def apply(self, s):
+        if self.pattern is None or (self.skip is not None and self.skip.search(s)):
+            return s
+        return self.pattern.sub(self._sub, s)
+
+    def apply_many(self, strings):
+        sub = self.pattern.sub if self.pattern is not None else None
+        repl = self._sub
+        skip = self.skip.search if self.skip is not None else None
+        out = []
+        for s in strings:
+            if sub is not None and (skip is None or not skip(s)):
+                s = sub(repl, s)
+            out.append(s)
+        return out
+
+def load_rules(path=DEFAULT_RULES, rng=None):
+    with open(path, "r", encoding="utf-8") as f:
+        cfg = json.load(f)
+    return SpellingRules(cfg.get("rules", []), skip=cfg.get("skip"), rng=rng)
+
+# ---------------------------
+# CLI
+# ---------------------------
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("text", nargs="+", help="strings to vary")
+    ap.add_argument("--rules", type=str, default=DEFAULT_RULES, help="rules config (JSON)")
+    ap.add_argument("--seed", type=int, default=None)
+    args = ap.parse_args()
+    engine = load_rules(args.rules, rng=random.Random(args.seed))
+    for t in args.text:
+        print(engine.apply(t))
@@ -0,0 +1,179 @@
+# sqlite_export.py
+# Load generated chat pairs into SQLite for interactive querying by annotators.
+# Tables: asks(id, text, category), answers(id, text) and
+# pairs(record, pos, ask_id, answer_id) with one row per answer of a record;
+# asks_fts / answers_fts are FTS5 indexes over the text.
+# Rows are streamed with executemany in large transactions and all indexes
+# (including FTS) are built once at the end.
+# Categories: --generate records carry the category they were drawn from;
+# for JSONL inputs the ask text is looked up among every styled form of the
+# banks. An ask text that belongs to more than one category (কি খবর is both
+# greet and wellbeing) gets the category "ambiguous" rather than a guess.
+# Usage:
+#   python sqlite_export.py load chat.db chat_pairs.jsonl [more.jsonl ...]
+#   python sqlite_export.py load chat.db --generate 1000000 --seed 42
+#   python sqlite_export.py query chat.db "ফুচকা" --category food
+#   python sqlite_export.py query chat.db "valo" --answers
+import json, os, sys, sqlite3, argparse
+
+BATCH = 50_000
+AMBIGUOUS = "ambiguous"
+
+SCHEMA = """
+CREATE TABLE asks (id INTEGER PRIMARY KEY, text TEXT NOT NULL, category TEXT);
+CREATE TABLE answers (id INTEGER PRIMARY KEY, text TEXT NOT NULL);
+CREATE TABLE pairs (record INTEGER NOT NULL, pos INTEGER NOT NULL, ask_id INTEGER NOT NULL, answer_id INTEGER NOT NULL);
+"""
+
+INDEXES = """
+CREATE UNIQUE INDEX asks_text ON asks(text);
+CREATE UNIQUE INDEX answers_text ON answers(text);
+CREATE INDEX asks_category ON asks(category);
+CREATE INDEX pairs_record ON pairs(record, pos);
+CREATE INDEX pairs_ask ON pairs(ask_id);
+CREATE INDEX pairs_answer ON pairs(answer_id);
+CREATE VIRTUAL TABLE asks_fts USING fts5(text, content='asks', content_rowid='id');
+CREATE VIRTUAL TABLE answers_fts USING fts5(text, content='answers', content_rowid='id');
+INSERT INTO asks_fts(asks_fts) VALUES ('rebuild');
+INSERT INTO answers_fts(answers_fts) VALUES ('rebuild');
+"""
+
+# ---------------------------
+# Sources
+# ---------------------------
+
+def category_lookup():
+    # every styled form make_ask() can produce, mapped back to its category
+    from style_tables import compile_styles
+    lookup = {}
+    for cat, table in compile_styles().asks:
+        for text in table.values:
+            if lookup.setdefault(text, cat) != cat:
+                lookup[text] = AMBIGUOUS
+    return lookup
+
+def jsonl_records(paths):
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+def generated_records(n, seed):
+    import random
+    import chat_dataset_generator as gen
+    random.seed(seed)
+    for _ in range(n):
+        cat, obj = gen.make_labeled_pair()
+        yield dict(obj, category=cat)
+
+# ---------------------------
+# Load
+# ---------------------------
+
+def load(db_path, records, batch=BATCH):
+    if os.path.exists(db_path):
+        raise FileExistsError(f"{db_path} already exists")
+    categories = category_lookup()
+    con = sqlite3.connect(db_path, isolation_level=None)
+    con.executescript("PRAGMA journal_mode=OFF; PRAGMA synchronous=OFF; PRAGMA temp_store=MEMORY;"
+                      "PRAGMA cache_size=-262144;")
+    con.executescript(SCHEMA)
+
+    ask_ids, ans_ids = {}, {}
+    ask_cats, ambiguous = {}, set()
+    new_asks, new_answers, pairs = [], [], []
+    n = 0
+
+    def flush():
+        con.execute("BEGIN")
+        con.executemany("INSERT INTO asks VALUES (?, ?, ?)", new_asks)
+        con.executemany("INSERT INTO answers VALUES (?, ?)", new_answers)
+        con.executemany("INSERT INTO pairs VALUES (?, ?, ?, ?)", pairs)
+        con.execute("COMMIT")
+        new_asks.clear()
+        new_answers.clear()
+        pairs.clear()
+
+    for obj in records:
+        ask = obj["ask"]
+        cat = obj.get("category") or categories.get(ask)
+        a_id = ask_ids.get(ask)
+        if a_id is None:
+            a_id = ask_ids[ask] = len(ask_ids) + 1
+            ask_cats[a_id] = cat
+            new_asks.append((a_id, ask, cat))
+        elif cat != ask_cats[a_id]:
+            ambiguous.add(a_id)
+        for pos, text in enumerate(obj["ans"]):
+            t_id = ans_ids.get(text)
+            if t_id is None:
+                t_id = ans_ids[text] = len(ans_ids) + 1
+                new_answers.append((t_id, text))
+            pairs.append((n, pos, a_id, t_id))
+        n += 1
+        if len(pairs) >= batch:
+            flush()
+    flush()
+    con.executemany(f"UPDATE asks SET category = '{AMBIGUOUS}' WHERE id = ?", ((i,) for i in sorted(ambiguous)))
+    con.executescript(INDEXES)
+    con.execute("ANALYZE")
+    con.close()
+    return n, len(ask_ids), len(ans_ids)
+
+# ---------------------------
+# Query
+# ---------------------------
+
+def query(db_path, text, category=None, answers=False, limit=20):
+    con = sqlite3.connect(db_path)
+    if answers:
+        sql = """
+            SELECT answers.text, COUNT(*) AS n FROM answers_fts
+            JOIN answers ON answers.id = answers_fts.rowid
+            JOIN pairs ON pairs.answer_id = answers.id
+            JOIN asks ON asks.id = pairs.ask_id
+            WHERE answers_fts MATCH ? AND (? IS NULL OR asks.category = ?)
+            GROUP BY answers.id ORDER BY n DESC LIMIT ?"""
+    else:
+        sql = """
+            SELECT asks.text, (SELECT COUNT(DISTINCT record) FROM pairs WHERE pairs.ask_id = asks.id) AS n
+            FROM asks_fts JOIN asks ON asks.id = asks_fts.rowid
+            WHERE asks_fts MATCH ? AND (? IS NULL OR asks.category = ?)
+            ORDER BY n DESC LIMIT ?"""
+    try:
+        rows = con.execute(sql, (text, category, category, limit)).fetchall()
+    finally:
+        con.close()
+    return rows
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    l = sub.add_parser("load", help="create a database from JSONL files or from the generator")
+    l.add_argument("db")
+    l.add_argument("inputs", nargs="*")
+    l.add_argument("--generate", type=int, default=None, metavar="N", help="stream N records from make_pair()")
+    l.add_argument("--seed", type=int, default=42)
+    q = sub.add_parser("query", help="full-text search over asks (or answers)")
+    q.add_argument("db")
+    q.add_argument("text", help="FTS5 query, e.g. 'ফুচকা' or 'valo*'")
+    q.add_argument("--category", type=str, default=None)
+    q.add_argument("--answers", action="store_true", help="search answer text instead of asks")
+    q.add_argument("--limit", type=int, default=20)
+    args = ap.parse_args()
+
+    if args.cmd == "load":
+        if args.generate is None and not args.inputs:
+            ap.error("give JSONL inputs or --generate N")
+        records = generated_records(args.generate, args.seed) if args.generate is not None else jsonl_records(args.inputs)
+        n, asks, answers = load(args.db, records)
+        print(f"✅ {args.db}: {n} records, {asks} distinct asks, {answers} distinct answers")
+    else:
+        try:
+            rows = query(args.db, args.text, category=args.category, answers=args.answers, limit=args.limit)
+        except sqlite3.OperationalError as e:
+            print(f"query failed: {e}", file=sys.stderr)
+            sys.exit(2)
+        for text, n in rows:
+            print(f"{n:>8}  {text}")
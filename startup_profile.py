@@ -0,0 +1,97 @@
+# startup_profile.py
+# Import-time / spawn-to-first-record profile of chat_dataset_generator, for
+# setups that start many short-lived generator processes.
+# Reports:
+#   spawn        wall time of fresh interpreters (median / p90 over --runs):
+#                bare python, import, and import + first JSON record, each
+#                with the frozen bank (banks_frozen.py) and without it
+#   imports      the slowest modules of one import, from python -X importtime
+#   bank         in-process cost of build_ask_bank() vs loading the frozen bank
+# Usage:
+#   python startup_profile.py
+#   python startup_profile.py --runs 50 --top 15
+import os, sys, time, argparse, subprocess, importlib.util
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SNIPPETS = [
+    ("python", "pass"),
+    ("import", "import chat_dataset_generator"),
+    ("first record", "import json, chat_dataset_generator as g; json.dumps(g.make_pair(), ensure_ascii=False)"),
+]
+BANK_SNIPPET = """
+import time, chat_dataset_generator as g
+def best(fn, k=20):
+    out = []
+    for _ in range(k):
+        t = time.perf_counter(); fn(); out.append(time.perf_counter() - t)
+    return min(out) * 1e3
+print(best(g.build_ask_bank), best(g.bank_source_hash), best(g.frozen_ask_bank))
+"""
+
+def run(code, frozen=True, flags=()):
+    env = dict(os.environ)
+    env.pop("CHATDATA_NO_FROZEN", None)
+    if not frozen:
+        env["CHATDATA_NO_FROZEN"] = "1"
+    return subprocess.run([sys.executable, *flags, "-c", code], cwd=HERE, env=env,
+                          capture_output=True, text=True, check=True)
+
+def spawn_times(code, runs, frozen=True):
+    times = []
+    for _ in range(runs):
+        t = time.perf_counter()
+        run(code, frozen)
+        times.append((time.perf_counter() - t) * 1e3)
+    times.sort()
+    return times[len(times) // 2], times[min(len(times) - 1, int(len(times) * 0.9))]
+
+def import_times(top):
+    # (self us, cumulative us, module) from -X importtime, slowest first
+    # (interpreter startup imports such as site are left out)
+    def parse(code):
+        rows = []
+        for line in run(code, flags=("-X", "importtime")).stderr.splitlines():
+            if not line.startswith("import time:") or "self [us]" in line:
+                continue
+            self_us, cum_us, name = line[len("import time:"):].split("|")
+            rows.append((int(self_us), int(cum_us), name.strip()))
+        return rows
+    startup = {name for _, _, name in parse("pass")}
+    rows = [r for r in parse("import chat_dataset_generator") if r[2] not in startup]
+    rows.sort(key=lambda r: -r[0])
+    return rows[:top], sum(r[0] for r in rows)
+
+def bank_times():
+    build, digest, frozen = (float(x) for x in run(BANK_SNIPPET).stdout.split())
+    return build, digest, frozen
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=20, help="fresh processes per measurement")
+    ap.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    args = ap.parse_args()
+
+    frozen_ok = run("import chat_dataset_generator as g; print(g.frozen_ask_bank() is not None)").stdout.strip() == "True"
+    print(f"spawn (ms, median / p90 of {args.runs} processes):")
+    print(f"  {'':>14} {'frozen bank':>16} {'built bank':>16}")
+    for label, code in SNIPPETS:
+        a = spawn_times(code, args.runs, frozen=True)
+        b = spawn_times(code, args.runs, frozen=False)
+        print(f"  {label:>14} {a[0]:>7.1f} / {a[1]:>6.1f} {b[0]:>7.1f} / {b[1]:>6.1f}")
+
+    rows, total = import_times(args.top)
+    print(f"imports (self time, total {total / 1e3:.1f} ms):")
+    for self_us, cum_us, name in rows:
+        print(f"  {self_us / 1e3:>7.2f} ms  (cumulative {cum_us / 1e3:>6.2f})  {name}")
+
+    build, digest, load = bank_times()
+    print("bank (in-process, best of 20):")
+    print(f"  build_ask_bank()   {build:.3f} ms")
+    print(f"  frozen load        {load:.3f} ms (of which source hash {digest:.3f} ms)")
+
+    if not frozen_ok:
+        print("❌ banks_frozen.py is missing or stale; run python freeze_banks.py")
+    pyc = importlib.util.cache_from_source(os.path.join(HERE, "chat_dataset_generator.py"))
+    if sys.flags.dont_write_bytecode and not os.path.exists(pyc):
+        print("❌ PYTHONDONTWRITEBYTECODE is set and there is no .pyc: every process recompiles"
+              " the generator source; run python freeze_banks.py --compile once")
@@ -0,0 +1,154 @@
+# style_profile.py
+# Exact style rates for the generators (--style).
+# By default every style decision is an independent coin flip (EMOJI_P,
+# PUNC_P, ... in chat_dataset_generator.py, the 0.25 / 0.2 in q1.py), so over
+# a run the achieved mix drifts from the configured rate by ~1/sqrt(n). With a
+# profile each knob is a block quota instead: in every block of BLOCK
+# decisions exactly round(rate * BLOCK) are hits, at shuffled positions, and
+# the rounding remainder carries over, so after n decisions the hit count is
+# within one block's sampling spread of rate * n and exact at block ends.
+# Knobs (fractions 0..1; knobs left out keep the generator's own rate, but
+# as a quota):
+#   script     asks drawn from Bangla-script bank entries (rest: Banglish)
+#   emoji      asks that get an emoji
+#   punc       asks not ending in ?, ! or । that get punctuation
+#   lower      strings lowercased, counted only over strings that lowercasing
+#              changes
+#   ans_emoji  answers that get an emoji
+#   ans_punc   answers not ending in ? or ! that get punctuation
+#   filler     answers with a leading filler word (q1.py)
+# A profile is a JSON object of knob -> rate, or inline "knob=rate,...".
+# The quota positions and counts go into the --append sidecar (state() /
+# restore()), so an appended run continues the same blocks.
+# Usage:
+#   python chat_dataset_generator.py --n 1000000 --style script=0.5,emoji=0.3,lower=0.2
+#   python chat_dataset_generator.py --n 1000000 --style profile.json
+#   python q1.py --n 1000000 --style filler=0.4,ans_emoji=0.1
+import os, re, json, random
+
+BLOCK = 1000
+KNOBS = ["script", "emoji", "punc", "lower", "ans_emoji", "ans_punc", "filler"]
+# a real Bangla-block match (chat_dataset_generator.BANGLA_RE is kept broken
+# on purpose, see there)
+BANGLA_SCRIPT_RE = re.compile("[\u0980-\u09FF]")
+
+# ---------------------------
+# Quota sampler
+# ---------------------------
+
+class Quota:
+    def __init__(self, rate, block=BLOCK):
+        self.rate = rate
+        self.block = block
+        self.carry = 0.0
+        self.slots = []
+        self.hits = 0
+        self.n = 0
+
+    def next(self):
+        if not self.slots:
+            want = self.rate * self.block + self.carry
+            k = min(self.block, int(want + 1e-9))
+            self.carry = want - k
+            self.slots = [True] * k + [False] * (self.block - k)
+            random.shuffle(self.slots)
+        hit = self.slots.pop()
+        self.n += 1
+        self.hits += hit
+        return hit
+
+    @property
+    def achieved(self):
+        return self.hits / self.n if self.n else None
+
+    def state(self):
+        return {"carry": self.carry, "slots": self.slots, "hits": self.hits, "n": self.n}
+
+    def restore(self, state):
+        self.carry = state["carry"]
+        self.slots = list(state["slots"])
+        self.hits = state["hits"]
+        self.n = state["n"]
+
+# ---------------------------
+# Profile
+# ---------------------------
+
+def parse_rates(text):
+    # JSON file path, or "knob=rate,knob=rate"
+    if os.path.exists(text):
+        with open(text, "r", encoding="utf-8") as f:
+            rates = json.load(f)
+        if not isinstance(rates, dict):
+            raise ValueError(f"{text}: expected a JSON object of knob -> rate")
+    else:
+        rates = {}
+        for item in text.split(","):
+            if not item.strip():
+                continue
+            if "=" not in item:
+                raise ValueError(f"expected knob=rate, got {item!r}")
+            k, v = item.split("=", 1)
+            try:
+                rates[k.strip()] = float(v)
+            except ValueError:
+                raise ValueError(f"{k.strip()}: rate must be a number, got {v!r}")
+    for k, v in rates.items():
+        if k not in KNOBS:
+            raise ValueError(f"unknown style knob {k!r} (known: {', '.join(KNOBS)})")
+        if not isinstance(v, (int, float)) or not 0.0 <= v <= 1.0:
+            raise ValueError(f"{k}: rate must be between 0 and 1, got {v!r}")
+    return {k: float(v) for k, v in rates.items()}
+
+class StyleProfile:
+    def __init__(self, rates, defaults, block=BLOCK):
+        # rates: the requested knobs; defaults: the generator's own rates for
+        # the knobs it has (None: no default, e.g. script keeps the bank mix)
+        self.requested = dict(rates)
+        self.targets = {k: rates.get(k, v) for k, v in defaults.items()}
+        self.quotas = {k: Quota(r, block) for k, r in self.targets.items() if r is not None}
+        self.unused = sorted(set(rates) - set(defaults))
+        self._asks = None
+
+    def hit(self, name):
+        return self.quotas[name].next()
+
+    def pick_ask(self, bank):
+        # ask id: the script by quota, then uniform within that script
+        quota = self.quotas.get("script")
+        if quota is None:
+            return random.choice(range(len(bank)))
+        if self._asks is None or self._asks[0] != len(bank):
+            ids = {True: [], False: []}
+            for i, (_, text) in enumerate(bank):
+                ids[bool(BANGLA_SCRIPT_RE.search(text))].append(i)
+            if not ids[True] or not ids[False]:
+                raise ValueError("--style script needs both Bangla-script and Banglish asks in ASK_BANK")
+            self._asks = (len(bank), ids)
+        return random.choice(self._asks[1][quota.next()])
+
+    def state(self):
+        return {k: q.state() for k, q in sorted(self.quotas.items())}
+
+    def restore(self, state):
+        if sorted(state) != sorted(self.quotas):
+            raise ValueError(f"saved style knobs {sorted(state)} do not match {sorted(self.quotas)}")
+        for k, q in self.quotas.items():
+            q.restore(state[k])
+
+    def rates(self):
+        # the effective targets, for cache keys and manifests
+        return {k: v for k, v in sorted(self.targets.items()) if v is not None}
+
+    def report(self):
+        lines = [f"  {'knob':>10} {'target':>8} {'achieved':>9} {'decisions':>11}"]
+        for k in KNOBS:
+            q = self.quotas.get(k)
+            if q is None:
+                continue
+            got = "-" if q.achieved is None else f"{q.achieved:.4f}"
+            mark = "" if k in self.requested else "  (default)"
+            lines.append(f"  {k:>10} {q.rate:>8.4f} {got:>9} {q.n:>11}{mark}")
+        for k in self.unused:
+            lines.append(f"  {k:>10} {self.requested[k]:>8.4f}         -           0  (not used by this generator)")
+        return lines
@@ -0,0 +1,220 @@
+# style_tables.py
+# Precompiled stylization for chat_dataset_generator.
+# make_ask() and the per-answer styling in make_pair() only depend on the input
+# string plus independent coin flips (maybe_punc, maybe_emoji,
+# bangla_or_banglish), so each bank string has a small, finite distribution of
+# styled outputs. compile_styles() enumerates those distributions once with
+# exact probabilities and stores them as alias tables; styling a string is then
+# a single O(1) draw, with no regex, str.replace or .lower() per record.
+# Usage:
+#   python chat_dataset_generator.py --out chat_pairs.jsonl --n 1000000 --compiled
+#   python style_tables.py   # print table sizes
+import random
+
+import chat_dataset_generator as gen
+
+# ---------------------------
+# Alias tables (Vose)
+# ---------------------------
+
+class AliasTable:
+    __slots__ = ("values", "prob", "alias", "n")
+
+    def __init__(self, dist):
+        # dist: {value: probability}; probabilities are renormalized
+        items = [(v, p) for v, p in dist.items() if p > 0]
+        if not items:
+            raise ValueError("empty distribution")
+        total = sum(p for _, p in items)
+        n = len(items)
+        self.values = [v for v, _ in items]
+        self.n = n
+        scaled = [p * n / total for _, p in items]
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+        small = [i for i, q in enumerate(scaled) if q < 1.0]
+        large = [i for i, q in enumerate(scaled) if q >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # leftovers are 1.0 up to float error
+
+    def sample(self, rng=random):
+        u = rng.random() * self.n
+        i = int(u)
+        if u - i < self.prob[i]:
+            return self.values[i]
+        return self.values[self.alias[i]]
+
+    def __len__(self):
+        return self.n
+
+# ---------------------------
+# Exact output distributions of the stylizers
+# ---------------------------
+
+def _spread(dist, step):
+    # apply step(s) -> [(s', p), ...] to every entry, merging equal outputs
+    out = {}
+    for s, p in dist.items():
+        for t, q in step(s):
+            out[t] = out.get(t, 0.0) + p * q
+    return out
+
+def _punc(s):
+    # maybe_punc
+    if s.endswith(tuple("?!")):
+        return [(s, 1.0)]
+    each = gen.PUNC_P / len(gen.PUNCS)
+    return [(s, 1.0 - gen.PUNC_P)] + [(s + p, each) for p in gen.PUNCS]
+
+def _emoji(s):
+    # maybe_emoji
+    each = gen.EMOJI_P / len(gen.EMOJIS)
+    return [(s, 1.0 - gen.EMOJI_P)] + [(s + " " + e, each) for e in gen.EMOJIS]
+
+def banglish_dist(s):
+    # bangla_or_banglish
+    if gen.BANGLA_RE.search(s):
+        return {s: 1.0}
+    d = _spread({s: 1.0}, lambda x: [(x, 1.0 - gen.LOWER_P), (x.lower(), gen.LOWER_P)])
+    d = _spread(d, lambda x: [(x, 1.0 - gen.BH_P), (x.replace("bh", "b"), gen.BH_P / 2),
+                              (x.replace("bh", "v"), gen.BH_P / 2)])
+    d = _spread(d, lambda x: [(x, 1.0 - gen.TH_P), (x.replace("th", "t"), gen.TH_P)])
+    d = _spread(d, lambda x: [(x, 1.0 - gen.EE_P), (x.replace("ee", "i"), gen.EE_P)])
+    return d
+
+def ask_dist(text):
+    # make_ask
+    d = {text: 1.0}
+    if not text.endswith(tuple("?!।")):
+        d = _spread(d, _punc)
+    d = _spread(d, _emoji)
+    return _spread(d, lambda x: banglish_dist(x).items())
+
+def answer_dist(text):
+    # per-answer styling inside make_pair
+    d = banglish_dist(text)
+    d = _spread(d, lambda x: [(x, 1.0 - gen.ANS_PUNC_P)] + [(t, gen.ANS_PUNC_P * q) for t, q in _punc(x)])
+    d = _spread(d, lambda x: [(x, 1.0 - gen.ANS_EMOJI_P)] + [(t, gen.ANS_EMOJI_P * q) for t, q in _emoji(x)])
+    return d
+
+# ---------------------------
+# Compiled generator
+# ---------------------------
+
+class CompiledStyles:
+    def __init__(self, ask_bank=None, ans=None):
+        if gen.SPELLING is not None:
+            raise ValueError("compiled styles do not support --rules")
+        self.ask_bank = list(ask_bank if ask_bank is not None else gen.ASK_BANK)
+        self.ans = ans if ans is not None else gen.ANS
+        by_text = {}
+        self.asks = []
+        for cat, text in self.ask_bank:
+            table = by_text.get(text)
+            if table is None:
+                table = by_text[text] = AliasTable(ask_dist(text))
+            self.asks.append((cat, table))
+        self.answers = {}
+        for pools in self.ans.values():
+            for pool in pools:
+                for a in pool:
+                    if a not in self.answers:
+                        self.answers[a] = AliasTable(answer_dist(a))
+        self.answers.setdefault("ok", AliasTable(answer_dist("ok")))
+
+    def make_ask(self, i):
+        return self.asks[i][1].sample()
+
+    def make_pair(self):
+        return self.make_labeled_pair()[1]
+
+    def make_labeled_pair(self):
+        rand = random.random
+        cat, table = self.asks[int(rand() * len(self.asks))]
+        ask = table.sample()
+        answers = self.answers
+        out = []
+        seen = set()
+        for a in gen.sample_answers(cat, ans=self.ans):
+            a = answers[a].sample()
+            if a not in seen:
+                out.append(a)
+                seen.add(a)
+        while len(out) < 3:
+            out.append("ok")
+        return cat, {"ask": ask, "ans": out}
+
+    def stats(self):
+        ask_tables = {id(t): len(t) for _, t in self.asks}
+        return {
+            "asks": len(self.asks),
+            "ask_outcomes": sum(ask_tables.values()),
+            "answers": len(self.answers),
+            "answer_outcomes": sum(len(t) for t in self.answers.values()),
+        }
+
+_compiled = None
+
+def compile_styles():
+    global _compiled
+    if _compiled is None:
+        _compiled = CompiledStyles()
+    return _compiled
+
+# ---------------------------
+# Agreement check
+# ---------------------------
+
+def style_shares(make_labeled_pair, n):
+    # shares of Bangla-script asks/answers and answers per record
+    from style_profile import BANGLA_SCRIPT_RE
+    asks = answers = n_ans = 0
+    for _ in range(n):
+        _, obj = make_labeled_pair()
+        asks += bool(BANGLA_SCRIPT_RE.search(obj["ask"]))
+        answers += sum(1 for a in obj["ans"] if BANGLA_SCRIPT_RE.search(a))
+        n_ans += len(obj["ans"])
+    return {"bangla_asks": asks / n, "bangla_answers": answers / n_ans, "answers_per_record": n_ans / n}
+
+def check_agreement(n=20000, tolerance=0.02):
+    # compiled and coin-flip generation over the same (possibly patched) banks;
+    # returns [(name, plain, compiled)] for the shares that differ
+    styles = CompiledStyles(gen.ASK_BANK, gen.ANS)
+    random.seed(gen.DEFAULT_SEED)
+    plain = style_shares(gen.make_labeled_pair, n)
+    compiled = style_shares(styles.make_labeled_pair, n)
+    bad = []
+    for k in plain:
+        scale = max(1.0, abs(plain[k]))
+        if abs(plain[k] - compiled[k]) > tolerance * scale:
+            bad.append((k, plain[k], compiled[k]))
+    return plain, compiled, bad
+
+if __name__ == "__main__":
+    import sys, time, argparse
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--check", action="store_true", help="check that compiled and plain generation agree")
+    ap.add_argument("--translit", action="store_true", help="run the check on the transliteration-paired banks")
+    ap.add_argument("--n", type=int, default=20000, help="records per mode for --check")
+    args = ap.parse_args()
+    if args.translit:
+        from transliterate import paired_ask_bank, paired_answers
+        gen.ASK_BANK[:] = paired_ask_bank(gen.ASK_BANK)
+        gen.ANS.update(paired_answers(gen.ANS))
+    if args.check:
+        plain, compiled, bad = check_agreement(args.n)
+        for k in plain:
+            print(f"  {k:>18}  plain {plain[k]:.4f}  compiled {compiled[k]:.4f}")
+        if bad:
+            print(f"❌ compiled styles disagree on {', '.join(k for k, _, _ in bad)}")
+            sys.exit(1)
+        print("✅ compiled and plain generation agree")
+        sys.exit(0)
+    t = time.perf_counter()
+    styles = compile_styles()
+    print(f"compiled in {time.perf_counter() - t:.2f}s: {styles.stats()}")
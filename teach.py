@@ -678,7 +678,7 @@ def generate(path, n=10000, as_array=False):
         with open(path, "w", encoding="utf-8") as f:
             for i in range(n):
                 obj = make_pair()
-                f.write(json.dumps(obj, ensure_ascii=False) + "\\n")
+                f.write(json.dumps(obj, ensure_ascii=False) + "\n")
                 count += 1
     return count
 
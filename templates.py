@@ -0,0 +1,94 @@
+# templates.py
+# Slot-template grammar for ask/answer banks.
+# A template like "{you} kothay?" or "valo {variant:achi}" is parsed once into
+# literal parts and slot choices. Small templates are fully expanded at compile
+# time, so rendering one per record is a single random.choice.
+#
+#   g = Grammar({"you": ["tui", "tumi", "apni"]}, variants={"achi": ["achi", "asi"]})
+#   t = g.compile("{you} valo {variant:achi}?")
+#   t.render()  # -> "tumi valo asi?"
+import random, re, itertools
+
+SLOT_RE = re.compile(r"\{([a-z_]+)(?::([^{}]+))?\}")
+
+# above this many combinations a template is rendered slot by slot instead
+MAX_EXPANSIONS = 256
+
+class Template:
+    __slots__ = ("source", "parts", "expansions")
+
+    def __init__(self, source, parts):
+        self.source = source
+        self.parts = parts
+        self.expansions = None
+        size = 1
+        for p in parts:
+            if p.__class__ is not str:
+                size *= len(p)
+        if size <= MAX_EXPANSIONS:
+            self.expansions = tuple(dict.fromkeys(
+                "".join(combo) for combo in itertools.product(*[(p,) if p.__class__ is str else p for p in parts])
+            ))
+
+    def render(self, rng=random):
+        e = self.expansions
+        if e is not None:
+            return e[0] if len(e) == 1 else rng.choice(e)
+        return "".join(p if p.__class__ is str else rng.choice(p) for p in self.parts)
+
+    def expand(self):
+        if self.expansions is not None:
+            return list(self.expansions)
+        return ["".join(c) for c in itertools.product(*[(p,) if p.__class__ is str else p for p in self.parts])]
+
+    def __repr__(self):
+        return f"Template({self.source!r})"
+
+class Grammar:
+    def __init__(self, slots=None, variants=None):
+        self.slots = {k: tuple(v) for k, v in (slots or {}).items()}
+        self.variants = {k: tuple(v) for k, v in (variants or {}).items()}
+        self._cache = {}
+
+    def slot_choices(self, name, arg):
+        if name == "variant":
+            # words without a variant entry render as themselves
+            return self.variants.get(arg, (arg,))
+        if arg is not None:
+            raise ValueError(f"slot {{{name}}} takes no argument")
+        if name not in self.slots:
+            raise ValueError(f"unknown slot {{{name}}}")
+        return self.slots[name]
+
+    def compile(self, text):
+        t = self._cache.get(text)
+        if t is not None:
+            return t
+        parts = []
+        pos = 0
+        for m in SLOT_RE.finditer(text):
+            if m.start() > pos:
+                parts.append(text[pos:m.start()])
+            choices = self.slot_choices(m.group(1), m.group(2))
+            if len(choices) == 1:
+                parts.append(choices[0])
+            else:
+                parts.append(choices)
+            pos = m.end()
+        if pos < len(text):
+            parts.append(text[pos:])
+        # fold neighbouring literals together
+        merged = []
+        for p in parts:
+            if p.__class__ is str and merged and merged[-1].__class__ is str:
+                merged[-1] += p
+            else:
+                merged.append(p)
+        t = self._cache[text] = Template(text, tuple(merged))
+        return t
+
+    def render(self, text, rng=random):
+        return self.compile(text).render(rng)
+
+    def expand(self, text):
+        return self.compile(text).expand()
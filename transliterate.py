@@ -0,0 +1,219 @@
+# transliterate.py
+# Table-driven Bangla <-> Banglish transliteration.
+# Each direction is a grapheme table (consonants, conjunct/phala forms, vowel
+# signs, independent vowels, marks) compiled once into a longest-match trie
+# regex. Words are converted token by token with the inherent-vowel rules
+# below and cached, so corpus-scale conversion mostly costs one dict lookup
+# per word.
+# Banglish -> Bangla also has a word exception table, learned from Bangla text
+# (the generator's banks): a Banglish word that some Bangla bank word reads as
+# maps back to that word (kothay -> কোথায়, not the rule's কথায়).
+# Usage:
+#   python transliterate.py "কেমন আছো" "valo achi"          # auto-detect direction
+#   python transliterate.py --to bn "kemon acho"
+import re, argparse
+
+from spelling_rules import build_trie, trie_pattern
+
+BN_RE = re.compile(r"[ঀ-৿]")
+
+# token classes
+C, P, H, S, V, M, O = "C", "P", "H", "S", "V", "M", "O"
+
+# ---------------------------
+# Bangla -> Banglish table
+# ---------------------------
+
+BN_TO_LATIN = {}
+
+def _bn(cls, pairs):
+    for k, v in pairs.items():
+        BN_TO_LATIN[k] = (cls, v)
+
+_bn(C, {
+    "ক": "k", "খ": "kh", "গ": "g", "ঘ": "gh", "ঙ": "ng", "চ": "ch", "ছ": "ch", "জ": "j", "ঝ": "jh", "ঞ": "n",
+    "ট": "t", "ঠ": "th", "ড": "d", "ঢ": "dh", "ণ": "n", "ত": "t", "থ": "th", "দ": "d", "ধ": "dh", "ন": "n",
+    "প": "p", "ফ": "f", "ব": "b", "ভ": "bh", "ম": "m", "য": "j", "র": "r", "ল": "l", "শ": "sh", "ষ": "sh",
+    "স": "s", "হ": "h", "ৎ": "t",
+    # nukta forms, precomposed and decomposed (NFC keeps these decomposed);
+    # escaped, since the two spellings look identical in source
+    "\u09dc": "r", "\u09a1\u09bc": "r", "\u09dd": "rh", "\u09a2\u09bc": "rh", "\u09df": "y", "\u09af\u09bc": "y",
+    # conjuncts that do not read as their parts
+    "ক্ষ": "kkh", "জ্ঞ": "gg",
+})
+_bn(P, {"্য": "y", "্র": "r", "্ব": "b"})     # phala: joins the preceding consonant
+_bn(H, {"্": ""})                            # hasanta: no vowel, next consonant joins
+# o-kar / ou-kar precomposed and decomposed; the decomposed keys are escaped
+# like the nukta forms above
+_bn(S, {"া": "a", "ি": "i", "ী": "i", "ু": "u", "ূ": "u", "ৃ": "ri", "ে": "e", "ৈ": "oi",
+        "ো": "o", "\u09c7\u09be": "o", "ৌ": "ou", "\u09c7\u09d7": "ou"})
+_bn(V, {"অ": "o", "আ": "a", "ই": "i", "ঈ": "i", "উ": "u", "ঊ": "u", "ঋ": "ri", "এ": "e", "ঐ": "oi",
+        "ও": "o", "ঔ": "ou"})
+_bn(M, {"ং": "ng", "ঃ": "h", "ঁ": ""})
+_bn(O, {"০": "0", "১": "1", "২": "2", "৩": "3", "৪": "4", "৫": "5", "৬": "6", "৭": "7", "৮": "8", "৯": "9",
+        "।": "."})
+
+# ---------------------------
+# Banglish -> Bangla table: (class, independent form, sign form)
+# ---------------------------
+
+LATIN_TO_BN = {}
+
+def _lt(cls, pairs):
+    for k, v in pairs.items():
+        LATIN_TO_BN[k] = (cls,) + (v if isinstance(v, tuple) else (v, v))
+
+_lt(C, {
+    "kkh": "ক্ষ", "kh": "খ", "k": "ক", "q": "ক", "c": "ক", "gh": "ঘ", "g": "গ", "chh": "ছ", "ch": "চ",
+    "jh": "ঝ", "j": "জ", "z": "জ", "th": "থ", "t": "ত", "dh": "ধ", "d": "দ", "n": "ন", "ph": "ফ", "f": "ফ",
+    "p": "প", "bh": "ভ", "v": "ভ", "b": "ব", "m": "ম", "y": "য়", "r": "র", "l": "ল", "sh": "শ", "s": "স",
+    "h": "হ", "x": "ক্স", "ng": "ং", "cch": "চ্ছ",
+})
+# "ch" before these word endings is the ছ of verb forms (achi, korcho, ache,
+# korchilam) and of kichu; elsewhere it stays চ (cha, chol)
+CHH_ENDINGS = {"i", "o", "e", "u", "en", "is", "os", "ish", "ilo", "ile", "ilam", "ilen"}
+_lt(V, {
+    "a": ("আ", "া"), "i": ("ই", "ি"), "ee": ("ঈ", "ী"), "u": ("উ", "ু"), "oo": ("উ", "ু"), "e": ("এ", "ে"),
+    "o": ("ও", "ো"), "oi": ("ঐ", "ৈ"), "ou": ("ঔ", "ৌ"), "w": ("ও", "ও"),
+})
+
+def _compile(table):
+    return re.compile(trie_pattern(build_trie(table)) + "|.", re.S)
+
+BN_TOKEN_RE = _compile(BN_TO_LATIN)
+LATIN_TOKEN_RE = _compile(LATIN_TO_BN)
+BN_WORD_RE = re.compile(r"[ঀ-৿]+")
+LATIN_WORD_RE = re.compile(r"[A-Za-z]+")
+
+# ---------------------------
+# Word converters
+# ---------------------------
+
+def bn_word_to_latin(word):
+    toks = [BN_TO_LATIN.get(t, (O, t)) for t in BN_TOKEN_RE.findall(word)]
+    n = len(toks)
+    consonants = [i for i, (cls, _) in enumerate(toks) if cls == C]
+    out = []
+    for i, (cls, lat) in enumerate(toks):
+        out.append(lat)
+        if cls not in (C, P):
+            continue
+        nxt = toks[i + 1][0] if i + 1 < n else None
+        if nxt in (S, H, P):
+            continue
+        if nxt is None:
+            # a lone consonant keeps its vowel (ক -> ko), word-final ones drop it
+            if len(consonants) == 1 and all(t[0] in (C, P) for t in toks):
+                out.append("o")
+            continue
+        if nxt == C:
+            # inherent vowel: after a word-initial consonant (kor-cho, ko-khon)
+            # or before a bare word-final consonant (ke-mon); otherwise dropped
+            j = i
+            while j > 0 and toks[j][0] == P:
+                j -= 1
+            if j == 0 or i + 2 == n:
+                out.append("o")
+        elif nxt == M:
+            out.append("o")     # রং -> rong
+    return "".join(out)
+
+def latin_word_to_bn(word):
+    raw = LATIN_TOKEN_RE.findall(word.lower())
+    toks = [LATIN_TO_BN.get(t, (O, t, t)) for t in raw]
+    n = len(toks)
+    out = []
+    prev = None
+    for i, (cls, indep, sign) in enumerate(toks):
+        if cls == C and i and toks[i - 1][1] == indep:
+            continue            # doubled letters read as one (hello -> হেলো)
+        if raw[i] == "ch" and i and "".join(raw[i + 1:]) in CHH_ENDINGS:
+            indep = "ছ"
+        if cls == V:
+            if prev == C:
+                # "o" after a consonant is the inherent vowel except at word end
+                if not (indep == "ও" and sign == "ো" and i + 1 < n):
+                    out.append(sign)
+            else:
+                out.append(indep)
+        else:
+            out.append(indep)
+        prev = cls
+    return "".join(out)
+
+# ---------------------------
+# Public API
+# ---------------------------
+
+class Transliterator:
+    def __init__(self, cache_limit=1_000_000):
+        self.cache_limit = cache_limit
+        self.exceptions = {}    # Banglish word -> Bangla spelling
+        self._to_latin = {}
+        self._to_bn = {}
+
+    def learn(self, texts):
+        # every Bangla word in texts becomes the spelling of the Banglish word
+        # it reads as (first one wins)
+        for text in texts:
+            for w in BN_WORD_RE.findall(text):
+                self.exceptions.setdefault(bn_word_to_latin(w), w)
+        self._to_bn.clear()
+
+    def _latin_word(self, word):
+        return self.exceptions.get(word.lower()) or latin_word_to_bn(word)
+
+    def _word(self, cache, fn, word):
+        out = cache.get(word)
+        if out is None:
+            out = fn(word)
+            if len(cache) < self.cache_limit:
+                cache[word] = out
+        return out
+
+    def to_latin(self, s):
+        cache = self._to_latin
+        return BN_WORD_RE.sub(lambda m: self._word(cache, bn_word_to_latin, m.group()), s)
+
+    def to_bangla(self, s):
+        cache = self._to_bn
+        return LATIN_WORD_RE.sub(lambda m: self._word(cache, self._latin_word, m.group()), s)
+
+    def flip(self, s):
+        # into the other script, judged by whether s has any Bangla letters
+        return self.to_latin(s) if BN_RE.search(s) else self.to_bangla(s)
+
+_default = Transliterator()
+to_latin = _default.to_latin
+to_bangla = _default.to_bangla
+flip = _default.flip
+learn = _default.learn
+
+def bank_texts(ask_bank, ans):
+    return [text for _, text in ask_bank] + [a for pools in ans.values() for pool in pools for a in pool]
+
+# ---------------------------
+# Bank pairing: every bank string gets a twin in the other script
+# ---------------------------
+
+def paired_ask_bank(ask_bank):
+    learn(text for _, text in ask_bank)
+    out = list(ask_bank)
+    for cat, text in ask_bank:
+        out.append((cat, flip(text)))
+    return list(dict.fromkeys(out))
+
+def paired_answers(ans):
+    learn(a for pools in ans.values() for pool in pools for a in pool)
+    return {cat: pools + [[flip(a) for a in pool] for pool in pools] for cat, pools in ans.items()}
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("text", nargs="+")
+    ap.add_argument("--to", choices=["auto", "bn", "latin"], default="auto")
+    args = ap.parse_args()
+    import chat_dataset_generator as gen
+    learn(bank_texts(gen.ASK_BANK, gen.ANS))
+    fn = {"auto": flip, "bn": to_bangla, "latin": to_latin}[args.to]
+    for t in args.text:
+        print(fn(t))
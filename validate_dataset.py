@@ -0,0 +1,161 @@
+# validate_dataset.py
+# Check a generated JSONL dataset against what make_pair() promises before it
+# goes to training. Exits non-zero when anything is wrong, so it can gate CI.
+# --strict adds two checks the generator's own output does not pass, so they
+# are opt-in: duplicate answers (stylize_answers pads short lists with "ok")
+# and NFC normalization (some bank strings, e.g. "কোথায়", use precomposed
+# nukta letters). Fixing either would change every seeded dataset.
+# Usage:
+#   python validate_dataset.py chat_pairs.jsonl
+#   python validate_dataset.py big.jsonl --workers 8 --max-report 50
+#   python validate_dataset.py curated.jsonl --strict
+import json, os, sys, argparse, unicodedata
+from multiprocessing import Pool
+
+MIN_ANS = 3
+CHUNK_BYTES = 64 * 1024 * 1024
+MAX_PER_CHUNK = 1000
+
+# ---------------------------
+# Record checks
+# ---------------------------
+
+def check_string(field, s, strict=False):
+    if "\\n" in s:
+        return ("literal_newline", f"{field} contains a literal \\n")
+    if strict and not unicodedata.is_normalized("NFC", s):
+        return ("not_nfc", f"{field} is not NFC normalized")
+    return None
+
+def check_line(raw, strict=False):
+    # returns a list of (code, message); empty list means the record is fine
+    try:
+        text = raw.decode("utf-8")
+    except UnicodeDecodeError as e:
+        return [("utf8", f"invalid UTF-8 at byte {e.start}")]
+    if not text.strip():
+        return [("blank", "empty line")]
+    try:
+        obj = json.loads(text)
+    except ValueError as e:
+        if "}\\n{" in text:
+            # chat_dataset_generator used to join records with a literal "\n"
+            return [("literal_newline", "records joined by a literal \\n instead of a newline")]
+        return [("json", f"invalid JSON: {e}")]
+    if not isinstance(obj, dict):
+        return [("type", "record is not an object")]
+
+    problems = []
+    ask = obj.get("ask")
+    if not isinstance(ask, str):
+        problems.append(("ask", "missing or non-string 'ask'"))
+    else:
+        p = check_string("ask", ask, strict)
+        if p:
+            problems.append(p)
+
+    ans = obj.get("ans")
+    if not isinstance(ans, list) or not all(isinstance(a, str) for a in ans):
+        problems.append(("ans", "'ans' must be a list of strings"))
+        return problems
+    if len(ans) < MIN_ANS:
+        problems.append(("ans_short", f"'ans' has {len(ans)} entries, need {MIN_ANS}+"))
+    if strict and len(set(ans)) != len(ans):
+        dups = sorted({a for a in ans if ans.count(a) > 1})
+        problems.append(("ans_dup", f"duplicate answers: {dups}"))
+    for i, a in enumerate(ans):
+        p = check_string(f"ans[{i}]", a, strict)
+        if p:
+            problems.append(p)
+    return problems
+
+# ---------------------------
+# Parallel scan over newline-aligned byte ranges
+# ---------------------------
+
+def split_ranges(path, chunk_bytes):
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, "rb") as f:
+        start = 0
+        while start < size:
+            end = min(start + chunk_bytes, size)
+            if end < size:
+                f.seek(end)
+                tail = f.readline()
+                end += len(tail)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+def scan_range(job):
+    path, start, end, strict = job
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    found = []
+    counts = {}
+    lineno = 0
+    pos = 0
+    n = len(data)
+    while pos < n:
+        nl = data.find(b"\n", pos)
+        stop = n if nl < 0 else nl
+        problems = check_line(data[pos:stop], strict)
+        for code, msg in problems:
+            counts[code] = counts.get(code, 0) + 1
+            if len(found) < MAX_PER_CHUNK:
+                found.append((lineno, start + pos, code, msg))
+        lineno += 1
+        pos = stop + 1
+    return lineno, counts, found
+
+def validate(path, workers=None, chunk_bytes=CHUNK_BYTES, max_report=100, out=sys.stdout, strict=False):
+    with open(path, "rb") as f:
+        head = f.read(1)
+    if head == b"[":
+        print(f"{path}: JSON array files are not supported, validate the JSONL output", file=out)
+        return 1
+
+    jobs = [(path, s, e, strict) for s, e in split_ranges(path, chunk_bytes)]
+    lines = 0
+    violations = 0
+    reported = 0
+    counts = {}
+    with Pool(workers) as pool:
+        for n_lines, chunk_counts, found in pool.imap(scan_range, jobs):
+            for rel, offset, code, msg in found:
+                if reported < max_report:
+                    print(f"{path}:{lines + rel + 1}: offset {offset}: {code}: {msg}", file=out)
+                    reported += 1
+            for code, c in chunk_counts.items():
+                counts[code] = counts.get(code, 0) + c
+                violations += c
+            lines += n_lines
+
+    if violations:
+        by_code = ", ".join(f"{k}={v}" for k, v in sorted(counts.items()))
+        print(f"❌ {path}: {violations} violations in {lines} lines ({by_code})", file=out)
+        return 1
+    print(f"✅ {path}: {lines} records OK", file=out)
+    return 0
+
+# ---------------------------
+# CLI
+# ---------------------------
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("path", type=str, help="JSONL dataset to check")
+    ap.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    ap.add_argument("--chunk-mb", type=int, default=64, help="bytes per work unit, in MB")
+    ap.add_argument("--max-report", type=int, default=100, help="max violations to print")
+    ap.add_argument("--strict", action="store_true", help="also reject duplicate answers and non-NFC strings")
+    args = ap.parse_args()
+    try:
+        code = validate(args.path, workers=args.workers, chunk_bytes=args.chunk_mb * 1024 * 1024,
+                        max_report=args.max_report, strict=args.strict)
+    except OSError as e:
+        print(f"{args.path}: {e}", file=sys.stderr)
+        code = 2
+    sys.exit(code)